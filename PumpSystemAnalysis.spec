@@ -19,17 +19,10 @@ a = Analysis(
         'PyQt6.QtGui',
         'PyQt6.QtWidgets',
         'matplotlib.backends.backend_qt5agg',
+        # Imported lazily (inside functions) by the GUI and backend
+        'src.frontend.plot_canvas',
         'numpy',
-        'scipy',
         'scipy.optimize',
-        'scipy.optimize._minimize',
-        'scipy.optimize._root',
-        'scipy.optimize._lsq',
-        'scipy.integrate',
-        'scipy.special',
-        'scipy.linalg',
-        'scipy._lib',
-        'scipy._lib.messagestream',
     ],
     hookspath=[],
     hooksconfig={},
@@ -37,6 +30,9 @@ a = Analysis(
     excludes=[
         'tkinter',
         'test',
+        # Not used by the GUI; smaller one-file archives extract faster at startup
+        'pandas',
+        'IPython',
     ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
@@ -8,6 +8,10 @@ import os
 # Add src directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# Start the import profiler (if requested) before any heavy module loads
+from src import startup_timing
+sys.argv = startup_timing.enable_from_argv(sys.argv)
+
 from src.frontend.main_window import main
 
 if __name__ == '__main__':
@@ -0,0 +1,329 @@
+"""
+Benchmark Suite for Pump System Analysis
+Times backend math, solvers, rendering and GUI cold start
+
+Usage:
+    python benchmarks/run_benchmarks.py                      # run, write results JSON
+    python benchmarks/run_benchmarks.py --quick              # skip the 10^6-point cases
+    python benchmarks/run_benchmarks.py --filter solver      # only matching benchmarks
+    python benchmarks/run_benchmarks.py --save-baseline      # store as the new baseline
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json \\
+        --threshold 0.15 --threshold-for render=0.5          # fail on regressions
+
+Each benchmark reports the minimum and median of several repeats (seconds per
+call). Comparisons use the minimum, which is the least noisy statistic. The
+baseline defaults to benchmarks/baseline.json when it exists and is checked
+before anything runs. The exit status is 1 when any benchmark is slower than
+its baseline by more than its threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from src.backend.pump_system import PumpSystemAnalyzer
+from src.backend.batch_solver import solve_operating_points
+
+DEFAULT_RESULTS = os.path.join(ROOT, 'benchmarks', 'results.json')
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+CURVE_SIZES = (500, 10 ** 4, 10 ** 6)
+BATCH_SIZES = (10 ** 3, 10 ** 4, 10 ** 5)
+
+
+def measure(func, repeats=7, min_time=0.05):
+    """
+    Time a zero-argument callable.
+
+    The number of calls per repeat is calibrated so each repeat lasts at
+    least min_time seconds.
+
+    Returns:
+        Dictionary with min, median (seconds per call), loops and repeats
+    """
+    func()  # warm-up
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 10 ** 6:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    timings = [elapsed / loops]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append((time.perf_counter() - start) / loops)
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'loops': loops,
+        'repeats': repeats
+    }
+
+
+def backend_benchmarks(quick):
+    """Yield (name, callable) pairs for the backend hot paths"""
+    analyzer = PumpSystemAnalyzer()
+    for size in CURVE_SIZES:
+        if quick and size > 10 ** 4:
+            continue
+        velocities = np.linspace(0.1, 2.0, size)
+        yield f'friction_factor[{size}]', lambda v=velocities: analyzer.calculate_friction_factor(v)
+        yield f'generate_curves[{size}]', lambda n=size: analyzer.generate_curves(0.1, 2.0, n)
+
+    yield 'find_operating_point[fsolve]', lambda: analyzer.find_operating_point()
+    yield 'find_operating_point[bracket]', lambda: analyzer.find_operating_point(method='bracket')
+
+    rng = np.random.default_rng(0)
+    for size in BATCH_SIZES:
+        if quick and size > 10 ** 4:
+            continue
+        static_head = rng.uniform(2.0, 20.0, size)
+        diameter = rng.uniform(0.015, 0.05, size)
+        yield (f'solve_operating_points[{size}]',
+               lambda h=static_head, d=diameter: solve_operating_points(diameter=d, static_head=h))
+
+    yield 'analyze_complete_system[500]', lambda: analyzer.analyze_complete_system(0.1, 2.0, 500)
+
+
+def render_benchmarks(quick):
+    """Yield (name, callable) pairs for headless canvas rendering"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    try:
+        from PyQt6.QtWidgets import QApplication
+    except ImportError:
+        print("PyQt6 not available: skipping render benchmarks", file=sys.stderr)
+        return
+    app = QApplication.instance() or QApplication([])
+    from src.frontend.plot_canvas import MatplotlibCanvas
+
+    analyzer = PumpSystemAnalyzer()
+    for size in CURVE_SIZES:
+        if quick and size > 10 ** 4:
+            continue
+        analysis = analyzer.analyze_complete_system(0.1, 2.0, size)
+        canvas = MatplotlibCanvas(width=8, height=6, dpi=100)
+        canvas.resize(800, 600)
+        canvas.plot_system_curves(analysis['curves'], analysis['operating_point'])
+        canvas.draw()
+
+        def full_redraw(c=canvas, a=analysis):
+            c.plot_system_curves(a['curves'], a['operating_point'])
+            c.draw()
+            app.processEvents()
+
+        def incremental(c=canvas, a=analysis):
+            c.plot_system_curves(a['curves'], a['operating_point'])
+            app.processEvents()
+
+        yield f'render_full[{size}]', full_redraw
+        yield f'render_incremental[{size}]', incremental
+
+
+GUI_STARTUP_SCRIPT = r'''
+import os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+from src.frontend.main_window import PumpSystemWindow
+marks = {{}}
+initialize_plots = PumpSystemWindow.initialize_plots
+def timed_initialize_plots(self):
+    # Runs from the event loop once the window has been shown
+    marks.setdefault('shown', time.perf_counter() - start)
+    initialize_plots(self)
+PumpSystemWindow.initialize_plots = timed_initialize_plots
+window = PumpSystemWindow()
+window.show()
+while window.velocity_canvas is None:
+    app.processEvents()
+shown = marks['shown']
+ready = time.perf_counter() - start
+window.close()
+print(shown, ready)
+'''
+
+
+def gui_startup_benchmarks(repeats=5):
+    """Measure GUI cold start in fresh interpreters (window shown / plots ready)"""
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    script = GUI_STARTUP_SCRIPT.format(root=ROOT)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-c', script], env=env,
+                                   capture_output=True, text=True, timeout=120)
+        total = time.perf_counter() - start
+        if completed.returncode != 0:
+            print(f"GUI startup benchmark failed:\n{completed.stderr}", file=sys.stderr)
+            return {}
+        shown, ready = (float(value) for value in completed.stdout.split()[-2:])
+        samples.append((shown, ready, total))
+
+    results = {}
+    for index, name in enumerate(('gui_cold_start[window_shown]',
+                                  'gui_cold_start[plots_ready]',
+                                  'gui_cold_start[process_total]')):
+        values = [sample[index] for sample in samples]
+        results[name] = {'min': min(values), 'median': statistics.median(values),
+                         'loops': 1, 'repeats': repeats}
+    return results
+
+
+def metadata():
+    """Describe the environment the benchmarks ran in"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run(selected, quick, include_gui):
+    """Run every benchmark whose name contains one of the selected substrings"""
+    def wanted(name):
+        return not selected or any(pattern in name for pattern in selected)
+
+    results = {}
+    for group in (backend_benchmarks(quick), render_benchmarks(quick)):
+        for name, func in group:
+            if wanted(name):
+                results[name] = measure(func)
+                print(f"{name:<40} {results[name]['min'] * 1e3:12.4f} ms")
+    if include_gui and wanted('gui_cold_start'):
+        for name, result in gui_startup_benchmarks().items():
+            results[name] = result
+            print(f"{name:<40} {result['min'] * 1e3:12.4f} ms")
+    return results
+
+
+def compare(results, baseline, threshold, overrides):
+    """
+    Compare results with a baseline.
+
+    Returns:
+        List of (name, ratio, allowed) for benchmarks that regressed
+    """
+    regressions = []
+    print(f"\n{'Benchmark':<40} {'baseline ms':>12} {'current ms':>12} {'ratio':>8}")
+    for name, result in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if reference is None:
+            print(f"{name:<40} {'-':>12} {result['min'] * 1e3:12.4f} {'new':>8}")
+            continue
+        ratio = result['min'] / reference['min']
+        allowed = next((value for pattern, value in overrides.items() if pattern in name),
+                       threshold)
+        flag = '  REGRESSION' if ratio > 1 + allowed else ''
+        print(f"{name:<40} {reference['min'] * 1e3:12.4f} {result['min'] * 1e3:12.4f} "
+              f"{ratio:8.3f}{flag}")
+        if flag:
+            regressions.append((name, ratio, allowed))
+    return regressions
+
+
+def parse_overrides(values):
+    """Parse NAME=THRESHOLD options (ValueError on a malformed one)"""
+    overrides = {}
+    for value in values:
+        pattern, _, threshold = value.partition('=')
+        try:
+            overrides[pattern] = float(threshold)
+        except ValueError:
+            raise ValueError(f"--threshold-for expects NAME=THRESHOLD, got {value!r}") from None
+    return overrides
+
+
+def load_baseline(path):
+    """
+    Read a baseline report.
+
+    Raises:
+        ValueError: When the file cannot be read or has no results table
+    """
+    try:
+        with open(path, encoding='utf-8') as handle:
+            baseline = json.load(handle)
+    except OSError as e:
+        raise ValueError(f"cannot read baseline {path}: {e.strerror}") from e
+    except json.JSONDecodeError as e:
+        raise ValueError(f"baseline {path} is not valid JSON: {e}") from e
+    if not isinstance(baseline, dict) or not isinstance(baseline.get('results'), dict):
+        raise ValueError(f"baseline {path} has no results table")
+    return baseline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--output', default=DEFAULT_RESULTS, help='results JSON path')
+    parser.add_argument('--baseline',
+                        help='baseline JSON to compare against (default: '
+                             'benchmarks/baseline.json when it exists)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f'also write results to {DEFAULT_BASELINE}')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='allowed relative slowdown (default 0.10 = 10%%)')
+    parser.add_argument('--threshold-for', action='append', default=[], metavar='NAME=T',
+                        help='per-benchmark threshold for names containing NAME')
+    parser.add_argument('--filter', action='append', default=[],
+                        help='only run benchmarks whose name contains this text')
+    parser.add_argument('--quick', action='store_true', help='skip the largest sizes')
+    parser.add_argument('--no-gui', action='store_true', help='skip GUI cold start')
+    args = parser.parse_args(argv)
+    if args.baseline is None and os.path.exists(DEFAULT_BASELINE):
+        args.baseline = DEFAULT_BASELINE
+
+    # Fail on bad options before spending minutes on the suite
+    baseline = None
+    try:
+        overrides = parse_overrides(args.threshold_for)
+        if args.baseline:
+            baseline = load_baseline(args.baseline)
+    except ValueError as e:
+        parser.error(str(e))
+
+    report = {'metadata': metadata(),
+              'results': run(args.filter, args.quick, not args.no_gui)}
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+
+    if baseline is not None:
+        regressions = compare(report['results'], baseline, args.threshold, overrides)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed beyond threshold")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Adaptive Curve Sampling Module
+Error-controlled, non-uniform sampling of system and pump curves
+"""
+
+import numpy as np
+from typing import Callable, Dict, Tuple
+
+from .pump_system import PumpSystemAnalyzer
+from .root_finding import bracketed_newton
+
+
+def interpolation_error(velocities: np.ndarray, *curves: np.ndarray) -> np.ndarray:
+    """
+    Estimate the linear interpolation error of each grid interval.
+
+    Uses the bound h^2 / 8 * |f''| with f'' taken from second divided
+    differences at the interval end nodes, so no extra evaluations are needed.
+
+    Args:
+        velocities: Strictly increasing grid (at least 3 points)
+        *curves: Curve values on the grid
+
+    Returns:
+        Per-interval error estimate (maximum over all curves)
+    """
+    h = np.diff(velocities)
+    error = np.zeros(h.size)
+    for values in curves:
+        slopes = np.diff(values) / h
+        second = np.abs(2 * np.diff(slopes) / (h[:-1] + h[1:]))
+        # Interior nodes carry their own estimate; end nodes reuse the nearest
+        node_curvature = np.concatenate((second[:1], second, second[-1:]))
+        curvature = np.maximum(node_curvature[:-1], node_curvature[1:])
+        error = np.maximum(error, h ** 2 / 8 * curvature)
+    return error
+
+
+def _refine(analyzer: PumpSystemAnalyzer, velocities: np.ndarray, ha: np.ndarray,
+            Ha: np.ndarray, tolerance: Callable[[np.ndarray, np.ndarray], np.ndarray],
+            max_points: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Bisect intervals until their interpolation error estimate meets tolerance.
+
+    Returns the refined grid, both head arrays, the per-interval error
+    estimate and the number of curve evaluations spent.
+    """
+    evaluations = 0
+    while True:
+        error = interpolation_error(velocities, ha, Ha)
+        split = np.nonzero(error > tolerance(velocities[:-1], velocities[1:]))[0]
+        budget = max_points - velocities.size
+        if split.size == 0 or budget <= 0:
+            break
+        if split.size > budget:
+            # Spend the remaining budget on the worst intervals
+            split = np.sort(split[np.argsort(error[split])[::-1][:budget]])
+
+        mid = 0.5 * (velocities[split] + velocities[split + 1])
+        insert_at = split + 1
+        velocities = np.insert(velocities, insert_at, mid)
+        ha = np.insert(ha, insert_at, analyzer.calculate_system_head(mid))
+        Ha = np.insert(Ha, insert_at, analyzer.calculate_pump_head(mid))
+        evaluations += mid.size
+
+    return velocities, ha, Ha, error, evaluations
+
+
+def generate_adaptive_curves(analyzer: PumpSystemAnalyzer, v_min: float = 0.1,
+                             v_max: float = 2.0, tol: float = 1e-3,
+                             initial_points: int = 17, max_points: int = 20000,
+                             intersection_tol_factor: float = 0.1,
+                             intersection_window: float = 0.05) -> Dict[str, np.ndarray]:
+    """
+    Generate system and pump curves on an adaptively refined velocity grid.
+
+    Intervals are bisected until their estimated linear interpolation error
+    (see interpolation_error) is at most ``tol`` meters of head for both
+    curves, so points concentrate where the curves bend. The curve
+    intersections are then inserted into the grid and their neighbourhood is
+    refined further with the tolerance scaled by ``intersection_tol_factor``.
+
+    Args:
+        analyzer: Analyzer whose curves are sampled
+        v_min: Minimum velocity in m/s
+        v_max: Maximum velocity in m/s
+        tol: Maximum interpolation error in meters of head
+        initial_points: Points of the uniform starting grid
+        max_points: Hard cap on the number of grid points
+        intersection_tol_factor: Tolerance multiplier near intersections
+        intersection_window: Half-width of the tightened region as a
+            fraction of the velocity range
+
+    Returns:
+        Dictionary with the generate_curves arrays on the non-uniform grid,
+        plus error_estimate (per interval, in meters), max_error,
+        intersections (velocities) and evaluations (curve evaluations spent)
+    """
+    velocities = np.linspace(v_min, v_max, initial_points)
+    ha = analyzer.calculate_system_head(velocities)
+    Ha = analyzer.calculate_pump_head(velocities)
+    evaluations = velocities.size
+
+    velocities, ha, Ha, error, spent = _refine(
+        analyzer, velocities, ha, Ha,
+        lambda left, right: np.full(left.shape, tol), max_points
+    )
+    evaluations += spent
+
+    # Locate intersections on the refined grid
+    difference = Ha - ha
+    signs = np.sign(difference)
+    brackets = np.nonzero(signs[:-1] != signs[1:])[0]
+    roots = np.empty(0)
+    if brackets.size:
+        solution = bracketed_newton(
+            lambda v: analyzer.calculate_pump_head(v) - analyzer.calculate_system_head(v),
+            lambda v: (analyzer.calculate_pump_head_derivative(v) -
+                       analyzer.calculate_system_head_derivative(v)),
+            velocities[brackets], velocities[brackets + 1]
+        )
+        roots = np.unique(solution['root'][solution['converged']])
+        evaluations += int(solution['iterations'].sum()) + 2 * brackets.size
+
+    if roots.size and velocities.size < max_points:
+        new_roots = roots[~np.isin(roots, velocities)][:max_points - velocities.size]
+        positions = np.searchsorted(velocities, new_roots)
+        velocities = np.insert(velocities, positions, new_roots)
+        ha = np.insert(ha, positions, analyzer.calculate_system_head(new_roots))
+        Ha = np.insert(Ha, positions, analyzer.calculate_pump_head(new_roots))
+        evaluations += new_roots.size
+
+        window = intersection_window * (v_max - v_min)
+
+        def tolerance(left, right):
+            near = np.zeros(left.shape, dtype=bool)
+            for root in roots:
+                near |= (right >= root - window) & (left <= root + window)
+            return np.where(near, tol * intersection_tol_factor, tol)
+
+        velocities, ha, Ha, error, spent = _refine(analyzer, velocities, ha, Ha,
+                                                   tolerance, max_points)
+        evaluations += spent
+
+    return {
+        'velocities': velocities,
+        'flow_rates': analyzer.calculate_flow_rate(velocities),
+        'system_head': ha,
+        'pump_head': Ha,
+        'error_estimate': error,
+        'max_error': float(np.nanmax(error)) if error.size else 0.0,
+        'intersections': roots,
+        'evaluations': evaluations
+    }
@@ -0,0 +1,163 @@
+"""
+Batch Operating Point Solver
+Solves thousands of pipe/pump configurations in one vectorized pass
+"""
+
+import copy
+import numpy as np
+from typing import Dict, Optional, Union
+
+from . import profiling
+from .pump_system import PumpSystemAnalyzer, ArrayLike
+from .root_finding import bracketed_newton
+from .results import OperatingPointBatch
+
+
+# Analyzer attributes that may be given per row in a batch
+BATCH_PARAMETERS = (
+    'diameter',
+    'static_head',
+    'loss_coefficient_1',
+    'loss_coefficient_2',
+    'pump_max_head',
+    'pump_coefficient',
+    'pump_velocity_factor',
+    'roughness_factor',
+    'reynolds_coefficient',
+)
+
+# Smallest velocity used as the lower bracket end (avoids Re = 0)
+MIN_VELOCITY = 1e-6
+
+
+def broadcast_analyzer(base: Optional[PumpSystemAnalyzer] = None,
+                       **parameters: ArrayLike) -> PumpSystemAnalyzer:
+    """
+    Build an analyzer whose parameters are broadcast NumPy arrays.
+
+    Because every calculate_* method is written with array arithmetic, an
+    analyzer holding array-valued parameters evaluates one configuration
+    per element.
+
+    Args:
+        base: Analyzer providing defaults for parameters not given
+        **parameters: Arrays (or scalars) keyed by names in BATCH_PARAMETERS
+
+    Returns:
+        Analyzer with all batch parameters broadcast to a common shape
+    """
+    unknown = set(parameters) - set(BATCH_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown batch parameters: {sorted(unknown)}")
+
+    analyzer = copy.copy(base) if base is not None else PumpSystemAnalyzer()
+    values = [np.asarray(parameters[name], dtype=float) if parameters.get(name) is not None
+              else np.asarray(getattr(analyzer, name), dtype=float)
+              for name in BATCH_PARAMETERS]
+    for name, value in zip(BATCH_PARAMETERS, np.broadcast_arrays(*values)):
+        setattr(analyzer, name, value)
+    analyzer.area = np.pi * (analyzer.diameter / 2) ** 2
+    return analyzer
+
+
+@profiling.timed('solve_analyzer_batch')
+def solve_analyzer_batch(analyzer: PumpSystemAnalyzer,
+                         initial_guess: Optional[ArrayLike] = None,
+                         v_min: Optional[ArrayLike] = None,
+                         v_max: Optional[ArrayLike] = None,
+                         tol: float = 1e-10,
+                         max_iter: int = 60,
+                         as_batch: bool = False
+                         ) -> Union[Dict[str, np.ndarray], OperatingPointBatch]:
+    """
+    Solve the operating points of an array-valued analyzer.
+
+    Args:
+        analyzer: Analyzer built with broadcast_analyzer
+        initial_guess: Optional starting velocities (e.g. a warm start)
+        v_min: Lower velocity bracket (default: just above zero)
+        v_max: Upper velocity bracket (default: pump shutoff velocity)
+        tol: Absolute head residual tolerance in meters
+        max_iter: Maximum Newton iterations
+        as_batch: Return an OperatingPointBatch instead of a dictionary
+
+    Returns:
+        Dictionary of per-row arrays: velocity, head, head_pump,
+        flow_rate_m3s, friction_factor, converged and iterations (or the
+        same columns as an OperatingPointBatch)
+    """
+    shape = np.shape(analyzer.diameter)
+    lower = np.broadcast_to(MIN_VELOCITY if v_min is None else v_min, shape)
+    upper = np.broadcast_to(analyzer.calculate_shutoff_velocity() if v_max is None
+                            else v_max, shape)
+
+    def difference(v):
+        return analyzer.calculate_pump_head(v) - analyzer.calculate_system_head(v)
+
+    def difference_derivative(v):
+        return (analyzer.calculate_pump_head_derivative(v) -
+                analyzer.calculate_system_head_derivative(v))
+
+    solution = bracketed_newton(profiling.counted(difference), difference_derivative,
+                                lower, upper, initial_guess=initial_guess, ftol=tol,
+                                max_iter=max_iter)
+    profiling.count(iterations=int(solution['iterations'].sum()))
+
+    velocity = np.where(solution['converged'], solution['root'], np.nan)
+    with np.errstate(invalid='ignore'):
+        columns = {
+            'velocity': velocity,
+            'head': analyzer.calculate_system_head(velocity),
+            'head_pump': analyzer.calculate_pump_head(velocity),
+            'flow_rate_m3s': analyzer.calculate_flow_rate(velocity),
+            'friction_factor': analyzer.calculate_friction_factor(velocity),
+            'converged': solution['converged'],
+            'iterations': solution['iterations']
+        }
+    if as_batch:
+        return OperatingPointBatch(columns, analyzer.reynolds_coefficient)
+    return columns
+
+
+def solve_operating_points(diameter: Optional[ArrayLike] = None,
+                           static_head: Optional[ArrayLike] = None,
+                           loss_coefficient_1: Optional[ArrayLike] = None,
+                           loss_coefficient_2: Optional[ArrayLike] = None,
+                           pump_max_head: Optional[ArrayLike] = None,
+                           pump_coefficient: Optional[ArrayLike] = None,
+                           pump_velocity_factor: Optional[ArrayLike] = None,
+                           base: Optional[PumpSystemAnalyzer] = None,
+                           **options) -> Dict[str, np.ndarray]:
+    """
+    Solve the operating points of many systems at once.
+
+    Parameters left as None take the value of ``base`` (or the analyzer
+    defaults); all given arrays are broadcast against each other.
+
+    Args:
+        diameter: Pipe diameters in meters
+        static_head: Static heads in meters
+        loss_coefficient_1: Friction loss coefficients
+        loss_coefficient_2: Minor loss coefficients
+        pump_max_head: Pump shutoff heads in meters
+        pump_coefficient: Pump curve coefficients
+        pump_velocity_factor: Pump velocity factors
+        base: Analyzer providing default parameters
+        **options: Forwarded to solve_analyzer_batch (initial_guess,
+            v_min, v_max, tol, max_iter, as_batch)
+
+    Returns:
+        Dictionary of per-row arrays: velocity, head, head_pump,
+        flow_rate_m3s, friction_factor, converged and iterations
+    """
+    analyzer = broadcast_analyzer(
+        base,
+        diameter=diameter,
+        static_head=static_head,
+        loss_coefficient_1=loss_coefficient_1,
+        loss_coefficient_2=loss_coefficient_2,
+        pump_max_head=pump_max_head,
+        pump_coefficient=pump_coefficient,
+        pump_velocity_factor=pump_velocity_factor
+    )
+    return solve_analyzer_batch(analyzer, **options)
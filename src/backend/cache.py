@@ -0,0 +1,273 @@
+"""
+Analysis Cache Module
+Bounded LRU memoization of curves and operating points
+"""
+
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .pump_system import PumpSystemAnalyzer
+
+
+def _canonical_bytes(value: Any) -> bytes:
+    """Serialize a parameter value into a stable byte string."""
+    if isinstance(value, np.ndarray):
+        return b'A' + str(value.dtype).encode() + str(value.shape).encode() + \
+            np.ascontiguousarray(value).tobytes()
+    if isinstance(value, (bool, np.bool_)):
+        return b'B' + repr(bool(value)).encode()
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return b'F' + float(value).hex().encode()
+    # Objects whose repr is not exact (e.g. rounded coefficients) provide their own key
+    cache_key = getattr(value, 'cache_key', None)
+    if callable(cache_key):
+        return b'K' + type(value).__qualname__.encode() + b':' + cache_key()
+    return b'R' + repr(value).encode()
+
+
+def analyzer_key(analyzer: PumpSystemAnalyzer, *extra: Any) -> str:
+    """
+    Compute a canonical hash of an analyzer's parameters.
+
+    Two analyzers with equal parameters (bit-for-bit) hash equally, no matter
+    how they were constructed.
+
+    Args:
+        analyzer: Analyzer to fingerprint
+        *extra: Additional values to fold into the key (e.g. sampling range)
+
+    Returns:
+        Hex digest identifying the configuration
+    """
+    digest = hashlib.sha1()
+    for name, value in sorted(vars(analyzer).items()):
+        digest.update(name.encode() + b'=' + _canonical_bytes(value) + b';')
+    for value in extra:
+        digest.update(b'|' + _canonical_bytes(value))
+    return digest.hexdigest()
+
+
+def _freeze(value: Any) -> Any:
+    """Mark cached arrays read-only so callers cannot corrupt the cache."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+def _copy_containers(value: Any) -> Any:
+    """Copy dicts and lists (not arrays) so callers may add or change keys."""
+    if isinstance(value, dict):
+        return {key: _copy_containers(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(item) for item in value]
+    return value
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Args:
+        value: Array, number, bytes/str or nested dict/list of them
+
+    Returns:
+        Approximate size in bytes
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value) + 32
+    if isinstance(value, dict):
+        return sum(estimate_size(item) + 64 for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) + 8 for item in value)
+    return 32
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU cache bounded by entry count and memory size.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 ** 2):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum estimated memory of cached results
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up a cached value and mark it most recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _copy_containers(entry[0])
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting least recently used entries as needed.
+
+        Values larger than max_bytes are not cached.
+
+        Args:
+            key: Cache key
+            value: Value to store (arrays inside are made read-only)
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        _freeze(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+            value = _copy_containers(value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> int:
+        """
+        Drop one entry, or every entry when key is None.
+
+        Args:
+            key: Cache key to drop (None clears the cache)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if key is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return removed
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return 0
+            self._bytes -= entry[1]
+            return 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, evictions, entries, bytes and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Process-wide cache shared by the GUI and batch scripts
+default_cache = AnalysisCache()
+
+
+def cached_analysis(analyzer: PumpSystemAnalyzer, v_min: float = 0.1, v_max: float = 2.0,
+                    num_points: int = 500, method: str = 'bracket',
+                    cache: Optional[AnalysisCache] = None,
+                    checkpoint: Optional[Callable[[], None]] = None) -> Dict:
+    """
+    Memoized PumpSystemAnalyzer.analyze_complete_system.
+
+    Args:
+        analyzer: Analyzer to run
+        v_min: Minimum velocity in m/s
+        v_max: Maximum velocity in m/s
+        num_points: Number of points for curves
+        method: Operating point solver ('bracket' or 'fsolve')
+        cache: Cache to use (default: default_cache)
+        checkpoint: Forwarded to analyze_complete_system on a miss (an
+            abandoned analysis is not cached)
+
+    Returns:
+        Complete analysis dictionary (arrays are read-only)
+    """
+    cache = default_cache if cache is None else cache
+    key = ('analysis', analyzer_key(analyzer, v_min, v_max, num_points, method))
+    return cache.get_or_compute(
+        key, lambda: analyzer.analyze_complete_system(v_min, v_max, num_points, method,
+                                                      checkpoint=checkpoint)
+    )
+
+
+def cached_operating_point(analyzer: PumpSystemAnalyzer,
+                           cache: Optional[AnalysisCache] = None,
+                           **kwargs) -> Dict[str, float]:
+    """
+    Memoized PumpSystemAnalyzer.find_operating_point.
+
+    Args:
+        analyzer: Analyzer to solve
+        cache: Cache to use (default: default_cache)
+        **kwargs: Forwarded to find_operating_point
+
+    Returns:
+        Operating point dictionary
+    """
+    cache = default_cache if cache is None else cache
+    key = ('operating_point', analyzer_key(analyzer, *sorted(kwargs.items())))
+    return cache.get_or_compute(key, lambda: analyzer.find_operating_point(**kwargs))
@@ -0,0 +1,259 @@
+"""
+Pumping Energy Module
+Annual energy from demand and static-head profiles via load-duration binning
+
+A profile is a time series of one varying quantity: the static head the
+pump works against (e.g. a tank level) or the flow demanded of it. The
+profile is binned into a load-duration histogram and one operating point
+is solved per bin, so a year of minute data (525,600 points) costs a
+single vectorized solve of a few hundred rows instead of one solver call
+per point.
+
+Each bin is evaluated at the mean of its points rather than its center,
+which cancels the first-order binning error exactly. The remaining error
+of a bin with hours t, mean m and standard deviation s is
+t·P''(m)·s²/2 (P is hydraulic power as a function of the profile value);
+it is estimated from the second difference P(m + s) + P(m - s) - 2·P(m),
+evaluated in the same solve, and reported with the energy.
+
+Hydraulic power is ρ·g·Q·H. With a static-head profile, Q and H are the
+operating point. With a demand profile the pump delivers the demanded
+flow either throttled (H is the pump head at that flow) or with speed
+control (H is the system head at that flow); demand above the free
+operating point is capped at it and reported as unmet.
+"""
+
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from . import profiling
+from .pump_system import PumpSystemAnalyzer, ArrayLike
+from .batch_solver import broadcast_analyzer, solve_analyzer_batch
+
+# Profile quantities and flow control strategies of a demand profile
+QUANTITIES = ('static_head', 'flow')
+CONTROLS = ('throttle', 'speed')
+
+
+def load_duration_histogram(values: ArrayLike, time_step: ArrayLike = 1.0,
+                            bins: Union[int, Sequence[float]] = 64,
+                            value_range: Optional[Tuple[float, float]] = None) -> Dict:
+    """
+    Bin a profile into a load-duration histogram.
+
+    Non-finite values are skipped. Values outside value_range are counted
+    in the edge bins.
+
+    Args:
+        values: Profile values (any shape, flattened)
+        time_step: Duration of each value in hours (scalar, e.g. 1/60 for
+            minute data, or one duration per value)
+        bins: Number of equal-width bins, or increasing bin edges
+        value_range: (min, max) of equal-width bins (default: data range)
+
+    Returns:
+        Dictionary of per-bin arrays: edges (one more than the bins),
+        hours, count, mean and std (of the values in each bin), plus
+        total_hours and skipped (number of non-finite values)
+    """
+    values = np.asarray(values, dtype=float).ravel()
+    hours = np.broadcast_to(np.asarray(time_step, dtype=float), values.shape)
+    valid = np.isfinite(values) & np.isfinite(hours)
+    skipped = int(values.size - valid.sum())
+    if skipped:
+        values, hours = values[valid], hours[valid]
+    if values.size == 0:
+        raise ValueError("The profile has no finite values")
+
+    if np.ndim(bins) == 0:
+        low, high = value_range if value_range is not None else (values.min(), values.max())
+        if high <= low:
+            high = low + max(abs(low), 1.0) * 1e-9
+        edges = np.linspace(low, high, int(bins) + 1)
+        index = ((values - low) * (int(bins) / (high - low))).astype(np.intp)
+    else:
+        edges = np.asarray(bins, dtype=float)
+        index = np.searchsorted(edges, values, side='right') - 1
+    size = edges.size - 1
+    np.clip(index, 0, size - 1, out=index)
+
+    duration = np.bincount(index, weights=hours, minlength=size)
+    count = np.bincount(index, minlength=size)
+    # Duration-weighted moments; offsets by the bin start keep the variance accurate
+    offset = values - edges[index]
+    first = np.bincount(index, weights=hours * offset, minlength=size)
+    second = np.bincount(index, weights=hours * offset ** 2, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_offset = first / duration
+        variance = np.maximum(second / duration - mean_offset ** 2, 0.0)
+    return {
+        'edges': edges,
+        'hours': duration,
+        'count': count,
+        'mean': edges[:-1] + mean_offset,
+        'std': np.sqrt(variance),
+        'total_hours': float(duration.sum()),
+        'skipped': skipped
+    }
+
+
+def hydraulic_power(analyzer: PumpSystemAnalyzer, values: np.ndarray,
+                    quantity: str = 'static_head', control: str = 'throttle',
+                    capacity_velocity: Optional[float] = None,
+                    density: float = 1000.0,
+                    solver_options: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+    """
+    Hydraulic power at profile values, in one vectorized evaluation.
+
+    Args:
+        analyzer: System (scalar parameters)
+        values: Static heads in m or demanded flows in m³/s
+        quantity: 'static_head' or 'flow'
+        control: Flow control of a demand profile, 'throttle' or 'speed'
+        capacity_velocity: Free operating velocity of the system, which caps
+            demand (solved when not given)
+        density: Fluid density in kg/m³
+        solver_options: Forwarded to solve_analyzer_batch (tol, max_iter)
+
+    Returns:
+        Dictionary of per-value arrays: velocity, flow_rate_m3s, head,
+        power_w and served (False where the pump cannot reach the static
+        head or deliver the demand)
+    """
+    values = np.asarray(values, dtype=float)
+    density_gravity = density * analyzer.gravity_factor / 2
+    if quantity == 'static_head':
+        solution = solve_analyzer_batch(broadcast_analyzer(analyzer, static_head=values),
+                                        **(solver_options or {}))
+        served = solution['converged']
+        velocity = np.where(served, solution['velocity'], 0.0)
+        head = np.where(served, solution['head'], 0.0)
+        flow = np.where(served, solution['flow_rate_m3s'], 0.0)
+    elif quantity == 'flow':
+        if control not in CONTROLS:
+            raise ValueError(f"Unknown control {control!r}, expected one of {CONTROLS}")
+        if capacity_velocity is None:
+            capacity_velocity = free_operating_velocity(analyzer, solver_options)
+        demand = np.maximum(values, 0.0) / analyzer.area
+        served = demand <= capacity_velocity
+        velocity = np.minimum(demand, capacity_velocity)
+        flow = analyzer.calculate_flow_rate(velocity)
+        # Zero demand gives Re = 0 in the friction factor; that head is zeroed below
+        with np.errstate(divide='ignore', invalid='ignore'):
+            head = analyzer.calculate_pump_head(velocity) if control == 'throttle' else \
+                analyzer.calculate_system_head(velocity)
+        head = np.where(flow > 0, head, 0.0)
+    else:
+        raise ValueError(f"Unknown quantity {quantity!r}, expected one of {QUANTITIES}")
+    return {
+        'velocity': velocity,
+        'flow_rate_m3s': flow,
+        'head': head,
+        'power_w': density_gravity * flow * head,
+        'served': served
+    }
+
+
+def free_operating_velocity(analyzer: PumpSystemAnalyzer,
+                            solver_options: Optional[Dict] = None) -> float:
+    """
+    Operating velocity of the unthrottled system (0 when there is none).
+    """
+    solution = solve_analyzer_batch(broadcast_analyzer(analyzer), **(solver_options or {}))
+    return float(solution['velocity']) if solution['converged'] else 0.0
+
+
+@profiling.timed('annual_energy')
+def annual_energy(profile: ArrayLike, quantity: str = 'static_head',
+                  base: Optional[PumpSystemAnalyzer] = None,
+                  time_step: ArrayLike = 1.0,
+                  bins: Union[int, Sequence[float]] = 64,
+                  value_range: Optional[Tuple[float, float]] = None,
+                  control: str = 'throttle', efficiency: float = 1.0,
+                  density: float = 1000.0,
+                  solver_options: Optional[Dict] = None) -> Dict:
+    """
+    Pumping energy of a profile from its load-duration histogram.
+
+    Args:
+        profile: Static heads in m or demanded flows in m³/s, one per time step
+        quantity: 'static_head' or 'flow'
+        base: System providing all other parameters (default: PumpSystemAnalyzer())
+        time_step: Duration of each profile value in hours (scalar or per value)
+        bins: Number of equal-width bins, or increasing bin edges
+        value_range: (min, max) of equal-width bins (default: profile range)
+        control: Flow control of a demand profile, 'throttle' or 'speed'
+        efficiency: Wire-to-water efficiency converting hydraulic to input energy
+        density: Fluid density in kg/m³
+        solver_options: Forwarded to solve_analyzer_batch (tol, max_iter)
+
+    Returns:
+        Dictionary with quantity, total_hours, hydraulic_energy_kwh, energy_kwh
+        (hydraulic / efficiency), mean_power_w and peak_power_w (hydraulic,
+        per bin mean), binning_error_kwh (estimated hydraulic energy error,
+        signed; hydraulic_energy_kwh + binning_error_kwh is the
+        second-order corrected energy), relative_binning_error,
+        unserved_hours (profile hours above the pump's capacity), skipped,
+        and 'bins' with the per-bin histogram (edges, hours, count, mean,
+        std), operating point (velocity, flow_rate_m3s, head, power_w,
+        served), energy_kwh and error_kwh
+    """
+    if quantity not in QUANTITIES:
+        raise ValueError(f"Unknown quantity {quantity!r}, expected one of {QUANTITIES}")
+    base = base if base is not None else PumpSystemAnalyzer()
+
+    with profiling.stage('histogram'):
+        histogram = load_duration_histogram(profile, time_step, bins, value_range)
+    occupied = histogram['hours'] > 0
+    mean = histogram['mean'][occupied]
+    spread = histogram['std'][occupied]
+
+    with profiling.stage('solve_bins'):
+        capacity = free_operating_velocity(base, solver_options) if quantity == 'flow' else None
+        points = hydraulic_power(base, np.stack([mean, mean - spread, mean + spread]),
+                                 quantity, control, capacity, density, solver_options)
+    power = points['power_w']
+
+    # Service limit on the profile value: the free operating flow, or the
+    # shutoff head above which no flow reaches the system
+    limit = capacity * base.area if quantity == 'flow' else \
+        float(base.calculate_pump_head(0.0))
+    values = np.asarray(profile, dtype=float).ravel()
+    unserved = float(np.broadcast_to(np.asarray(time_step, dtype=float),
+                                     values.shape)[values > limit].sum())
+
+    hours = histogram['hours'][occupied]
+    energy = hours * power[0] / 1000.0
+    # t·P''(m)·s²/2 with P''·s² from the second difference at m ± s
+    error = hours * (power[1] + power[2] - 2 * power[0]) / 2 / 1000.0
+
+    def per_bin(values, fill=np.nan):
+        full = np.full(occupied.shape, fill, dtype=np.asarray(values).dtype)
+        full[occupied] = values
+        return full
+
+    hydraulic = float(energy.sum())
+    total_error = float(error.sum())
+    total_hours = histogram['total_hours']
+    return {
+        'quantity': quantity,
+        'total_hours': total_hours,
+        'hydraulic_energy_kwh': hydraulic,
+        'energy_kwh': hydraulic / efficiency,
+        'mean_power_w': hydraulic * 1000.0 / total_hours if total_hours > 0 else 0.0,
+        'peak_power_w': float(power[0].max()),
+        'binning_error_kwh': total_error,
+        'relative_binning_error': abs(total_error) / hydraulic if hydraulic > 0 else 0.0,
+        'unserved_hours': unserved,
+        'skipped': histogram['skipped'],
+        'bins': {
+            **histogram,
+            'velocity': per_bin(points['velocity'][0]),
+            'flow_rate_m3s': per_bin(points['flow_rate_m3s'][0]),
+            'head': per_bin(points['head'][0]),
+            'power_w': per_bin(power[0]),
+            'served': per_bin(points['served'][0], fill=True),
+            'energy_kwh': per_bin(energy, fill=0.0),
+            'error_kwh': per_bin(error, fill=0.0)
+        }
+    }
@@ -0,0 +1,319 @@
+"""
+Friction Factor Models
+Vectorized Darcy friction factor correlations with analytic derivatives
+
+All models take the Reynolds number and relative roughness (ε/D) as scalars
+or NumPy arrays of any (broadcastable) shape and return the Darcy friction
+factor F with the same shape. Accuracy figures are maximum deviations from
+the implicit Colebrook-White equation over 5000 < Re < 1e8 and
+1e-6 < ε/D < 1e-2; relative cost is the measured time per element on
+arrays of 1e6 elements, normalized to Swamee-Jain (it varies by about
+15 % between machines).
+
+    Model            Max error     Relative cost
+    swamee_jain      ~3 %          1.0   (1 log10, 1 power; default)
+    haaland          ~1.5 %        0.8   (1 log10, 1 power)
+    serghides        ~0.003 %      4     (3 log10)
+    colebrook        exact         6     (Wright omega, or ~4 Newton steps)
+
+Use an explicit model for large batch runs and 'colebrook' for validation.
+"""
+
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Dict, Union
+
+ArrayLike = Union[float, np.ndarray]
+
+LN10 = np.log(10.0)
+
+
+class FrictionModel(ABC):
+    """
+    Base class for friction factor correlations.
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def friction_factor(self, reynolds: ArrayLike, relative_roughness: ArrayLike) -> ArrayLike:
+        """
+        Calculate the Darcy friction factor.
+
+        Args:
+            reynolds: Reynolds number
+            relative_roughness: Relative roughness ε/D
+
+        Returns:
+            Friction factor F (dimensionless)
+        """
+
+    @abstractmethod
+    def derivative(self, reynolds: ArrayLike, relative_roughness: ArrayLike) -> ArrayLike:
+        """
+        Calculate the analytic derivative dF/dRe.
+
+        Args:
+            reynolds: Reynolds number
+            relative_roughness: Relative roughness ε/D
+
+        Returns:
+            dF/dRe
+        """
+
+    @abstractmethod
+    def roughness_derivative(self, reynolds: ArrayLike,
+                             relative_roughness: ArrayLike) -> ArrayLike:
+        """
+        Calculate the analytic derivative dF/d(ε/D).
+
+        Args:
+            reynolds: Reynolds number
+            relative_roughness: Relative roughness ε/D
+
+        Returns:
+            dF/d(ε/D)
+        """
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and vars(self) == vars(other)
+
+    def __hash__(self) -> int:
+        return hash(repr(self))
+
+
+class SwameeJain(FrictionModel):
+    """
+    Swamee-Jain explicit approximation (the formula used by the original
+    analysis): F = 0.25 / log10(ε/3.7 + 5.74 / Re^0.9)^2.
+    """
+
+    name = 'swamee_jain'
+
+    def friction_factor(self, reynolds, relative_roughness):
+        reynolds = np.asarray(reynolds, dtype=float)
+        log_term = np.log10(relative_roughness / 3.7 + 5.74 / reynolds ** 0.9)
+        return 0.25 / log_term ** 2
+
+    def derivative(self, reynolds, relative_roughness):
+        reynolds = np.asarray(reynolds, dtype=float)
+        term1 = relative_roughness / 3.7
+        term2 = 5.74 / reynolds ** 0.9
+        log_term = np.log10(term1 + term2)
+        dlog = -0.9 * term2 / (reynolds * (term1 + term2) * LN10)
+        return -0.5 / log_term ** 3 * dlog
+
+    def roughness_derivative(self, reynolds, relative_roughness):
+        reynolds = np.asarray(reynolds, dtype=float)
+        inner = relative_roughness / 3.7 + 5.74 / reynolds ** 0.9
+        dlog = 1 / (3.7 * inner * LN10)
+        return -0.5 / np.log10(inner) ** 3 * dlog
+
+
+class Haaland(FrictionModel):
+    """
+    Haaland explicit approximation:
+    1/sqrt(F) = -1.8 log10((ε/3.7)^1.11 + 6.9/Re).
+    """
+
+    name = 'haaland'
+
+    def friction_factor(self, reynolds, relative_roughness):
+        reynolds = np.asarray(reynolds, dtype=float)
+        x = -1.8 * np.log10((relative_roughness / 3.7) ** 1.11 + 6.9 / reynolds)
+        return x ** -2
+
+    def derivative(self, reynolds, relative_roughness):
+        reynolds = np.asarray(reynolds, dtype=float)
+        inner = (relative_roughness / 3.7) ** 1.11 + 6.9 / reynolds
+        x = -1.8 * np.log10(inner)
+        dx = -1.8 / LN10 * (-6.9 / reynolds ** 2) / inner
+        return -2 * x ** -3 * dx
+
+    def roughness_derivative(self, reynolds, relative_roughness):
+        reynolds = np.asarray(reynolds, dtype=float)
+        scaled = relative_roughness / 3.7
+        inner = scaled ** 1.11 + 6.9 / reynolds
+        x = -1.8 * np.log10(inner)
+        dx = -1.8 / LN10 * 1.11 * scaled ** 0.11 / 3.7 / inner
+        return -2 * x ** -3 * dx
+
+
+class Serghides(FrictionModel):
+    """
+    Serghides explicit solution (Steffensen acceleration of Colebrook-White),
+    accurate to a few thousandths of a percent.
+    """
+
+    name = 'serghides'
+
+    def _terms(self, reynolds, relative_roughness):
+        reynolds = np.asarray(reynolds, dtype=float)
+        a = relative_roughness / 3.7
+        k = 2 / LN10
+        A = -2 * np.log10(a + 12 / reynolds)
+        B = -2 * np.log10(a + 2.51 * A / reynolds)
+        C = -2 * np.log10(a + 2.51 * B / reynolds)
+        dA = -k * (-12 / reynolds ** 2) / (a + 12 / reynolds)
+        dB = -k * 2.51 * (dA * reynolds - A) / reynolds ** 2 / (a + 2.51 * A / reynolds)
+        dC = -k * 2.51 * (dB * reynolds - B) / reynolds ** 2 / (a + 2.51 * B / reynolds)
+        return A, B, C, dA, dB, dC
+
+    def _roughness_terms(self, reynolds, relative_roughness):
+        reynolds = np.asarray(reynolds, dtype=float)
+        a = relative_roughness / 3.7
+        k = 2 / LN10
+        A = -2 * np.log10(a + 12 / reynolds)
+        B = -2 * np.log10(a + 2.51 * A / reynolds)
+        C = -2 * np.log10(a + 2.51 * B / reynolds)
+        # Derivatives with respect to ε/D (da/d(ε/D) = 1/3.7)
+        dA = -k / 3.7 / (a + 12 / reynolds)
+        dB = -k * (1 / 3.7 + 2.51 * dA / reynolds) / (a + 2.51 * A / reynolds)
+        dC = -k * (1 / 3.7 + 2.51 * dB / reynolds) / (a + 2.51 * B / reynolds)
+        return A, B, C, dA, dB, dC
+
+    def friction_factor(self, reynolds, relative_roughness):
+        A, B, C, _, _, _ = self._terms(reynolds, relative_roughness)
+        x = A - (B - A) ** 2 / (C - 2 * B + A)
+        return x ** -2
+
+    def derivative(self, reynolds, relative_roughness):
+        return self._chain(*self._terms(reynolds, relative_roughness))
+
+    def roughness_derivative(self, reynolds, relative_roughness):
+        return self._chain(*self._roughness_terms(reynolds, relative_roughness))
+
+    @staticmethod
+    def _chain(A, B, C, dA, dB, dC):
+        """dF from the Steffensen terms and their derivatives"""
+        numerator = (B - A) ** 2
+        denominator = C - 2 * B + A
+        x = A - numerator / denominator
+        dx = dA - (2 * (B - A) * (dB - dA) * denominator -
+                   numerator * (dC - 2 * dB + dA)) / denominator ** 2
+        return -2 * x ** -3 * dx
+
+
+class ColebrookWhite(FrictionModel):
+    """
+    Implicit Colebrook-White equation solved to machine precision:
+    1/sqrt(F) = -2 log10(ε/3.7 + 2.51 / (Re sqrt(F))).
+
+    method='lambertw' uses the closed form through the Wright omega function
+    (scipy.special.wrightomega, no iteration); method='newton' runs a
+    vectorized Newton iteration started from Swamee-Jain, which needs no
+    SciPy and converges in about four steps.
+    """
+
+    name = 'colebrook'
+
+    def __init__(self, method: str = 'lambertw', tol: float = 1e-13, max_iter: int = 20):
+        """
+        Args:
+            method: 'lambertw' (closed form) or 'newton' (iteration)
+            tol: Relative tolerance of the Newton iteration
+            max_iter: Maximum Newton iterations
+        """
+        if method not in ('lambertw', 'newton'):
+            raise ValueError(f"Unknown Colebrook-White method: {method!r}")
+        self.method = method
+        self.tol = tol
+        self.max_iter = max_iter
+
+    def inverse_sqrt(self, reynolds: ArrayLike, relative_roughness: ArrayLike) -> np.ndarray:
+        """
+        Solve for x = 1/sqrt(F).
+
+        Args:
+            reynolds: Reynolds number
+            relative_roughness: Relative roughness ε/D
+
+        Returns:
+            1/sqrt(F)
+        """
+        reynolds = np.asarray(reynolds, dtype=float)
+        a = relative_roughness / 3.7
+        b = 2.51 / reynolds
+        c = 2 / LN10
+
+        if self.method == 'lambertw':
+            # x = -c ln(a + b x); with u = a + b x = b c w, w solves w + ln w = z
+            from scipy.special import wrightomega
+            bc = b * c
+            z = a / bc - np.log(bc)
+            return -c * (np.log(bc) + np.log(wrightomega(z).real))
+
+        x = np.broadcast_to(SWAMEE_JAIN.friction_factor(reynolds, relative_roughness) ** -0.5,
+                            np.broadcast(a, b).shape).copy()
+        for _ in range(self.max_iter):
+            inner = a + b * x
+            g = x + c * np.log(inner)
+            step = g / (1 + c * b / inner)
+            x -= step
+            if np.all(np.abs(step) <= self.tol * np.abs(x)):
+                break
+        return x
+
+    def friction_factor(self, reynolds, relative_roughness):
+        return self.inverse_sqrt(reynolds, relative_roughness) ** -2
+
+    def derivative(self, reynolds, relative_roughness):
+        reynolds = np.asarray(reynolds, dtype=float)
+        x = self.inverse_sqrt(reynolds, relative_roughness)
+        a = relative_roughness / 3.7
+        b = 2.51 / reynolds
+        c = 2 / LN10
+        # Implicit differentiation of x + c ln(a + b x) = 0 with db/dRe = -b/Re
+        dx = c * x * b / (reynolds * (a + b * x + c * b))
+        return -2 * x ** -3 * dx
+
+    def roughness_derivative(self, reynolds, relative_roughness):
+        reynolds = np.asarray(reynolds, dtype=float)
+        x = self.inverse_sqrt(reynolds, relative_roughness)
+        a = relative_roughness / 3.7
+        b = 2.51 / reynolds
+        c = 2 / LN10
+        # Implicit differentiation of x + c ln(a + b x) = 0 with da/d(ε/D) = 1/3.7
+        dx = -c / (3.7 * (a + b * x + c * b))
+        return -2 * x ** -3 * dx
+
+    def __repr__(self) -> str:
+        return f"ColebrookWhite(method={self.method!r}, tol={self.tol!r}, max_iter={self.max_iter!r})"
+
+
+SWAMEE_JAIN = SwameeJain()
+
+FRICTION_MODELS: Dict[str, FrictionModel] = {
+    'swamee_jain': SWAMEE_JAIN,
+    'haaland': Haaland(),
+    'serghides': Serghides(),
+    'colebrook': ColebrookWhite(),
+    'colebrook_newton': ColebrookWhite(method='newton'),
+}
+
+
+def get_friction_model(model: Union[str, FrictionModel]) -> FrictionModel:
+    """
+    Resolve a friction model by name (or pass a model instance through).
+
+    Args:
+        model: Name in FRICTION_MODELS, 'table' for the shared precomputed
+            lookup table, or a FrictionModel instance
+
+    Returns:
+        Friction model instance
+    """
+    if isinstance(model, FrictionModel):
+        return model
+    if model == 'table':
+        # Built (or loaded from the disk cache) on first use only
+        from .friction_table import default_table
+        return default_table()
+    try:
+        return FRICTION_MODELS[model]
+    except KeyError:
+        raise ValueError(f"Unknown friction model {model!r}; "
+                         f"choose from {sorted(FRICTION_MODELS) + ['table']}") from None
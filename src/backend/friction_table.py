@@ -0,0 +1,264 @@
+"""
+Friction Factor Lookup Table
+Precomputed (Reynolds number, relative roughness) table with bounded error
+
+The table stores F from a reference model (exact Colebrook-White by default)
+on a grid that is uniform in log10(Re) and log10(ε/D), and evaluates by
+bilinear interpolation in those coordinates. The grid is refined at build
+time until the interpolation error, measured against the reference on a
+4x oversampled check grid, is below the requested relative tolerance.
+Points outside the table domain fall back to the reference formula.
+Tables are cached on disk so they are built once per configuration.
+"""
+
+import hashlib
+import os
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from .friction import ColebrookWhite, FrictionModel, ArrayLike, LN10
+
+# Directory for cached tables (override with PUMP_CACHE_DIR)
+CACHE_DIR = os.environ.get(
+    'PUMP_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'pump-system-analysis')
+)
+
+# Oversampling of the verification grid relative to the table grid
+CHECK_OVERSAMPLING = 4
+
+
+class FrictionTable(FrictionModel):
+    """
+    Friction model that interpolates a precomputed table of a reference model.
+    """
+
+    name = 'table'
+
+    def __init__(self, reference: Optional[FrictionModel] = None,
+                 reynolds_range: Tuple[float, float] = (2e3, 1e8),
+                 roughness_range: Tuple[float, float] = (1e-6, 5e-2),
+                 tol: float = 1e-4, max_points: int = 4096,
+                 cache_dir: Optional[str] = CACHE_DIR):
+        """
+        Build (or load from the disk cache) a friction factor table.
+
+        Args:
+            reference: Model tabulated and used outside the domain
+                (default: exact Colebrook-White)
+            reynolds_range: (min, max) Reynolds number of the table
+            roughness_range: (min, max) relative roughness ε/D of the table
+            tol: Maximum relative interpolation error
+            max_points: Cap on grid points along each axis
+            cache_dir: Directory for cached tables (None disables caching)
+        """
+        self.reference = reference if reference is not None else ColebrookWhite()
+        self.reynolds_range = tuple(float(value) for value in reynolds_range)
+        self.roughness_range = tuple(float(value) for value in roughness_range)
+        self.tol = tol
+        self.max_points = max_points
+        self.hits = 0
+        self.misses = 0
+
+        path = self._cache_path(cache_dir) if cache_dir else None
+        if path and os.path.exists(path):
+            try:
+                self._load(path)
+                return
+            except (OSError, KeyError, ValueError):
+                pass
+        self._build()
+        if path:
+            self._save(path)
+
+    # ----- construction -----------------------------------------------------
+
+    def _cache_path(self, cache_dir: str) -> str:
+        key = repr((repr(self.reference), self.reynolds_range, self.roughness_range,
+                    self.tol, self.max_points, CHECK_OVERSAMPLING))
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return os.path.join(cache_dir, f'friction_table_{digest}.npz')
+
+    def _set_grid(self, n_re: int, n_rr: int) -> None:
+        self.log_re = np.linspace(np.log10(self.reynolds_range[0]),
+                                  np.log10(self.reynolds_range[1]), n_re)
+        self.log_rr = np.linspace(np.log10(self.roughness_range[0]),
+                                  np.log10(self.roughness_range[1]), n_rr)
+        self.values = self.reference.friction_factor(10 ** self.log_re[None, :],
+                                                     10 ** self.log_rr[:, None])
+
+    def _check_errors(self) -> np.ndarray:
+        """Relative interpolation error on the oversampled check grid"""
+        n_rr, n_re = self.values.shape
+        fine_re = np.linspace(self.log_re[0], self.log_re[-1],
+                              (n_re - 1) * CHECK_OVERSAMPLING + 1)
+        fine_rr = np.linspace(self.log_rr[0], self.log_rr[-1],
+                              (n_rr - 1) * CHECK_OVERSAMPLING + 1)
+        exact = self.reference.friction_factor(10 ** fine_re[None, :], 10 ** fine_rr[:, None])
+        approx, _ = self._interpolate(fine_re[None, :], fine_rr[:, None])
+        return np.abs(approx / exact - 1)
+
+    def _build(self) -> None:
+        n_re, n_rr = 65, 17
+        while True:
+            self._set_grid(n_re, n_rr)
+            error = self._check_errors()
+            self.max_relative_error = float(error.max())
+            if self.max_relative_error <= self.tol:
+                break
+            # Error on table rows isolates the Re direction, on columns the ε/D one
+            grow_re = error[::CHECK_OVERSAMPLING, :].max() > self.tol / 2 and \
+                n_re < self.max_points
+            grow_rr = error[:, ::CHECK_OVERSAMPLING].max() > self.tol / 2 and \
+                n_rr < self.max_points
+            if not (grow_re or grow_rr):
+                break
+            if grow_re:
+                n_re = 2 * n_re - 1
+            if grow_rr:
+                n_rr = 2 * n_rr - 1
+
+    def _save(self, path: str) -> None:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = path + '.tmp.npz'
+            np.savez(temporary, log_re=self.log_re, log_rr=self.log_rr, values=self.values,
+                     max_relative_error=self.max_relative_error)
+            os.replace(temporary, path)
+        except OSError:
+            pass  # caching is an optimization; a read-only home is not an error
+
+    def _load(self, path: str) -> None:
+        with np.load(path) as data:
+            self.log_re = data['log_re']
+            self.log_rr = data['log_rr']
+            self.values = data['values']
+            self.max_relative_error = float(data['max_relative_error'])
+
+    # ----- evaluation ---------------------------------------------------------
+
+    def _interpolate(self, log_re: np.ndarray,
+                     log_rr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Bilinear interpolation; returns (F, dF/dlog10(Re))"""
+        d_re = self.log_re[1] - self.log_re[0]
+        d_rr = self.log_rr[1] - self.log_rr[0]
+        u = (log_re - self.log_re[0]) / d_re
+        v = (log_rr - self.log_rr[0]) / d_rr
+        i = np.clip(np.floor(u), 0, self.log_re.size - 2).astype(np.intp)
+        j = np.clip(np.floor(v), 0, self.log_rr.size - 2).astype(np.intp)
+        fu = u - i
+        fv = v - j
+        table = self.values
+        f00, f01 = table[j, i], table[j, i + 1]
+        f10, f11 = table[j + 1, i], table[j + 1, i + 1]
+        value = (1 - fv) * ((1 - fu) * f00 + fu * f01) + fv * ((1 - fu) * f10 + fu * f11)
+        slope = ((1 - fv) * (f01 - f00) + fv * (f11 - f10)) / d_re
+        return value, slope
+
+    def _interpolate_row(self, log_re: np.ndarray,
+                         log_rr: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Fast path for one roughness value: collapse the table to one row first"""
+        d_re = self.log_re[1] - self.log_re[0]
+        d_rr = self.log_rr[1] - self.log_rr[0]
+        v = (log_rr - self.log_rr[0]) / d_rr
+        j = int(np.clip(np.floor(v), 0, self.log_rr.size - 2))
+        fv = v - j
+        row = (1 - fv) * self.values[j] + fv * self.values[j + 1]
+        row_slope = np.diff(row) / d_re
+        u = (log_re - self.log_re[0]) / d_re
+        i = np.clip(u.astype(np.intp), 0, self.log_re.size - 2)
+        slope = row_slope[i]
+        return row[i] + (u - i) * (slope * d_re), slope
+
+    def _evaluate(self, reynolds: ArrayLike, relative_roughness: ArrayLike,
+                  derivative: bool) -> np.ndarray:
+        reynolds = np.asarray(reynolds, dtype=float)
+        relative_roughness = np.asarray(relative_roughness, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_re = np.log10(reynolds)
+            log_rr = np.log10(relative_roughness)
+            if log_rr.size == 1:
+                value, slope = self._interpolate_row(log_re, float(log_rr.flat[0]))
+                value, slope = (np.broadcast_to(array, np.broadcast(reynolds, log_rr).shape)
+                                for array in (value, slope))
+            else:
+                value, slope = self._interpolate(log_re, log_rr)
+            result = slope / (reynolds * LN10) if derivative else value
+
+        inside = ((log_re >= self.log_re[0]) & (log_re <= self.log_re[-1]) &
+                  (log_rr >= self.log_rr[0]) & (log_rr <= self.log_rr[-1]))
+        hits = int(np.count_nonzero(inside))
+        self.hits += hits
+        self.misses += inside.size - hits
+        if hits < inside.size:
+            outside = ~inside
+            reynolds, relative_roughness = np.broadcast_arrays(reynolds, relative_roughness)
+            fallback = self.reference.derivative if derivative else \
+                self.reference.friction_factor
+            result = np.array(result, dtype=float)
+            result[outside] = fallback(reynolds[outside], relative_roughness[outside])
+        return result
+
+    def friction_factor(self, reynolds, relative_roughness):
+        return self._evaluate(reynolds, relative_roughness, derivative=False)
+
+    def derivative(self, reynolds, relative_roughness):
+        # Derivative of the interpolant, consistent with friction_factor
+        return self._evaluate(reynolds, relative_roughness, derivative=True)
+
+    def roughness_derivative(self, reynolds, relative_roughness):
+        # Not tabulated: the reference model's derivative (within the table tolerance)
+        return self.reference.roughness_derivative(reynolds, relative_roughness)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get lookup statistics and the verified error bound.
+
+        Returns:
+            Dictionary with hits, misses (fallback evaluations), hit rate,
+            max relative error, grid shape and domain
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'max_relative_error': self.max_relative_error,
+            'tolerance': self.tol,
+            'grid_shape': self.values.shape,
+            'reynolds_range': self.reynolds_range,
+            'roughness_range': self.roughness_range
+        }
+
+    def reset_stats(self) -> None:
+        """Reset the hit and miss counters"""
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return (f"FrictionTable(reference={self.reference!r}, "
+                f"reynolds_range={self.reynolds_range!r}, "
+                f"roughness_range={self.roughness_range!r}, tol={self.tol!r}, "
+                f"max_points={self.max_points!r})")
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FrictionTable) and repr(self) == repr(other)
+
+    def __hash__(self) -> int:
+        return hash(repr(self))
+
+
+_default_table: Optional[FrictionTable] = None
+
+
+def default_table() -> FrictionTable:
+    """
+    Get the shared default table (built or loaded on first use).
+
+    Returns:
+        FrictionTable over the default domain and tolerance
+    """
+    global _default_table
+    if _default_table is None:
+        _default_table = FrictionTable()
+    return _default_table
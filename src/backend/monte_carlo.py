@@ -0,0 +1,285 @@
+"""
+Monte Carlo Uncertainty Module
+Propagates parameter uncertainty to the operating point and curves
+
+Samples are drawn and solved in fixed-size chunks with the vectorized batch
+solver. Results are never stored per sample: every output is accumulated
+into streaming histograms (whose ranges are fixed from a pilot chunk), so
+memory stays bounded no matter how many samples are requested.
+"""
+
+import numpy as np
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+from .pump_system import PumpSystemAnalyzer
+from .batch_solver import BATCH_PARAMETERS, broadcast_analyzer, solve_analyzer_batch
+
+# A distribution is ('normal', mean, std), ('uniform', low, high),
+# ('lognormal', mean, sigma) of the underlying normal, ('triangular', left,
+# mode, right), ('constant', value), or a callable(rng, size) returning samples
+Distribution = Union[Tuple, Callable[[np.random.Generator, int], np.ndarray]]
+
+OUTPUT_FIELDS = ('velocity', 'head', 'flow_rate_m3s')
+
+# Fine bins used for percentile estimation (reported histograms are coarser)
+FINE_BINS = 4096
+
+
+def sample_distribution(spec: Distribution, rng: np.random.Generator, size: int) -> np.ndarray:
+    """
+    Draw samples from a distribution specification.
+
+    Args:
+        spec: Distribution tuple or callable(rng, size)
+        rng: NumPy random generator
+        size: Number of samples
+
+    Returns:
+        Array of samples
+    """
+    if callable(spec):
+        return np.asarray(spec(rng, size), dtype=float)
+    kind, *args = spec
+    if kind == 'normal':
+        return rng.normal(args[0], args[1], size)
+    if kind == 'uniform':
+        return rng.uniform(args[0], args[1], size)
+    if kind == 'lognormal':
+        return rng.lognormal(args[0], args[1], size)
+    if kind == 'triangular':
+        return rng.triangular(args[0], args[1], args[2], size)
+    if kind == 'constant':
+        return np.full(size, float(args[0]))
+    raise ValueError(f"Unknown distribution: {kind!r}")
+
+
+class StreamingHistogram:
+    """
+    Fixed-range histograms of several columns, updated chunk by chunk.
+
+    Values outside a column's range are counted in its edge bins and in
+    the out_of_range counter.
+    """
+
+    def __init__(self, low: np.ndarray, high: np.ndarray, bins: int = FINE_BINS):
+        """
+        Args:
+            low: Lower range bound of each column
+            high: Upper range bound of each column
+            bins: Number of bins per column
+        """
+        self.low = np.atleast_1d(np.asarray(low, dtype=float))
+        high = np.atleast_1d(np.asarray(high, dtype=float))
+        self.width = np.where(high > self.low, (high - self.low) / bins, 1.0)
+        self.bins = bins
+        self.counts = np.zeros((self.low.size, bins), dtype=np.int64)
+        self.out_of_range = np.zeros(self.low.size, dtype=np.int64)
+        self.total = np.zeros(self.low.size, dtype=np.int64)
+        self.sum = np.zeros(self.low.size)
+        self.sum_squares = np.zeros(self.low.size)
+        self.minimum = np.full(self.low.size, np.inf)
+        self.maximum = np.full(self.low.size, -np.inf)
+
+    @classmethod
+    def from_pilot(cls, pilot: np.ndarray, bins: int = FINE_BINS,
+                   margin: float = 0.5) -> 'StreamingHistogram':
+        """
+        Fix column ranges from a pilot sample, widened by a relative margin.
+
+        Args:
+            pilot: Array of shape (samples, columns)
+            bins: Number of bins per column
+            margin: Fraction of the pilot range added on each side
+        """
+        low = np.nanmin(pilot, axis=0)
+        high = np.nanmax(pilot, axis=0)
+        spread = np.where(high > low, high - low, np.abs(high) * 1e-3 + 1e-12)
+        return cls(low - margin * spread, high + margin * spread, bins)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a chunk of values.
+
+        Args:
+            values: Array of shape (samples, columns); NaN rows are skipped
+        """
+        values = np.asarray(values, dtype=float).reshape(-1, self.low.size)
+        valid = np.isfinite(values)
+        all_valid = bool(valid.all())
+        if not all_valid:
+            values = np.where(valid, values, np.nan)
+
+        index = (values - self.low) / self.width
+        np.floor(index, out=index)
+        with np.errstate(invalid='ignore'):
+            self.out_of_range += ((index < 0) | (index >= self.bins)).sum(axis=0)
+        np.clip(index, 0, self.bins - 1, out=index)
+        if not all_valid:
+            index[~valid] = 0
+        index = index.astype(np.intp)
+        index += np.arange(self.low.size) * self.bins
+        flat = index.ravel() if all_valid else index[valid]
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+
+        self.total += valid.sum(axis=0)
+        self.sum += np.nansum(values, axis=0)
+        self.sum_squares += np.nansum(values ** 2, axis=0)
+        low = values if all_valid else np.where(valid, values, np.inf)
+        high = values if all_valid else np.where(valid, values, -np.inf)
+        self.minimum = np.minimum(self.minimum, low.min(axis=0, initial=np.inf))
+        self.maximum = np.maximum(self.maximum, high.max(axis=0, initial=-np.inf))
+
+    def percentiles(self, percentiles: Sequence[float]) -> np.ndarray:
+        """
+        Estimate percentiles by linear interpolation inside the fine bins.
+
+        Returns:
+            Array of shape (len(percentiles), columns)
+        """
+        cumulative = np.cumsum(self.counts, axis=1)
+        result = np.empty((len(percentiles), self.low.size))
+        for column in range(self.low.size):
+            edges = self.low[column] + self.width[column] * np.arange(self.bins + 1)
+            cdf = np.concatenate(([0.0], cumulative[column] / max(self.total[column], 1)))
+            result[:, column] = np.interp(np.asarray(percentiles) / 100.0, cdf, edges)
+        return result
+
+    def coarse(self, column: int, bins: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogram of one column re-binned onto `bins` bins spanning its observed range.
+
+        Returns:
+            (counts, edges)
+        """
+        fine_edges = self.low[column] + self.width[column] * np.arange(self.bins + 1)
+        edges = np.linspace(self.minimum[column], self.maximum[column], bins + 1)
+        centers = np.clip(0.5 * (fine_edges[:-1] + fine_edges[1:]), edges[0], edges[-1])
+        counts, _ = np.histogram(centers, bins=edges, weights=self.counts[column])
+        return counts.astype(np.int64), edges
+
+    def mean(self) -> np.ndarray:
+        return self.sum / np.maximum(self.total, 1)
+
+    def std(self) -> np.ndarray:
+        mean = self.mean()
+        return np.sqrt(np.maximum(self.sum_squares / np.maximum(self.total, 1) - mean ** 2, 0))
+
+
+def run_monte_carlo(distributions: Dict[str, Distribution], num_samples: int = 1_000_000,
+                    chunk_size: int = 100_000, base: Optional[PumpSystemAnalyzer] = None,
+                    seed: Optional[int] = None,
+                    percentiles: Sequence[float] = (5, 25, 50, 75, 95),
+                    bins: int = 50, v_min: float = 0.1, v_max: float = 2.0,
+                    curve_points: int = 100, curve_samples: int = 100_000,
+                    band_percentiles: Sequence[float] = (5, 50, 95)) -> Dict:
+    """
+    Propagate parameter uncertainty to the operating point and curves.
+
+    Args:
+        distributions: Distribution per analyzer parameter, e.g.
+            {'static_head': ('normal', 7.85, 0.2),
+             'pump_coefficient': ('uniform', 0.065, 0.07)}
+        num_samples: Total Monte Carlo samples
+        chunk_size: Samples drawn and solved per chunk (bounds memory)
+        base: Analyzer providing the parameters without a distribution
+        seed: Random seed for reproducible runs
+        percentiles: Percentiles reported for each output
+        bins: Bins of the reported histograms
+        v_min: Minimum velocity of the curve bands in m/s
+        v_max: Maximum velocity of the curve bands in m/s
+        curve_points: Velocity points of the curve bands
+        curve_samples: Samples used for the curve bands (the first ones
+            drawn); percentile bands converge long before the operating
+            point histograms, and each sample costs curve_points evaluations.
+            0 skips the bands, which are then NaN
+        band_percentiles: Percentiles of the curve confidence bands
+
+    Returns:
+        Dictionary with sample counts, per-output statistics (mean, std,
+        min, max, percentiles) over converged samples, histograms, and
+        curve confidence bands
+    """
+    unknown = set(distributions) - set(BATCH_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown uncertain parameters: {sorted(unknown)}")
+
+    rng = np.random.default_rng(seed)
+    base = base if base is not None else PumpSystemAnalyzer()
+    velocities = np.linspace(v_min, v_max, curve_points)
+    # Curve matrices are evaluated in slices of about one million elements
+    curve_slice = max(1, 1_000_000 // curve_points)
+
+    outputs = None
+    system_band = pump_band = None
+    converged_total = 0
+    drawn = 0
+
+    while drawn < num_samples:
+        size = min(chunk_size, num_samples - drawn)
+        parameters = {name: sample_distribution(spec, rng, size)
+                      for name, spec in distributions.items()}
+        analyzer = broadcast_analyzer(base, **parameters)
+        solution = solve_analyzer_batch(analyzer)
+        converged_total += int(solution['converged'].sum())
+        values = np.column_stack([solution[field] for field in OUTPUT_FIELDS])
+        if outputs is None and np.isfinite(values).any():
+            outputs = StreamingHistogram.from_pilot(values)
+        if outputs is not None:
+            outputs.update(values)
+
+        # Curves per sample: parameter columns broadcast against the velocity row
+        band_rows = min(size, max(curve_samples - drawn, 0))
+        for start in range(0, band_rows, curve_slice):
+            shape = (min(curve_slice, band_rows - start), curve_points)
+            rows = {name: column[start:start + shape[0], None]
+                    for name, column in parameters.items()}
+            row_analyzer = broadcast_analyzer(base, **rows)
+            with np.errstate(invalid='ignore'):
+                system = np.broadcast_to(row_analyzer.calculate_system_head(velocities), shape)
+                pump = np.broadcast_to(row_analyzer.calculate_pump_head(velocities), shape)
+            if system_band is None:
+                system_band = StreamingHistogram.from_pilot(system, bins=1024)
+                pump_band = StreamingHistogram.from_pilot(pump, bins=1024)
+            system_band.update(system)
+            pump_band.update(pump)
+        drawn += size
+
+    if outputs is None:
+        return {'success': False, 'num_samples': num_samples, 'converged': 0,
+                'failed': num_samples,
+                'message': "No sample has an operating point in its bracket"}
+
+    statistics = {}
+    histograms = {}
+    values_at = outputs.percentiles(percentiles)
+    for column, field in enumerate(OUTPUT_FIELDS):
+        statistics[field] = {
+            'mean': float(outputs.mean()[column]),
+            'std': float(outputs.std()[column]),
+            'min': float(outputs.minimum[column]),
+            'max': float(outputs.maximum[column]),
+            'percentiles': {p: float(values_at[k, column]) for k, p in enumerate(percentiles)}
+        }
+        counts, edges = outputs.coarse(column, bins)
+        histograms[field] = {'counts': counts, 'edges': edges}
+
+    if system_band is not None:
+        system_values = system_band.percentiles(band_percentiles)
+        pump_values = pump_band.percentiles(band_percentiles)
+    else:
+        system_values = pump_values = np.full((len(band_percentiles), curve_points), np.nan)
+    return {
+        'success': True,
+        'num_samples': num_samples,
+        'converged': converged_total,
+        'failed': num_samples - converged_total,
+        'statistics': statistics,
+        'histograms': histograms,
+        'out_of_range': {field: int(outputs.out_of_range[column])
+                         for column, field in enumerate(OUTPUT_FIELDS)},
+        'curve_bands': {
+            'velocities': velocities,
+            'system_head': {p: system_values[k] for k, p in enumerate(band_percentiles)},
+            'pump_head': {p: pump_values[k] for k, p in enumerate(band_percentiles)}
+        }
+    }
@@ -0,0 +1,434 @@
+"""
+Pipe Network Module
+Solves branched and looped networks of pipes and pumps
+
+Node heads and link flows are found with the global gradient algorithm
+(Todini-Pilati): a Newton-Raphson iteration on the energy and continuity
+equations in which the link flow corrections are eliminated, leaving one
+sparse symmetric positive definite system in the junction heads per
+iteration. Pipe head loss uses the analyzer formula (K1 F + K2) v²/2g with
+the laminar 64/Re below RE_LAMINAR, the analyzer's friction model above
+RE_TURBULENT and a smooth blend of the two in between (the turbulent
+correlations are singular at very low Re, so they are never evaluated
+there); pumps use the calculate_pump_head characteristic.
+"""
+
+import warnings
+import numpy as np
+from typing import Dict, List, Optional, Union
+
+from .pump_system import PumpSystemAnalyzer
+from .batch_solver import broadcast_analyzer
+
+# Link kinds
+PIPE = 0
+PUMP = 1
+
+# Smallest velocity used in friction evaluations (avoids Re = 0)
+MIN_VELOCITY = 1e-9
+
+# Reynolds numbers bounding the laminar-turbulent transition band
+RE_LAMINAR = 2000.0
+RE_TURBULENT = 4000.0
+
+# Pump resistance floor near zero flow, as a fraction of shutoff velocity
+PUMP_REGULARIZATION = 0.01
+
+NodeRef = Union[int, str]
+
+
+class PipeNetwork:
+    """
+    Network of junctions, fixed-head reservoirs, pipes and pumps.
+
+    Pipe and pump parameters default to those of a template analyzer, so a
+    one-pipe network reproduces PumpSystemAnalyzer. Parameters may be
+    changed between solves with set_node/set_link; each solve starts from
+    the previous solution when the topology is unchanged.
+    """
+
+    def __init__(self, analyzer: Optional[PumpSystemAnalyzer] = None):
+        """
+        Initialize an empty network.
+
+        Args:
+            analyzer: Template providing the friction model and default
+                link parameters (default: PumpSystemAnalyzer())
+        """
+        self.analyzer = analyzer if analyzer is not None else PumpSystemAnalyzer()
+        self.node_names: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        self.link_names: List[str] = []
+        self.link_index: Dict[str, int] = {}
+        self._nodes: Dict[str, list] = {'fixed': [], 'value': []}
+        self._links: Dict[str, list] = {
+            'kind': [], 'start': [], 'end': [], 'diameter': [],
+            'loss_coefficient_1': [], 'loss_coefficient_2': [], 'roughness_factor': [],
+            'reynolds_coefficient': [], 'pump_max_head': [], 'pump_coefficient': [],
+            'pump_velocity_factor': []
+        }
+        self._compiled = None
+        self.flows: Optional[np.ndarray] = None
+        self.heads: Optional[np.ndarray] = None
+
+    # ----- construction -----------------------------------------------------
+
+    def _add_node(self, name: str, fixed: bool, value: float) -> int:
+        if name in self.node_index:
+            raise ValueError(f"Duplicate node name: {name!r}")
+        self.node_index[name] = len(self.node_names)
+        self.node_names.append(name)
+        self._nodes['fixed'].append(fixed)
+        self._nodes['value'].append(float(value))
+        self._invalidate(topology=True)
+        return self.node_index[name]
+
+    def add_junction(self, name: str, demand: float = 0.0) -> int:
+        """
+        Add a junction with unknown head.
+
+        Args:
+            name: Node name
+            demand: Outflow consumed at the node in m³/s
+
+        Returns:
+            Node index
+        """
+        return self._add_node(name, False, demand)
+
+    def add_reservoir(self, name: str, head: float) -> int:
+        """
+        Add a fixed-head node (reservoir or tank).
+
+        Args:
+            name: Node name
+            head: Total head in m
+
+        Returns:
+            Node index
+        """
+        return self._add_node(name, True, head)
+
+    def _node(self, node: NodeRef) -> int:
+        return self.node_index[node] if isinstance(node, str) else int(node)
+
+    def _add_link(self, name: str, kind: int, start: NodeRef, end: NodeRef,
+                  **parameters: float) -> int:
+        if name in self.link_index:
+            raise ValueError(f"Duplicate link name: {name!r}")
+        self.link_index[name] = len(self.link_names)
+        self.link_names.append(name)
+        self._links['kind'].append(kind)
+        self._links['start'].append(self._node(start))
+        self._links['end'].append(self._node(end))
+        for key, value in parameters.items():
+            self._links[key].append(float(value))
+        self._invalidate(topology=True)
+        return self.link_index[name]
+
+    def add_pipe(self, name: str, start: NodeRef, end: NodeRef,
+                 diameter: Optional[float] = None, length: Optional[float] = None,
+                 loss_coefficient_1: Optional[float] = None,
+                 loss_coefficient_2: Optional[float] = None,
+                 roughness_factor: Optional[float] = None) -> int:
+        """
+        Add a pipe; positive flow runs from start to end.
+
+        Missing parameters are taken from the template analyzer, keeping
+        its absolute roughness and kinematic viscosity when the diameter
+        differs.
+
+        Args:
+            name: Link name
+            start: Start node name or index
+            end: End node name or index
+            diameter: Pipe diameter in m
+            length: Pipe length in m (sets loss_coefficient_1 = L/D)
+            loss_coefficient_1: Coefficient of F in the head loss (L/D)
+            loss_coefficient_2: Sum of minor loss coefficients
+            roughness_factor: D/ε
+
+        Returns:
+            Link index
+        """
+        template = self.analyzer
+        diameter = template.diameter if diameter is None else diameter
+        scale = diameter / template.diameter
+        if loss_coefficient_1 is None:
+            loss_coefficient_1 = length / diameter if length is not None else \
+                template.loss_coefficient_1
+        return self._add_link(
+            name, PIPE, start, end,
+            diameter=diameter,
+            loss_coefficient_1=loss_coefficient_1,
+            loss_coefficient_2=template.loss_coefficient_2 if loss_coefficient_2 is None
+            else loss_coefficient_2,
+            roughness_factor=template.roughness_factor * scale if roughness_factor is None
+            else roughness_factor,
+            reynolds_coefficient=template.reynolds_coefficient * scale,
+            # Pump parameters are unused on pipes
+            pump_max_head=template.pump_max_head, pump_coefficient=template.pump_coefficient,
+            pump_velocity_factor=template.pump_velocity_factor
+        )
+
+    def add_pump(self, name: str, start: NodeRef, end: NodeRef,
+                 pump_max_head: Optional[float] = None,
+                 pump_coefficient: Optional[float] = None,
+                 pump_velocity_factor: Optional[float] = None,
+                 diameter: Optional[float] = None) -> int:
+        """
+        Add a pump lifting head from start to end.
+
+        The characteristic is calculate_pump_head evaluated at the velocity
+        in a reference pipe of the given diameter.
+
+        Args:
+            name: Link name
+            start: Suction node name or index
+            end: Discharge node name or index
+            pump_max_head: Shutoff head in m
+            pump_coefficient: Curve coefficient
+            pump_velocity_factor: Velocity scale of the curve
+            diameter: Reference pipe diameter in m
+
+        Returns:
+            Link index
+        """
+        template = self.analyzer
+        return self._add_link(
+            name, PUMP, start, end,
+            diameter=template.diameter if diameter is None else diameter,
+            loss_coefficient_1=0.0, loss_coefficient_2=0.0,
+            roughness_factor=template.roughness_factor,
+            reynolds_coefficient=template.reynolds_coefficient,
+            pump_max_head=template.pump_max_head if pump_max_head is None else pump_max_head,
+            pump_coefficient=template.pump_coefficient if pump_coefficient is None
+            else pump_coefficient,
+            pump_velocity_factor=template.pump_velocity_factor if pump_velocity_factor is None
+            else pump_velocity_factor
+        )
+
+    def set_node(self, node: NodeRef, value: float) -> None:
+        """
+        Change a junction demand (m³/s) or a reservoir head (m).
+
+        Args:
+            node: Node name or index
+            value: New demand or head
+        """
+        index = self._node(node)
+        self._nodes['value'][index] = float(value)
+        if self._compiled is not None:
+            self._compiled['node_value'][index] = float(value)
+
+    def set_link(self, link: Union[int, str], **parameters: float) -> None:
+        """
+        Change link parameters (e.g. diameter, pump_max_head).
+
+        Args:
+            link: Link name or index
+            **parameters: New parameter values
+        """
+        index = self.link_index[link] if isinstance(link, str) else int(link)
+        for key, value in parameters.items():
+            if key not in self._links or key in ('kind', 'start', 'end'):
+                raise ValueError(f"Unknown link parameter: {key!r}")
+            self._links[key][index] = float(value)
+        self._invalidate(topology=False)
+
+    def _invalidate(self, topology: bool) -> None:
+        if topology:
+            self._compiled = None
+            self.flows = self.heads = None
+        elif self._compiled is not None:
+            self._compiled['analyzer'] = None
+
+    # ----- compiled arrays ----------------------------------------------------
+
+    def _compile(self) -> Dict:
+        """Build index arrays, the incidence structure and the link analyzer"""
+        from scipy import sparse
+
+        compiled = self._compiled
+        if compiled is None:
+            fixed = np.array(self._nodes['fixed'], dtype=bool)
+            junctions = np.flatnonzero(~fixed)
+            # Position of every node among the unknowns (-1 for reservoirs)
+            position = np.full(fixed.size, -1, dtype=np.intp)
+            position[junctions] = np.arange(junctions.size)
+            start = np.array(self._links['start'], dtype=np.intp)
+            end = np.array(self._links['end'], dtype=np.intp)
+            links = np.arange(start.size)
+
+            # Junction incidence: +1 at the start node, -1 at the end node
+            rows = np.concatenate([links, links])
+            columns = np.concatenate([position[start], position[end]])
+            signs = np.concatenate([np.ones(start.size), -np.ones(end.size)])
+            keep = columns >= 0
+            incidence = sparse.csr_matrix((signs[keep], (rows[keep], columns[keep])),
+                                          shape=(start.size, junctions.size))
+            compiled = {
+                'fixed': fixed, 'junctions': junctions, 'start': start, 'end': end,
+                'kind': np.array(self._links['kind'], dtype=np.int8),
+                'incidence': incidence,
+                'node_value': np.array(self._nodes['value'], dtype=float),
+                'analyzer': None
+            }
+            self._compiled = compiled
+
+        if compiled['analyzer'] is None:
+            parameters = {key: np.array(values, dtype=float)
+                          for key, values in self._links.items()
+                          if key not in ('kind', 'start', 'end')}
+            analyzer = broadcast_analyzer(self.analyzer, **parameters)
+            pumps = compiled['kind'] == PUMP
+            compiled['analyzer'] = analyzer
+            compiled['pump'] = pumps
+            shutoff = np.where(pumps, analyzer.calculate_shutoff_velocity(), 0.0)
+            # Keeps the pump resistance positive through zero flow
+            compiled['pump_floor'] = -analyzer.calculate_pump_head_derivative(
+                PUMP_REGULARIZATION * shutoff)
+        return compiled
+
+    # ----- link laws ----------------------------------------------------------
+
+    def link_head_loss(self, flows: np.ndarray):
+        """
+        Head drop from start to end of every link and its derivative.
+
+        Args:
+            flows: Link flows in m³/s
+
+        Returns:
+            (head loss in m, d(head loss)/dQ in s/m²)
+        """
+        compiled = self._compile()
+        analyzer = compiled['analyzer']
+        pumps = compiled['pump']
+        area = analyzer.area
+        velocity = flows / area
+        speed = np.maximum(np.abs(velocity), MIN_VELOCITY)
+
+        # Pipes: laminar 64/Re, the friction model, and a smoothstep blend
+        # over the transition band. The model is evaluated no lower than
+        # RE_LAMINAR, where it is well behaved
+        reynolds = analyzer.reynolds_coefficient * speed
+        turbulent_speed = np.maximum(speed, RE_LAMINAR / analyzer.reynolds_coefficient)
+        turbulent = analyzer.calculate_friction_factor(turbulent_speed)
+        d_turbulent = np.where(speed >= turbulent_speed,
+                               analyzer.calculate_friction_factor_derivative(turbulent_speed),
+                               0.0)
+        laminar = 64.0 / reynolds
+        d_laminar = -laminar / speed
+        band = RE_TURBULENT - RE_LAMINAR
+        x = np.clip((reynolds - RE_LAMINAR) / band, 0.0, 1.0)
+        weight = x * x * (3 - 2 * x)
+        d_weight = 6 * x * (1 - x) * analyzer.reynolds_coefficient / band
+        F = laminar + weight * (turbulent - laminar)
+        dF = d_laminar + weight * (d_turbulent - d_laminar) + d_weight * (turbulent - laminar)
+        K1, K2 = analyzer.loss_coefficient_1, analyzer.loss_coefficient_2
+        g2 = analyzer.gravity_factor
+        loss = (K1 * F + K2) * speed * speed / g2
+        slope = (K1 * dF * speed * speed + 2 * speed * (K1 * F + K2)) / g2
+        loss = np.sign(velocity) * loss
+
+        # Pumps: the head gain is a negative loss. Reverse flow continues the
+        # curve as Hmax - c (k v)|k v| so the loss stays monotone in Q
+        drop = analyzer.pump_max_head - analyzer.calculate_pump_head(np.abs(velocity))
+        loss = np.where(pumps, np.sign(velocity) * drop - analyzer.pump_max_head, loss)
+        slope = np.where(pumps,
+                         np.maximum(-analyzer.calculate_pump_head_derivative(np.abs(velocity)),
+                                    compiled['pump_floor']), slope)
+        return loss, slope / area
+
+    # ----- solver -------------------------------------------------------------
+
+    def _residuals(self, compiled: Dict, flows: np.ndarray, heads: np.ndarray):
+        """Energy residual per link and continuity residual per junction"""
+        loss, slope = self.link_head_loss(flows)
+        energy = loss - (heads[compiled['start']] - heads[compiled['end']])
+        demand = compiled['node_value'][compiled['junctions']]
+        continuity = compiled['incidence'].T @ flows + demand
+        return energy, continuity, slope
+
+    def solve(self, tol: float = 1e-10, head_tol: float = 1e-8, max_iter: int = 50,
+              warm_start: bool = True, initial_velocity: float = 0.5) -> Dict:
+        """
+        Solve node heads and link flows.
+
+        Args:
+            tol: Convergence tolerance on the continuity residual in m³/s
+            head_tol: Convergence tolerance on the energy residual in m
+            max_iter: Maximum Newton iterations
+            warm_start: Start from the previous converged solution when available
+            initial_velocity: Velocity of every link in a cold start in m/s
+
+        Returns:
+            Dictionary with node heads, link flows, velocities and head
+            losses (arrays ordered like node_names/link_names), iteration
+            count, residuals, success flag and message
+        """
+        from scipy import sparse
+        from scipy.sparse.linalg import spsolve
+
+        compiled = self._compile()
+        fixed, junctions = compiled['fixed'], compiled['junctions']
+        incidence = compiled['incidence']
+        area = compiled['analyzer'].area
+
+        if not fixed.any():
+            return {'success': False, 'message': "Network has no fixed-head node"}
+
+        if warm_start and self.flows is not None:
+            flows, heads = self.flows.copy(), self.heads.copy()
+        else:
+            flows = initial_velocity * area
+            heads = np.full(fixed.size, np.mean(compiled['node_value'][fixed]))
+        heads[fixed] = compiled['node_value'][fixed]
+
+        energy, continuity, slope = self._residuals(compiled, flows, heads)
+        converged = singular = False
+        iterations = 0
+        for iterations in range(1, max_iter + 1):
+            # Newton step with the flow corrections eliminated:
+            # (Aᵀ D⁻¹ A) dH = -c + Aᵀ D⁻¹ r,  dQ = D⁻¹ (-r + A dH)
+            inverse = 1.0 / slope
+            matrix = incidence.T @ sparse.diags(inverse) @ incidence
+            rhs = -continuity + incidence.T @ (inverse * energy)
+            # A singular matrix (a junction without a path to a fixed head)
+            # yields NaN steps and ends the iteration
+            with warnings.catch_warnings(), np.errstate(all='ignore'):
+                warnings.simplefilter('ignore')
+                step_heads = np.atleast_1d(spsolve(matrix.tocsc(), rhs)) if rhs.size \
+                    else rhs
+            if not np.all(np.isfinite(step_heads)):
+                singular = True
+                break
+            step_flows = inverse * (-energy + incidence @ step_heads)
+
+            flows = flows + step_flows
+            heads[junctions] += step_heads
+            energy, continuity, slope = self._residuals(compiled, flows, heads)
+
+            if np.max(np.abs(energy)) <= head_tol and \
+                    np.max(np.abs(continuity), initial=0.0) <= tol:
+                converged = True
+                break
+
+        if converged:
+            self.flows, self.heads = flows, heads
+        velocity = flows / area
+        loss, _ = self.link_head_loss(flows)
+        return {
+            'success': converged,
+            'message': f"Converged in {iterations} iterations" if converged else
+                       "Singular network matrix (junction without a path to a fixed head)"
+                       if singular else f"No convergence after {iterations} iterations",
+            'iterations': iterations,
+            'node_heads': heads,
+            'link_flows': flows,
+            'link_velocities': velocity,
+            'link_head_loss': loss,
+            'max_energy_residual': float(np.max(np.abs(energy))),
+            'max_continuity_residual': float(np.max(np.abs(continuity), initial=0.0))
+        }
@@ -0,0 +1,459 @@
+"""
+Design Optimization Module
+Pipe diameter and pump selection minimizing life-cycle cost
+
+A design is a pipe diameter and a pump from a catalogue. Resizing the pipe
+keeps the base system's pipe length, absolute roughness and kinematic
+viscosity (loss_coefficient_1 = L/D, roughness_factor = D/ε and
+reynolds_coefficient = D/ν scale with D), and each pump keeps its flow
+characteristic: catalogue parameters refer to the base pipe, and
+pump_velocity_factor scales with the pipe area.
+
+Life-cycle cost = pipe cost per meter x length + pump price
+                + present value of the energy needed to pump the annual
+                  volume against the operating head
+
+Pumping a volume V against head H takes ρ·g·H·V whatever the flow, but
+only if the pump can run long enough: a design must deliver at least
+annual_volume / (max_utilization x 8760 h), which acts as an implicit
+minimum flow next to the explicit one.
+
+The operating velocity v*(D) is implicit in Ha(v, D) = ha(v, D), so its
+diameter sensitivity follows from the implicit function theorem,
+dv*/dD = -(dHa/dD - dha/dD) / (dHa/dv - dha/dv), with every partial
+derivative analytic (including dF/d(ε/D) from the friction model). The
+search evaluates all pumps on a diameter grid in one vectorized solve
+(pumps without a feasible grid point get their largest constraint slack
+located between grid points, so narrow feasible windows are not missed),
+then refines each pump's optimum with a bracketed secant iteration on the
+cost gradient (or on the active constraint when the optimum lies on it),
+warm-starting every operating-point solve from the previous velocities.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from . import profiling
+from .pump_system import PumpSystemAnalyzer, ArrayLike
+from .batch_solver import broadcast_analyzer, solve_analyzer_batch
+from .root_finding import bracketed_secant
+
+# Pump parameters a catalogue entry may set (others come from the base system)
+PUMP_PARAMETERS = ('pump_max_head', 'pump_coefficient', 'pump_velocity_factor')
+HOURS_PER_YEAR = 8760.0
+
+
+class CostModel:
+    """
+    Prices and economic assumptions of a life-cycle cost evaluation.
+    """
+
+    def __init__(self, pipe_cost_coefficient: float = 2000.0,
+                 pipe_cost_exponent: float = 1.5,
+                 energy_price: float = 0.15,
+                 annual_volume: float = 3000.0,
+                 efficiency: float = 0.7,
+                 discount_rate: float = 0.05,
+                 lifetime: float = 20.0,
+                 density: float = 1000.0,
+                 max_utilization: float = 1.0):
+        """
+        Initialize a cost model.
+
+        Args:
+            pipe_cost_coefficient: a in the pipe cost a·D^b per meter
+            pipe_cost_exponent: b in the pipe cost a·D^b per meter
+            energy_price: Energy price per kWh
+            annual_volume: Volume pumped per year in m³
+            efficiency: Wire-to-water efficiency of pumps without their own
+            discount_rate: Yearly discount rate of the present value
+            lifetime: Evaluation period in years
+            density: Fluid density in kg/m³
+            max_utilization: Largest fraction of the year a pump may run
+        """
+        self.pipe_cost_coefficient = pipe_cost_coefficient
+        self.pipe_cost_exponent = pipe_cost_exponent
+        self.energy_price = energy_price
+        self.annual_volume = annual_volume
+        self.efficiency = efficiency
+        self.discount_rate = discount_rate
+        self.lifetime = lifetime
+        self.density = density
+        self.max_utilization = max_utilization
+
+    @property
+    def present_value_factor(self) -> float:
+        """Present value of one unit of yearly cost over the lifetime"""
+        if self.discount_rate == 0:
+            return self.lifetime
+        return (1 - (1 + self.discount_rate) ** -self.lifetime) / self.discount_rate
+
+    @property
+    def required_flow(self) -> float:
+        """Smallest flow in m³/s that pumps the annual volume within the running time"""
+        return self.annual_volume / (HOURS_PER_YEAR * 3600.0 * self.max_utilization)
+
+    def pipe_cost(self, diameter: ArrayLike, length: float) -> ArrayLike:
+        return self.pipe_cost_coefficient * np.asarray(diameter, dtype=float) ** \
+            self.pipe_cost_exponent * length
+
+    def pipe_cost_derivative(self, diameter: ArrayLike, length: float) -> ArrayLike:
+        return self.pipe_cost_exponent * self.pipe_cost(diameter, length) / diameter
+
+
+class DesignEvaluator:
+    """
+    Vectorized operating points, costs and cost gradients of designs.
+
+    Rows pair a diameter with a catalogue pump; velocities of the last
+    evaluation are kept per row and used to warm-start the next one.
+    """
+
+    def __init__(self, base: Optional[PumpSystemAnalyzer] = None,
+                 pumps: Optional[Sequence[Dict]] = None,
+                 costs: Optional[CostModel] = None,
+                 min_flow: float = 0.0, velocity_range: Sequence[float] = (0.0, np.inf),
+                 solver_options: Optional[Dict] = None):
+        """
+        Initialize an evaluator.
+
+        Args:
+            base: System whose pipe is resized (default: PumpSystemAnalyzer())
+            pumps: Catalogue entries, dicts with any of PUMP_PARAMETERS
+                (referred to the base pipe), 'price', 'efficiency' and 'name'
+                (default: the base system's pump at no cost)
+            costs: Cost model (default: CostModel())
+            min_flow: Smallest acceptable operating flow in m³/s (raised to
+                the cost model's required_flow)
+            velocity_range: Acceptable (min, max) operating velocity in m/s
+            solver_options: Forwarded to solve_analyzer_batch (tol, max_iter)
+        """
+        self.base = base if base is not None else PumpSystemAnalyzer()
+        self.pumps = list(pumps) if pumps else [{'name': 'base pump'}]
+        self.costs = costs if costs is not None else CostModel()
+        self.min_flow = max(min_flow, self.costs.required_flow)
+        self.velocity_range = tuple(velocity_range)
+        self.solver_options = solver_options or {}
+
+        base = self.base
+        self.length = base.loss_coefficient_1 * base.diameter
+        self.pump_table = {name: np.array([float(pump.get(name, getattr(base, name)))
+                                           for pump in self.pumps])
+                           for name in PUMP_PARAMETERS}
+        self.pump_price = np.array([float(pump.get('price', 0.0)) for pump in self.pumps])
+        self.pump_efficiency = np.array([float(pump.get('efficiency', self.costs.efficiency))
+                                         for pump in self.pumps])
+        self.names = [str(pump.get('name', f"pump {index}"))
+                      for index, pump in enumerate(self.pumps)]
+        self.velocity: Optional[np.ndarray] = None
+        self.solves = 0
+
+    def analyzer(self, diameter: np.ndarray, pump: np.ndarray) -> PumpSystemAnalyzer:
+        """
+        Array-valued analyzer of the designs (diameter[i], pump[i]).
+
+        Args:
+            diameter: Pipe diameters in m
+            pump: Catalogue indices
+        """
+        base = self.base
+        scale = diameter / base.diameter
+        return broadcast_analyzer(
+            base, diameter=diameter,
+            loss_coefficient_1=self.length / diameter,
+            roughness_factor=base.roughness_factor * scale,
+            reynolds_coefficient=base.reynolds_coefficient * scale,
+            pump_max_head=self.pump_table['pump_max_head'][pump],
+            pump_coefficient=self.pump_table['pump_coefficient'][pump],
+            pump_velocity_factor=self.pump_table['pump_velocity_factor'][pump] * scale ** 2
+        )
+
+    def evaluate(self, diameter: ArrayLike, pump: ArrayLike,
+                 warm_start: bool = True) -> Dict[str, np.ndarray]:
+        """
+        Solve and cost designs.
+
+        Args:
+            diameter: Pipe diameters in m
+            pump: Catalogue indices (broadcast against diameter)
+            warm_start: Start from the velocities of the previous call when
+                it had the same number of rows
+
+        Returns:
+            Dictionary of per-design arrays: diameter, pump, velocity,
+            flow_rate_m3s, head, running_hours (per year, to pump the annual
+            volume), capital_cost, energy_cost (present value), total_cost,
+            cost_gradient (d total / dD), margin (smallest
+            constraint slack, relative; >= 0 when feasible),
+            margin_gradient and feasible
+        """
+        diameter, pump = np.broadcast_arrays(np.asarray(diameter, dtype=float),
+                                             np.asarray(pump, dtype=np.intp))
+        analyzer = self.analyzer(diameter, pump)
+        guess = self.velocity if warm_start and self.velocity is not None and \
+            self.velocity.shape == diameter.shape else None
+        solution = solve_analyzer_batch(analyzer, initial_guess=guess, **self.solver_options)
+        self.solves += 1
+        converged = solution['converged']
+        velocity = np.where(converged, solution['velocity'], np.nan)
+        if converged.any():
+            self.velocity = np.where(converged, velocity,
+                                     guess if guess is not None else np.nan)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            dv = self._velocity_derivative(analyzer, velocity, diameter)
+            head = solution['head']
+            # dH/dD along the operating point: partial in D plus the velocity shift
+            dhead = self._system_head_partial(analyzer, velocity, diameter) + \
+                analyzer.calculate_system_head_derivative(velocity) * dv
+
+            area = analyzer.area
+            flow = area * velocity
+            dflow = 2 * area / diameter * velocity + area * dv
+
+            costs = self.costs
+            energy_factor = costs.present_value_factor * costs.energy_price * \
+                costs.density * (self.base.gravity_factor / 2) * costs.annual_volume / \
+                (self.pump_efficiency[pump] * 3.6e6)
+            capital = costs.pipe_cost(diameter, self.length) + self.pump_price[pump]
+            energy = energy_factor * head
+            gradient = costs.pipe_cost_derivative(diameter, self.length) + energy_factor * dhead
+
+            margin, margin_gradient = self._margin(velocity, dv, flow, dflow)
+
+        feasible = converged & (margin >= 0)
+        return {
+            'diameter': diameter,
+            'pump': pump,
+            'velocity': velocity,
+            'flow_rate_m3s': flow,
+            'head': head,
+            'running_hours': costs.annual_volume / (flow * 3600.0),
+            'capital_cost': capital,
+            'energy_cost': energy,
+            'total_cost': capital + energy,
+            'cost_gradient': gradient,
+            'margin': np.where(converged, margin, -np.inf),
+            'margin_gradient': margin_gradient,
+            'feasible': feasible
+        }
+
+    def _system_head_partial(self, analyzer, velocity, diameter):
+        """dha/dD at fixed velocity (length, ε and ν held constant)"""
+        model = analyzer.friction_model
+        reynolds = analyzer.reynolds_coefficient * velocity
+        roughness = 1 / analyzer.roughness_factor
+        friction = model.friction_factor(reynolds, roughness)
+        # Re = D v / ν grows and ε/D shrinks in proportion to D
+        dfriction = (model.derivative(reynolds, roughness) * reynolds -
+                     model.roughness_derivative(reynolds, roughness) * roughness) / diameter
+        # K1 = L/D, so dK1/dD = -K1/D
+        K1 = analyzer.loss_coefficient_1
+        return K1 * (dfriction - friction / diameter) * velocity ** 2 / analyzer.gravity_factor
+
+    def _velocity_derivative(self, analyzer, velocity, diameter):
+        """dv*/dD by implicit differentiation of Ha = ha"""
+        # The pump keeps its flow curve: Ha(v, D) = h(A(D) v), so dHa/dD = dHa/dv · 2v/D
+        pump_slope = analyzer.calculate_pump_head_derivative(velocity)
+        partial = pump_slope * 2 * velocity / diameter - \
+            self._system_head_partial(analyzer, velocity, diameter)
+        return -partial / (pump_slope - analyzer.calculate_system_head_derivative(velocity))
+
+    def _margin(self, velocity, dv, flow, dflow):
+        """Smallest relative constraint slack and its derivative"""
+        v_min, v_max = self.velocity_range
+        slacks = [(velocity - v_min) / max(v_min, 1e-3), dv / max(v_min, 1e-3)]
+        candidates = [slacks]
+        if np.isfinite(v_max):
+            candidates.append([(v_max - velocity) / v_max, -dv / v_max])
+        if self.min_flow > 0:
+            candidates.append([(flow - self.min_flow) / self.min_flow, dflow / self.min_flow])
+        values = np.stack([value for value, _ in candidates])
+        gradients = np.stack([gradient for _, gradient in candidates])
+        active = np.argmin(np.where(np.isnan(values), -np.inf, values), axis=0)
+        return np.take_along_axis(values, active[None], 0)[0], \
+            np.take_along_axis(gradients, active[None], 0)[0]
+
+
+@profiling.timed('optimize_design')
+def optimize_design(base: Optional[PumpSystemAnalyzer] = None,
+                    pumps: Optional[Sequence[Dict]] = None,
+                    costs: Optional[CostModel] = None,
+                    d_min: float = 0.01, d_max: float = 0.2,
+                    diameters: Optional[Sequence[float]] = None,
+                    min_flow: float = 0.0,
+                    velocity_range: Sequence[float] = (0.3, 3.0),
+                    grid_points: int = 48, tol: float = 1e-7,
+                    solver_options: Optional[Dict] = None) -> Dict:
+    """
+    Find the diameter and pump with the lowest life-cycle cost.
+
+    Args:
+        base: System to size (default: PumpSystemAnalyzer())
+        pumps: Pump catalogue (see DesignEvaluator; default: the base pump)
+        costs: Cost model (default: CostModel())
+        d_min: Smallest diameter searched in m
+        d_max: Largest diameter searched in m
+        diameters: Discrete (e.g. commercial) diameters to choose from
+            instead of the continuous range
+        min_flow: Smallest acceptable operating flow in m³/s
+        velocity_range: Acceptable (min, max) operating velocity in m/s
+        grid_points: Diameters of the initial log-spaced grid (at least 2)
+        tol: Relative diameter tolerance of the refinement
+        solver_options: Forwarded to solve_analyzer_batch
+
+    Returns:
+        Dictionary describing the best design (success, pump, pump_name,
+        diameter, velocity, flow_rate_m3s, head, running_hours, capital_cost,
+        energy_cost, total_cost, on_constraint), 'candidates' with the best
+        design of every pump (arrays, NaN cost where no diameter is
+        feasible) and the number of vectorized 'solves'
+
+    Raises:
+        ValueError: If diameters is empty or the diameter range is invalid
+    """
+    if diameters is not None:
+        grid = np.asarray(diameters, dtype=float).ravel()
+        if grid.size == 0 or not np.all(grid > 0):
+            raise ValueError("diameters must contain at least one positive diameter")
+    else:
+        if not 0 < d_min < d_max:
+            raise ValueError(f"Expected 0 < d_min < d_max, got {d_min} and {d_max}")
+        if grid_points < 2:
+            raise ValueError(f"grid_points must be at least 2, got {grid_points}")
+        grid = np.geomspace(d_min, d_max, grid_points)
+    grid = np.sort(grid)
+
+    evaluator = DesignEvaluator(base, pumps, costs, min_flow, velocity_range, solver_options)
+    count = len(evaluator.pumps)
+    # Every pump on every grid diameter in one solve
+    rows = evaluator.evaluate(grid[None, :], np.arange(count)[:, None])
+    if diameters is None and not rows['feasible'].any(axis=1).all():
+        found = _feasible_between(evaluator, grid, rows, tol)
+        if found.size:
+            grid = np.unique(np.concatenate([grid, found]))
+            rows = evaluator.evaluate(grid[None, :], np.arange(count)[:, None])
+    cost = np.where(rows['feasible'], rows['total_cost'], np.inf)
+    best = np.argmin(cost, axis=1)
+    pump_index = np.arange(count)
+    has_design = np.isfinite(cost[pump_index, best])
+    chosen = {name: values[pump_index, best] for name, values in rows.items()}
+    on_constraint = np.zeros(count, dtype=bool)
+
+    if diameters is None and has_design.any():
+        chosen, on_constraint = _refine(evaluator, grid, rows, best, has_design, chosen, tol)
+
+    total = np.where(has_design, chosen['total_cost'], np.nan)
+    candidates = {
+        'pump': pump_index,
+        'pump_name': evaluator.names,
+        'feasible': has_design,
+        'diameter': np.where(has_design, chosen['diameter'], np.nan),
+        'velocity': np.where(has_design, chosen['velocity'], np.nan),
+        'flow_rate_m3s': np.where(has_design, chosen['flow_rate_m3s'], np.nan),
+        'head': np.where(has_design, chosen['head'], np.nan),
+        'running_hours': np.where(has_design, chosen['running_hours'], np.nan),
+        'capital_cost': np.where(has_design, chosen['capital_cost'], np.nan),
+        'energy_cost': np.where(has_design, chosen['energy_cost'], np.nan),
+        'total_cost': total,
+        'on_constraint': on_constraint
+    }
+    if not has_design.any():
+        error = "No feasible design among the given diameters" if diameters is not None \
+            else "No feasible design found on the diameter grid or between its points"
+        return {'success': False, 'error': error,
+                'candidates': candidates, 'solves': evaluator.solves}
+
+    winner = int(np.nanargmin(total))
+    result = {name: (values[winner] if name == 'pump_name' else
+                     values[winner].item()) for name, values in candidates.items()
+              if name != 'feasible'}
+    result.update(success=True, candidates=candidates, solves=evaluator.solves)
+    return result
+
+
+def _feasible_between(evaluator: DesignEvaluator, grid: np.ndarray,
+                      rows: Dict[str, np.ndarray], tol: float) -> np.ndarray:
+    """
+    Look for feasible diameters between the grid points.
+
+    A pump with no feasible grid point may still have a feasible window
+    narrower than the grid spacing. Its largest constraint slack lies
+    between the neighbors of its best grid point, where the slack gradient
+    changes sign, and is located with one vectorized bracketed secant
+    iteration over all such pumps.
+
+    Returns:
+        Diameters where a pump is feasible (empty when none is found)
+    """
+    margin = rows['margin']
+    pumps = np.flatnonzero(~rows['feasible'].any(axis=1) & np.isfinite(margin).any(axis=1))
+    if pumps.size == 0:
+        return np.empty(0)
+    best = np.argmax(margin[pumps], axis=1)
+    lower = grid[np.maximum(best - 1, 0)]
+    upper = grid[np.minimum(best + 1, grid.size - 1)]
+    evaluator.velocity = None
+
+    def objective(diameter):
+        return evaluator.evaluate(diameter, pumps)['margin_gradient']
+
+    solution = bracketed_secant(objective, lower, upper, xtol=tol, ftol=0.0, max_iter=60)
+    peak = evaluator.evaluate(solution['root'], pumps)
+    return solution['root'][solution['bracketed'] & peak['feasible']]
+
+
+def _refine(evaluator: DesignEvaluator, grid: np.ndarray, rows: Dict[str, np.ndarray],
+            best: np.ndarray, has_design: np.ndarray, chosen: Dict[str, np.ndarray],
+            tol: float):
+    """
+    Refine each pump's best grid diameter to the continuous optimum.
+
+    Between the best grid point and a neighbor, the optimum is either a
+    zero of the cost gradient (both points feasible) or the constraint
+    boundary (the neighbor infeasible). Both are located with one
+    vectorized bracketed secant iteration over all pumps.
+
+    Returns:
+        (refined designs, whether each lies on a constraint)
+    """
+    pump_index = np.arange(len(best))
+    last = grid.size - 1
+    gradient = rows['cost_gradient'][pump_index, best]
+    # Move toward decreasing cost
+    neighbor = np.clip(np.where(gradient > 0, best - 1, best + 1), 0, last)
+    refine = has_design & (neighbor != best)
+    on_constraint = refine & ~rows['feasible'][pump_index, neighbor]
+    refine &= on_constraint | (np.sign(rows['cost_gradient'][pump_index, neighbor]) !=
+                               np.sign(gradient))
+    if not refine.any():
+        return chosen, np.zeros(len(best), dtype=bool)
+
+    pumps = pump_index[refine]
+    boundary = on_constraint[refine]
+    lower = grid[np.minimum(best, neighbor)[refine]]
+    upper = grid[np.maximum(best, neighbor)[refine]]
+    evaluator.velocity = None
+
+    def objective(diameter):
+        values = evaluator.evaluate(diameter, pumps)
+        # Keep infeasible gradients signed toward the feasible side
+        return np.where(boundary, values['margin'], values['cost_gradient'])
+
+    solution = bracketed_secant(objective, lower, upper,
+                                xtol=tol, ftol=0.0, max_iter=60)
+    root = np.where(solution['converged'], solution['root'],
+                    np.where(best[refine] < neighbor[refine], lower, upper))
+    if boundary.any():
+        # Step onto the feasible side of the boundary
+        feasible_side = grid[best[refine]]
+        root = np.where(boundary, root + np.sign(feasible_side - root) * tol * root, root)
+
+    refined = evaluator.evaluate(root, pumps)
+    better = refined['feasible'] & (refined['total_cost'] <= chosen['total_cost'][pumps])
+    chosen = {name: values.copy() for name, values in chosen.items()}
+    for name, values in refined.items():
+        chosen[name][pumps[better]] = values[better]
+    on_constraint = np.zeros(len(best), dtype=bool)
+    on_constraint[pumps[better]] = boundary[better]
+    return chosen, on_constraint
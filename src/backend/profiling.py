@@ -0,0 +1,282 @@
+"""
+Analysis Profiling Module
+Per-stage wall time, curve evaluations and solver iterations
+
+Stages are named blocks of work (generate_curves, find_operating_point,
+...). They are recorded only while a Profile is collecting on the current
+thread; otherwise stage() returns a shared no-op context, timed functions
+call straight through and counted() returns the function unchanged, so
+the instrumentation can stay in place at the cost of one thread-local
+lookup per stage.
+
+Example:
+    with profiling.collect() as profile:
+        analyzer.analyze_complete_system()
+    print(profile.format_report())
+
+Nested stages are reported by path ('analyze_complete_system/generate_curves');
+their time is included in the enclosing stage. Stage times merged from
+other processes are summed, so with parallel workers the stage total is
+CPU time across workers; the wall time of the collect() blocks is
+reported separately.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+_local = threading.local()
+
+
+class StageStats:
+    """
+    Accumulated measurements of one stage.
+    """
+
+    __slots__ = ('calls', 'seconds', 'evaluations', 'iterations')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.evaluations = 0  # velocities at which ha and Ha were evaluated
+        self.iterations = 0  # solver iterations (summed over batch rows)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {'calls': self.calls, 'seconds': self.seconds,
+                'evaluations': self.evaluations, 'iterations': self.iterations}
+
+
+class Profile:
+    """
+    Stage measurements collected by one or more collect() blocks.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, StageStats] = {}
+        self.wall_seconds = 0.0  # elapsed time inside collect() blocks
+        self.merged = 0  # profiles merged in from elsewhere (e.g. workers)
+        self._stack: List[str] = []
+
+    def _stats(self, path: str) -> StageStats:
+        stats = self.stages.get(path)
+        if stats is None:
+            stats = self.stages[path] = StageStats()
+        return stats
+
+    def add(self, name: str, seconds: float = 0.0, evaluations: int = 0,
+            iterations: int = 0, calls: int = 1) -> None:
+        """
+        Record a measurement taken outside a stage (e.g. a deferred redraw).
+
+        Args:
+            name: Stage name, nested under the currently open stage
+            seconds: Wall time in seconds
+            evaluations: Curve points evaluated
+            iterations: Solver iterations
+            calls: Number of calls the measurement covers
+        """
+        path = f"{self._stack[-1]}/{name}" if self._stack else name
+        stats = self._stats(path)
+        stats.calls += calls
+        stats.seconds += seconds
+        stats.evaluations += evaluations
+        stats.iterations += iterations
+
+    def merge(self, other: 'Profile') -> 'Profile':
+        """
+        Add the measurements of another profile (e.g. from a worker process).
+
+        Its stage times are added; its wall time is not, since it ran
+        within this profile's own collect() blocks.
+
+        Returns:
+            self
+        """
+        for path, theirs in other.stages.items():
+            self.add(path, theirs.seconds, theirs.evaluations, theirs.iterations, theirs.calls)
+        self.merged += 1
+        return self
+
+    @property
+    def total_seconds(self) -> float:
+        """Time of the top-level stages (summed over merged profiles)"""
+        return sum(stats.seconds for path, stats in self.stages.items() if '/' not in path)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Structured measurements.
+
+        Returns:
+            Dictionary keyed by stage path (in order of first entry) of
+            dictionaries with calls, seconds, evaluations and iterations
+        """
+        return {path: stats.as_dict() for path, stats in self.stages.items()}
+
+    def format_report(self) -> str:
+        """
+        Format the measurements as a table.
+
+        Returns:
+            Human-readable report
+        """
+        lines = [f"{'Stage':<44} {'calls':>7} {'total ms':>10} {'evaluations':>12} "
+                 f"{'iterations':>10}"]
+        for path, stats in self.stages.items():
+            depth = path.count('/')
+            label = '  ' * depth + path.rsplit('/', 1)[-1]
+            lines.append(f"{label[:44]:<44} {stats.calls:7d} {stats.seconds * 1000:10.3f} "
+                         f"{stats.evaluations:12d} {stats.iterations:10d}")
+        label = 'TOTAL (stage time summed over workers)' if self.merged else 'TOTAL'
+        lines.append(f"{label:<44} {'':>7} {self.total_seconds * 1000:10.3f}")
+        if self.wall_seconds:
+            lines.append(f"{'WALL':<44} {'':>7} {self.wall_seconds * 1000:10.3f}")
+        return "\n".join(lines)
+
+    def format_summary(self, depth: int = 1) -> str:
+        """
+        One-line summary for status bars, e.g. 'analysis 0.74 ms (generate_curves 0.16)'.
+
+        Args:
+            depth: Nesting levels shown in parentheses after each top-level stage
+
+        Returns:
+            Summary text
+        """
+        parts = []
+        for path, stats in self.stages.items():
+            level = path.count('/')
+            text = f"{path.rsplit('/', 1)[-1]} {stats.seconds * 1000:.2f}"
+            if level == 0:
+                parts.append([text + " ms"])
+            elif level <= depth and parts:
+                parts[-1].append(text)
+        return " · ".join(part[0] + (f" ({', '.join(part[1:])})" if len(part) > 1 else "")
+                          for part in parts)
+
+
+class _Stage:
+    """Context manager timing one entry into a stage"""
+
+    __slots__ = ('profile', 'name', 'stats', 'started')
+
+    def __init__(self, profile: Profile, name: str):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self) -> StageStats:
+        stack = self.profile._stack
+        path = f"{stack[-1]}/{self.name}" if stack else self.name
+        stack.append(path)
+        self.stats = self.profile._stats(path)
+        self.started = time.perf_counter()
+        return self.stats
+
+    def __exit__(self, *exc_info) -> None:
+        self.stats.seconds += time.perf_counter() - self.started
+        self.stats.calls += 1
+        self.profile._stack.pop()
+
+
+class _NullStage:
+    """Shared no-op stage used while profiling is off"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+def active() -> Optional[Profile]:
+    """Profile collecting on the current thread, if any"""
+    return getattr(_local, 'profile', None)
+
+
+@contextmanager
+def collect(profile: Optional[Profile] = None) -> Iterator[Profile]:
+    """
+    Record stages on the current thread for the duration of the block.
+
+    Args:
+        profile: Profile to add to (default: a new one)
+
+    Yields:
+        The collecting profile
+    """
+    profile = Profile() if profile is None else profile
+    previous = getattr(_local, 'profile', None)
+    _local.profile = profile
+    started = time.perf_counter()
+    try:
+        yield profile
+    finally:
+        _local.profile = previous
+        # A nested block of the same profile is already inside the timed one
+        if previous is not profile:
+            profile.wall_seconds += time.perf_counter() - started
+
+
+def stage(name: str):
+    """
+    Context manager timing a named stage.
+
+    Returns:
+        Context yielding the stage's StageStats, or None when not profiling
+    """
+    profile = getattr(_local, 'profile', None)
+    if profile is None:
+        return _NULL_STAGE
+    return _Stage(profile, name)
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator running every call of a function as a stage.
+
+    Args:
+        name: Stage name
+    """
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = getattr(_local, 'profile', None)
+            if profile is None:
+                return func(*args, **kwargs)
+            with _Stage(profile, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def count(evaluations: int = 0, iterations: int = 0) -> None:
+    """Add curve evaluations and solver iterations to the open stage"""
+    profile = getattr(_local, 'profile', None)
+    if profile is None or not profile._stack:
+        return
+    stats = profile.stages[profile._stack[-1]]
+    stats.evaluations += evaluations
+    stats.iterations += iterations
+
+
+def counted(func: Callable) -> Callable:
+    """
+    Wrap a vectorized function so its evaluated elements are counted.
+
+    Returns:
+        func itself when not profiling
+    """
+    if getattr(_local, 'profile', None) is None:
+        return func
+
+    def wrapper(x):
+        result = func(x)
+        count(evaluations=getattr(result, 'size', 1))
+        return result
+    return wrapper
@@ -0,0 +1,631 @@
+"""
+Pump Bank Module
+Composite curves and operating points of pumps in series, parallel or mixed banks
+
+A bank is N pumps (each a calculate_pump_head characteristic with its own
+pump_max_head, pump_coefficient and pump_velocity_factor) arranged as a
+nested tree of series and parallel groups, e.g.
+('series', [0, ('parallel', [1, 2, 3])]). Curves live on a shared flow grid
+as arrays of shape (stagings, flow points). Series groups add heads;
+parallel groups add branch flows on a common head grid (single pumps are
+inverted in closed form, nested groups by row-wise inverse interpolation)
+and the total is inverted back onto the flow grid. Pumps that are off are
+bypassed in series groups and closed in parallel groups.
+
+Each group is tabulated once for the 2**m on/off stagings of its own m
+pumps, so solving all 2**N stagings of the bank reduces to indexing the
+root table and locating one crossing per row. The crossing is then
+polished on the exact pump laws by Newton steps over the whole tree: each
+running pump is replaced by its tangent at its current flow, the tangents
+add up the tree (heads in series, flows in parallel) and the root line meets
+the system curve tangent. All 4096 stagings of 12 pumps, nested three
+deep, solve in tens of milliseconds; a row whose Newton steps stall falls
+back to bracketed solves of every nested group on the exact laws.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .pump_system import PumpSystemAnalyzer
+from .batch_solver import MIN_VELOCITY, broadcast_analyzer
+from .root_finding import bracketed_secant
+
+Arrangement = Union[int, str, Tuple[str, Sequence]]
+
+
+def all_stagings(num_pumps: int) -> np.ndarray:
+    """
+    Enumerate every on/off combination of num_pumps pumps.
+
+    Args:
+        num_pumps: Number of pumps
+
+    Returns:
+        Boolean array of shape (2**num_pumps, num_pumps); row k has pump i
+        on when bit i of k is set
+    """
+    codes = np.arange(2 ** num_pumps)[:, None]
+    return (codes >> np.arange(num_pumps)) & 1 == 1
+
+
+def _locate(x: np.ndarray, y: np.ndarray, index: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Interpolate x where non-increasing rows y reach targets.
+
+    Args:
+        x: Shared abscissa of shape (G,), increasing
+        y: Rows of shape (C, G), non-increasing
+        index: Number of points of each row above each target, shape (C, T)
+        targets: Targets of shape (C, T)
+
+    Returns:
+        Array (C, T): x[0] when the target is at or above the row start,
+        linear extrapolation of the last segment below the row end
+    """
+    upper = np.clip(index, 1, x.size - 1)
+    lower = upper - 1
+    y0 = np.take_along_axis(y, lower, axis=1)
+    y1 = np.take_along_axis(y, upper, axis=1)
+    drop = y0 - y1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraction = np.where(drop > 0, (y0 - targets) / drop, 1.0)
+    return np.where(index == 0, x[0], x[lower] + fraction * (x[upper] - x[lower]))
+
+
+def _invert_rows(x: np.ndarray, y: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Row-wise inverse interpolation of non-increasing rows at shared targets.
+
+    Args:
+        x: Shared abscissa of shape (G,), increasing
+        y: Rows of shape (C, G)
+        targets: Targets of shape (T,)
+
+    Returns:
+        Array (C, T) of x where each row reaches each target
+    """
+    rows, points = y.shape
+    targets = np.broadcast_to(targets, (rows, np.size(targets)))
+    # Offsetting each row makes the flattened (negated) rows globally sorted
+    span = float(np.max(y) - np.min(y) + np.max(np.abs(targets))) + 1.0
+    offset = (np.arange(rows) * 2 * span)[:, None]
+    index = np.searchsorted((offset - y).ravel(), offset - targets) - \
+        np.arange(rows)[:, None] * points
+    return _locate(x, y, index, targets)
+
+
+def _invert_rows_uniform(x: np.ndarray, y: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """
+    Like _invert_rows for targets on a uniform grid, in O(rows x points).
+
+    The index of every target is counted with one bincount over the grid
+    cell of each sample instead of a binary search per target.
+    """
+    rows, points = y.shape
+    count = grid.size
+    step = grid[1] - grid[0]
+    # Number of targets strictly below each sample
+    below = np.clip(np.ceil((y - grid[0]) / step), 0, count).astype(np.intp)
+    flat = (below + (np.arange(rows) * (count + 1))[:, None]).ravel()
+    histogram = np.bincount(flat, minlength=rows * (count + 1)).reshape(rows, count + 1)
+    index = points - np.cumsum(histogram, axis=1)[:, :count]
+    return _locate(x, y, index, np.broadcast_to(grid, (rows, count)))
+
+
+def _interp_rows(grid: np.ndarray, table: np.ndarray, rows: np.ndarray,
+                 points: np.ndarray) -> np.ndarray:
+    """
+    Linear interpolation on a uniform grid at one point per selected table row.
+
+    Args:
+        grid: Uniform abscissa of shape (G,)
+        table: Rows of shape (R, G)
+        rows: Table row of each point, shape (C,)
+        points: Abscissa of each point, shape (C,)
+
+    Returns:
+        Array (C,) of interpolated (or end-extrapolated) values
+    """
+    step = grid[1] - grid[0]
+    position = (points - grid[0]) / step
+    lower = np.clip(np.floor(np.nan_to_num(position)), 0, grid.size - 2).astype(np.intp)
+    fraction = position - lower
+    start = table[rows, lower]
+    return start + fraction * (table[rows, lower + 1] - start)
+
+
+class PumpBank:
+    """
+    N pumps in a series/parallel arrangement, evaluated for every staging.
+    """
+
+    def __init__(self, pumps: Sequence[Dict[str, float]], arrangement: Arrangement = 'parallel',
+                 analyzer: Optional[PumpSystemAnalyzer] = None, num_points: int = 512):
+        """
+        Initialize a pump bank.
+
+        Args:
+            pumps: One dict per pump with any of pump_max_head,
+                pump_coefficient, pump_velocity_factor (missing values come
+                from the analyzer)
+            arrangement: 'parallel', 'series', or a nested tree of
+                ('series' | 'parallel', [members]) whose leaves are pump indices
+            analyzer: System (pipe and default pump) shared by the bank
+            num_points: Points of the shared flow grid and of head grids
+        """
+        self.analyzer = analyzer if analyzer is not None else PumpSystemAnalyzer()
+        if self.analyzer.pump_curve is not None:
+            raise ValueError("PumpBank models every pump with the quadratic pump law; "
+                             "analyzer.pump_curve is not supported")
+        self.num_pumps = len(pumps)
+        if isinstance(arrangement, str):
+            arrangement = (arrangement, list(range(self.num_pumps)))
+        self.arrangement = arrangement
+        if sorted(self._leaves(arrangement)) != list(range(self.num_pumps)):
+            raise ValueError("Arrangement must use every pump index exactly once")
+
+        parameters = {
+            name: np.array([pump.get(name, getattr(self.analyzer, name)) for pump in pumps],
+                           dtype=float)
+            for name in ('pump_max_head', 'pump_coefficient', 'pump_velocity_factor')
+        }
+        self.pump_analyzer = broadcast_analyzer(self.analyzer, **parameters)
+        # Q(H) = flow_scale * sqrt(max_head - H) inverts each pump in closed form
+        self.flow_scale = self.analyzer.area / (self.pump_analyzer.pump_velocity_factor *
+                                                np.sqrt(self.pump_analyzer.pump_coefficient))
+
+        # Shared grid from zero flow to the free delivery of all pumps in parallel,
+        # which bounds the zero-head flow of any arrangement and staging
+        free_delivery = self.pump_analyzer.calculate_shutoff_velocity() * self.analyzer.area
+        self.flow_grid = np.linspace(0.0, float(np.sum(free_delivery)), num_points)
+        self._tables: Dict[tuple, Dict[str, np.ndarray]] = {}
+
+    def _leaves(self, node: Arrangement) -> List[int]:
+        if isinstance(node, (int, np.integer)):
+            return [int(node)]
+        kind, members = node
+        if kind not in ('series', 'parallel'):
+            raise ValueError(f"Unknown group kind: {kind!r}")
+        return [leaf for member in members for leaf in self._leaves(member)]
+
+    def _codes(self, node: Arrangement, on: np.ndarray) -> np.ndarray:
+        """Row of the node table for each staging (bit j = j-th pump of the node on)"""
+        leaves = self._leaves(node)
+        return on[:, leaves].astype(np.intp) @ (1 << np.arange(len(leaves)))
+
+    def _pump_flow(self, pump: int, head: np.ndarray) -> np.ndarray:
+        """Flow of one pump at the given heads (zero above its shutoff head)"""
+        margin = np.maximum(self.pump_analyzer.pump_max_head[pump] - head, 0.0)
+        return self.flow_scale[pump] * np.sqrt(margin)
+
+    def _pump_head(self, pump: int, flow: np.ndarray) -> np.ndarray:
+        """Head of one pump at the given flows"""
+        pumps = self.pump_analyzer
+        return pumps.pump_max_head[pump] - pumps.pump_coefficient[pump] * \
+            (pumps.pump_velocity_factor[pump] * flow / self.analyzer.area) ** 2
+
+    def _table(self, node: Arrangement) -> Dict[str, np.ndarray]:
+        """
+        Tabulate a node over the 2**m on/off stagings of its own m pumps.
+
+        Every table has 'active' (2**m,). Pumps and series groups have
+        'curves' (2**m, G) of head on the flow grid; parallel groups have
+        'levels' (L,) and 'total' (2**m, L) of flow on a head grid, and get
+        'curves' only when _curves asks for them. Tables are computed once
+        per node.
+        """
+        leaf = isinstance(node, (int, np.integer))
+        key = self._key(node)
+        if key in self._tables:
+            return self._tables[key]
+
+        if leaf:
+            curves = np.zeros((2, self.flow_grid.size))
+            curves[1] = self._pump_head(int(node), self.flow_grid)
+            table = {'active': np.array([False, True]), 'curves': curves}
+            self._tables[key] = table
+            return table
+
+        kind, members = node
+        leaves = self._leaves(node)
+        local = all_stagings(len(leaves))
+        children = []
+        for member in members:
+            # Row of the member table for each of this node's stagings
+            bits = local[:, [leaves.index(leaf) for leaf in self._leaves(member)]]
+            codes = bits.astype(np.intp) @ (1 << np.arange(bits.shape[1]))
+            children.append((member, codes))
+        active = np.any([self._table(member)['active'][codes] for member, codes in children],
+                        axis=0)
+
+        if kind == 'series':
+            table = {'active': active,
+                     'curves': sum(self._curves(member)[codes] for member, codes in children)}
+        else:
+            # Head levels packed quadratically toward the top, where Q(H) ~ sqrt
+            tops = [self._top(member) for member, _ in children]
+            high = max(top for top, _ in tops)
+            low = min(bottom for _, bottom in tops)
+            levels = high - (high - low) * np.linspace(1.0, 0.0, self.flow_grid.size) ** 2
+
+            # Single pumps: closed-form flows combined with one matrix product
+            pumps = [int(member) for member, _ in children
+                     if isinstance(member, (int, np.integer))]
+            total = local[:, [leaves.index(pump) for pump in pumps]].astype(float) @ \
+                np.array([self._pump_flow(pump, levels) for pump in pumps]).reshape(-1, levels.size)
+            for member, codes in children:
+                if not isinstance(member, (int, np.integer)):
+                    member_table = self._table(member)
+                    flows = np.where(member_table['active'][:, None],
+                                     _invert_rows(self.flow_grid, self._curves(member), levels),
+                                     0.0)
+                    total = total + flows[codes]
+            table = {'active': active, 'levels': levels, 'total': total}
+        self._tables[key] = table
+        return table
+
+    def _top(self, node: Arrangement) -> Tuple[float, float]:
+        """Highest shutoff head and lowest head on the flow grid of a node"""
+        table = self._table(node)
+        if 'curves' not in table:
+            return float(table['levels'][-1]), float(table['levels'][0])
+        return float(table['curves'][:, 0].max()), float(table['curves'][:, -1].min())
+
+    def _curves(self, node: Arrangement) -> np.ndarray:
+        """Head on the flow grid (2**m, G) of a node over its own stagings"""
+        table = self._table(node)
+        if 'curves' not in table:
+            # Total flow falls as the head level rises: invert back to the flow grid
+            heads = _invert_rows_uniform(table['levels'], table['total'], self.flow_grid)
+            table['curves'] = np.where(table['active'][:, None], heads, 0.0)
+        return table['curves']
+
+    def _stagings(self, stagings: Optional[np.ndarray]) -> np.ndarray:
+        if stagings is None:
+            return all_stagings(self.num_pumps)
+        return np.atleast_2d(np.asarray(stagings, dtype=bool))
+
+    def composite_curves(self, stagings: Optional[np.ndarray] = None
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the composite bank curve of each staging.
+
+        Args:
+            stagings: Boolean (C, N) on/off array (default: all 2**N)
+
+        Returns:
+            (flow_grid in m³/s of shape (G,), heads in m of shape (C, G),
+            active flags of shape (C,))
+        """
+        on = self._stagings(stagings)
+        codes = self._codes(self.arrangement, on)
+        curves = self._curves(self.arrangement)
+        return self.flow_grid, curves[codes], self._table(self.arrangement)['active'][codes]
+
+    def solve_stagings(self, stagings: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Solve the operating point against the analyzer system curve for each staging.
+
+        Args:
+            stagings: Boolean (C, N) on/off array (default: all 2**N)
+
+        Returns:
+            Dictionary of arrays: stagings, success, flow_rate_m3s,
+            flow_rate_ls, velocity, head, and per-pump pump_flow (C, N)
+            and pump_head (C, N) at the operating point (NaN where the
+            staging cannot overcome the static head or the pump is off)
+        """
+        on = self._stagings(stagings)
+        root = self.arrangement
+        codes = self._codes(root, on)
+        table = self._table(root)
+        flow_grid = self.flow_grid
+        area = self.analyzer.area
+        system = self.analyzer.calculate_system_head(
+            np.maximum(flow_grid / area, MIN_VELOCITY))
+
+        # Locate the crossing on the tables and interpolate it within its cell
+        if 'levels' not in table:
+            # Bank head minus system head falls with flow
+            grid = flow_grid
+            difference = table['curves'][codes] - system
+        else:
+            # Parallel root: bank flow minus system flow falls with head
+            grid = table['levels']
+            difference = table['total'][codes] - np.interp(grid, system, flow_grid)
+        index = np.clip(np.count_nonzero(difference > 0, axis=1), 1, grid.size - 1)
+        success = table['active'][codes] & (difference[:, 0] > 0)
+        cell = np.stack([index - 1, index], axis=1)
+        before, after = np.take_along_axis(difference, cell, axis=1).T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.clip(np.where(before > after, before / (before - after), 0.0), 0.0, 1.0)
+        # Root flow, or root head for a parallel root, and the bank flow
+        start = grid[index - 1] + fraction * (grid[index] - grid[index - 1])
+        if 'levels' in table:
+            lower, upper = np.take_along_axis(table['total'][codes], cell, axis=1).T
+            guess = lower + fraction * (upper - lower)
+        else:
+            guess = start
+
+        # Polish on the exact pump laws; rows where Newton stalls fall back to
+        # nested bracketed solves
+        rows = np.flatnonzero(success)
+        flow = np.zeros(success.shape)
+        pump_flow = np.zeros(on.shape)
+        flow[rows], pump_flow[rows], converged = self._polish(on[rows], start[rows], guess[rows])
+        slow = rows[~converged]
+        if slow.size:
+            flow[slow], bracketed = self._solve_nested(on[slow], index[slow])
+            success[slow] &= bracketed
+            shares = np.zeros((slow.size, self.num_pumps))
+            head = None
+            if 'levels' in table:
+                head = self.analyzer.calculate_system_head(
+                    np.maximum(flow[slow] / area, MIN_VELOCITY))
+            self._distribute(root, on[slow], flow[slow], shares, head)
+            pump_flow[slow] = shares
+        pump_head = self._pump_heads(pump_flow)
+        flow = np.where(success, flow, np.nan)
+        unused = ~(success[:, None] & on)
+        pump_flow[unused] = np.nan
+        pump_head[unused] = np.nan
+        return {
+            'stagings': on,
+            'success': success,
+            'flow_rate_m3s': flow,
+            'flow_rate_ls': flow * 1000,
+            'velocity': flow / area,
+            'head': self.analyzer.calculate_system_head(np.maximum(flow / area, MIN_VELOCITY)),
+            'pump_flow': pump_flow,
+            'pump_head': pump_head
+        }
+
+    def _pump_heads(self, flows: np.ndarray) -> np.ndarray:
+        """Head of every pump (columns) at the given flows"""
+        pumps = self.pump_analyzer
+        return pumps.pump_max_head - pumps.pump_coefficient * \
+            (pumps.pump_velocity_factor * flows / self.analyzer.area) ** 2
+
+    @staticmethod
+    def _key(node: Arrangement) -> tuple:
+        if isinstance(node, (int, np.integer)):
+            return ('pump', int(node))
+        return ('group', id(node))
+
+    @staticmethod
+    def _inner(node: Arrangement) -> str:
+        """What a node fixes for its members: 'flow' (pumps, series) or 'head' (parallel)"""
+        if isinstance(node, (int, np.integer)) or node[0] == 'series':
+            return 'flow'
+        return 'head'
+
+    def _polish(self, on: np.ndarray, value: np.ndarray, flow: np.ndarray,
+                max_iter: int = 50, tol: float = 1e-12
+                ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Newton iteration on the exact pump laws from the table crossing.
+
+        Each step replaces every running pump by its tangent at its current
+        flow, adds the tangents up the tree, intersects the root line with
+        the tangent of the system curve and pushes the new root flow (or
+        head, for a parallel root) back down to the pumps with _advance.
+
+        Args:
+            on: Stagings (C, N)
+            value: Initial root flow, or root head for a parallel root
+            flow: Initial bank flow
+
+        Returns:
+            (flow, pump_flow, converged): bank flow, pump flows (C, N) and
+            the rows whose last step moved no flow by more than tol of the
+            flow grid
+        """
+        root = self.arrangement
+        given = self._inner(root)
+        area = self.analyzer.area
+        flows = np.empty(on.shape)
+        self._advance(root, on, value, given, flows)
+        converged = np.zeros(len(on), dtype=bool)
+        for _ in range(max_iter):
+            rows = np.flatnonzero(~converged)
+            if not rows.size:
+                break
+            lines: Dict[tuple, Tuple[np.ndarray, np.ndarray]] = {}
+            first, second = self._linearize(root, on[rows], flows[rows], given, lines)
+            current = flow[rows]
+            velocity = np.maximum(current / area, MIN_VELOCITY)
+            head = self.analyzer.calculate_system_head(velocity)
+            slope = self.analyzer.calculate_system_head_derivative(velocity) / area
+            if given == 'flow':
+                # first + second·q = head + slope·(q - current)
+                update = (head - slope * current - first) / (second - slope)
+                value = update
+            else:
+                # q = first + second·(head + slope·(q - current))
+                update = (first + second * (head - slope * current)) / (1 - second * slope)
+                value = head + slope * (update - current)
+            shares = np.empty((rows.size, self.num_pumps))
+            self._advance(root, on[rows], value, given, shares, lines)
+            step = np.maximum(np.abs(update - current),
+                              np.max(np.abs(shares - flows[rows]), axis=1, initial=0.0))
+            flow[rows] = update
+            flows[rows] = shares
+            converged[rows] = step <= tol * self.flow_grid[-1]
+        converged &= np.isfinite(flow) & np.all(np.isfinite(flows), axis=1)
+        return flow, flows, converged
+
+    def _linearize(self, node: Arrangement, on: np.ndarray, flows: np.ndarray, given: str,
+                   lines: Dict[tuple, Tuple[np.ndarray, np.ndarray]]
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tangent law of a node at the current pump flows.
+
+        Pumps and series groups give (a, b) of head = a + b·flow, parallel
+        groups add (c, d) of flow = c + d·head over their branches; lines
+        keeps these for _advance.
+
+        Returns:
+            (a, b) when the parent fixes the flow, (c, d) when it fixes the
+            head; (0, 0) for a node that passes nothing that way (a closed
+            branch in a parallel group, a bypassed one in a series group)
+        """
+        inner = self._inner(node)
+        if isinstance(node, (int, np.integer)):
+            pump = int(node)
+            pumps = self.pump_analyzer
+            flow = flows[:, pump]
+            curvature = pumps.pump_coefficient[pump] * \
+                (pumps.pump_velocity_factor[pump] / self.analyzer.area) ** 2
+            first = np.where(on[:, pump], pumps.pump_max_head[pump] + curvature * flow ** 2, 0.0)
+            second = np.where(on[:, pump], -2 * curvature * flow, 0.0)
+        else:
+            parts = [self._linearize(member, on, flows, inner, lines) for member in node[1]]
+            first = sum(part[0] for part in parts)
+            second = sum(part[1] for part in parts)
+        lines[self._key(node)] = (first, second)
+        if given == inner:
+            return first, second
+        # y = first + second·x solved for x (the same formula in both directions)
+        usable = second < 0
+        second = np.where(usable, second, -1.0)
+        return np.where(usable, -first / second, 0.0), np.where(usable, 1.0 / second, 0.0)
+
+    def _advance(self, node: Arrangement, on: np.ndarray, value: np.ndarray, given: str,
+                 flows: np.ndarray,
+                 lines: Optional[Dict[tuple, Tuple[np.ndarray, np.ndarray]]] = None) -> None:
+        """
+        Push the flow or head fixed on a node down to the pump flows.
+
+        A node under a parallel group turns its head into a flow through its
+        tangent from _linearize. The tangents of the concave pump laws lie
+        above them, so a flow at or below zero closes the branch; a closed
+        branch reopens from its table once the head drops below its shutoff
+        head. The initial guess (lines None) comes from the tables alone.
+        """
+        inner = self._inner(node)
+        if given != inner:
+            imposed = value
+            if lines is None:
+                value = self._estimate(node, on, imposed)
+            else:
+                first, second = lines[self._key(node)]
+                usable = second < 0
+                value = (imposed - first) / np.where(usable, second, -1.0)
+                if inner == 'flow':
+                    value = np.where(usable, np.maximum(value, 0.0), 0.0)
+                    reopen = ~usable & (imposed < self._shutoff(node, on))
+                else:
+                    reopen = ~usable
+                if reopen.any():
+                    seed = self._estimate(node, on[reopen], imposed[reopen])
+                    # Start a reopening branch above its flow, where the tangents converge
+                    value[reopen] = np.maximum(seed, self.flow_grid[1]) if inner == 'flow' else seed
+        if isinstance(node, (int, np.integer)):
+            flows[:, int(node)] = value
+            return
+        for member in node[1]:
+            self._advance(member, on, value, inner, flows, lines)
+
+    def _shutoff(self, node: Arrangement, on: np.ndarray) -> np.ndarray:
+        """Head of a node at zero flow for each staging (-inf with no pump on)"""
+        if isinstance(node, (int, np.integer)):
+            return np.where(on[:, int(node)], self.pump_analyzer.pump_max_head[int(node)], -np.inf)
+        heads = np.array([self._shutoff(member, on) for member in node[1]])
+        if node[0] == 'parallel':
+            return np.max(heads, axis=0)
+        running = np.isfinite(heads)
+        return np.where(running.any(axis=0), np.sum(np.where(running, heads, 0.0), axis=0),
+                        -np.inf)
+
+    def _estimate(self, node: Arrangement, on: np.ndarray, value: np.ndarray) -> np.ndarray:
+        """Flow of a pump or series group at a head, head of a parallel group at a flow"""
+        if isinstance(node, (int, np.integer)):
+            return np.where(on[:, int(node)], self._pump_flow(int(node), value), 0.0)
+        codes = self._codes(node, on)
+        if self._inner(node) == 'flow':
+            rows = self._curves(node)[codes]
+            index = np.count_nonzero(rows > value[:, None], axis=1)[:, None]
+            return _locate(self.flow_grid, rows, index, value[:, None])[:, 0]
+        return _interp_rows(self.flow_grid, self._curves(node), codes, value)
+
+    def _solve_nested(self, on: np.ndarray, index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Operating flow by bracketed secants on nested exact solves.
+
+        Slow (every nested group is itself solved at each step), so only
+        used for the rows where _polish does not converge.
+
+        Args:
+            on: Stagings (C, N)
+            index: Upper point of the table cell holding each crossing
+
+        Returns:
+            (flow, bracketed)
+        """
+        root = self.arrangement
+        table = self._table(root)
+        area = self.analyzer.area
+        if 'levels' not in table:
+            solution = bracketed_secant(
+                lambda q: self._head_at(root, on, q) -
+                self.analyzer.calculate_system_head(np.maximum(q / area, MIN_VELOCITY)),
+                self.flow_grid[index - 1], self.flow_grid[index])
+        else:
+            levels = table['levels']
+            solution = bracketed_secant(
+                lambda q: self._flow_at(root, on, self.analyzer.calculate_system_head(
+                    np.maximum(q / area, MIN_VELOCITY))) - q,
+                self._flow_at(root, on, levels[index]),
+                self._flow_at(root, on, levels[index - 1]))
+        return solution['root'], solution['bracketed']
+
+    def _head_at(self, node: Arrangement, on: np.ndarray, flow: np.ndarray) -> np.ndarray:
+        """Head of a node for each staging at one flow per staging"""
+        if isinstance(node, (int, np.integer)):
+            return np.where(on[:, node], self._pump_head(int(node), flow), 0.0)
+        kind, members = node
+        if kind == 'series':
+            return sum(self._head_at(member, on, flow) for member in members)
+        # Parallel: the common head at which the branch flows add up to the flow,
+        # solved on the exact branch laws (the table only gives the fallback)
+        codes = self._codes(node, on)
+        table = self._table(node)
+        levels = table['levels']
+        solution = bracketed_secant(lambda head: self._flow_at(node, on, head) - flow,
+                                    np.full(flow.shape, levels[0]),
+                                    np.full(flow.shape, levels[-1]), ftol=0.0)
+        head = np.where(solution['bracketed'], solution['root'], self._estimate(node, on, flow))
+        return np.where(table['active'][codes], head, 0.0)
+
+    def _flow_at(self, node: Arrangement, on: np.ndarray, head: np.ndarray) -> np.ndarray:
+        """Flow of a node for each staging at one head per staging"""
+        if isinstance(node, (int, np.integer)):
+            return np.where(on[:, node], self._pump_flow(int(node), head), 0.0)
+        kind, members = node
+        if kind == 'parallel':
+            return sum(self._flow_at(member, on, head) for member in members)
+        # Series: the flow at which the member heads add up to the head, solved
+        # on the exact member laws (the table only gives the fallback)
+        solution = bracketed_secant(lambda flow: self._head_at(node, on, flow) - head,
+                                    np.zeros(head.shape), np.full(head.shape, self.flow_grid[-1]))
+        flow = np.where(solution['bracketed'], solution['root'], self._estimate(node, on, head))
+        return np.where(self._table(node)['active'][self._codes(node, on)], flow, 0.0)
+
+    def _distribute(self, node: Arrangement, on: np.ndarray, flow: np.ndarray,
+                    pump_flow: np.ndarray, head: Optional[np.ndarray] = None) -> None:
+        """Push each staging's group flow (and head, if known) down to the pump flows"""
+        if isinstance(node, (int, np.integer)):
+            pump_flow[:, node] = flow
+            return
+
+        kind, members = node
+        if kind == 'series':
+            for member in members:
+                self._distribute(member, on, flow, pump_flow)
+            return
+
+        # Parallel: the common head at the group flow, then each branch's flow
+        if head is None:
+            head = self._head_at(node, on, flow)
+        for member in members:
+            self._distribute(member, on, self._flow_at(member, on, head), pump_flow)
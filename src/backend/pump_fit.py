@@ -0,0 +1,310 @@
+"""
+Pump Curve Fitting Module
+Least-squares pump characteristics from streamed test-bench logs
+
+A measured log of (flow, head) pairs is fitted by a polynomial
+H(Q) = sum c_j Q**p_j over a set of powers p_j. The default powers (0, 2)
+give the analyzer's own characteristic Ha = pump_max_head - c·Q²; any
+other set (e.g. a full cubic) gives a higher-order curve. Chunks of the
+log are folded into the normal equations (the Gram matrix X'X, X'y and
+y'y) as they arrive, so a log of any length is fitted in constant memory
+and separately accumulated parts can be merged. Flows are divided by a
+fixed scale before forming powers to keep the Gram matrix well conditioned.
+
+A fit is plugged into PumpSystemAnalyzer with to_analyzer: quadratic fits
+set pump_max_head and pump_coefficient, other fits become the analyzer's
+pump_curve.
+"""
+
+import copy
+import numpy as np
+from typing import Iterable, Optional, Sequence, Tuple
+
+from .pump_system import PumpSystemAnalyzer, ArrayLike
+
+# Powers of the analyzer's own characteristic Ha = a - b·Q²
+QUADRATIC_POWERS = (0, 2)
+
+
+class PumpCurveFit:
+    """
+    Fitted pump characteristic H(Q) with its goodness-of-fit statistics.
+
+    Implements the pump_curve interface of PumpSystemAnalyzer (head,
+    derivative and shutoff_flow, all in terms of flow in m³/s).
+    """
+
+    def __init__(self, powers: Sequence[int], coefficients: np.ndarray, flow_scale: float,
+                 samples: int, rms: float, r_squared: float, flow_range: Tuple[float, float]):
+        """
+        Args:
+            powers: Powers of flow in the polynomial
+            coefficients: Coefficients of (Q / flow_scale)**power
+            flow_scale: Flow scale in m³/s
+            samples: Number of rows fitted
+            rms: Root-mean-square head residual in meters
+            r_squared: Coefficient of determination
+            flow_range: (min, max) measured flow in m³/s
+        """
+        self.powers = tuple(int(power) for power in powers)
+        self.scaled_coefficients = np.asarray(coefficients, dtype=float)
+        self.flow_scale = float(flow_scale)
+        self.samples = samples
+        self.rms = rms
+        self.r_squared = r_squared
+        self.flow_range = flow_range
+
+    def __repr__(self) -> str:
+        terms = ' + '.join(f"{value:.6g}·Q^{power}"
+                           for power, value in zip(self.powers, self.coefficients))
+        return f"PumpCurveFit(H = {terms}, rms={self.rms:.3g} m, n={self.samples})"
+
+    def cache_key(self) -> bytes:
+        """Exact bytes of the fitted curve (the repr rounds coefficients)"""
+        return np.array(self.powers, dtype=np.int64).tobytes() + \
+            np.ascontiguousarray(self.scaled_coefficients).tobytes() + \
+            self.flow_scale.hex().encode()
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        """Coefficients of Q**power with Q in m³/s"""
+        return self.scaled_coefficients / self.flow_scale ** np.array(self.powers, dtype=float)
+
+    @property
+    def is_quadratic(self) -> bool:
+        """True when the fit has the analyzer's own a - b·Q² form"""
+        return self.powers == QUADRATIC_POWERS
+
+    def head(self, flow: ArrayLike) -> ArrayLike:
+        """
+        Evaluate the fitted head.
+
+        Args:
+            flow: Flow rate in m³/s (scalar or array of any shape)
+
+        Returns:
+            Head in meters, same shape as flow
+        """
+        x = np.asarray(flow, dtype=float) / self.flow_scale
+        return sum(value * x ** power for power, value in zip(self.powers, self.scaled_coefficients))
+
+    def derivative(self, flow: ArrayLike) -> ArrayLike:
+        """
+        Evaluate the analytic derivative dH/dQ.
+
+        Args:
+            flow: Flow rate in m³/s (scalar or array of any shape)
+
+        Returns:
+            dH/dQ in s/m², same shape as flow
+        """
+        x = np.asarray(flow, dtype=float) / self.flow_scale
+        return sum(power * value * x ** (power - 1)
+                   for power, value in zip(self.powers, self.scaled_coefficients)
+                   if power > 0) / self.flow_scale + np.zeros_like(x)
+
+    def shutoff_flow(self) -> float:
+        """
+        Smallest positive flow at which the fitted head drops to zero.
+
+        Returns:
+            Flow in m³/s; the largest measured flow when the fitted curve
+            stays positive (no extrapolated crossing)
+        """
+        polynomial = np.zeros(max(self.powers) + 1)
+        polynomial[list(self.powers)] = self.scaled_coefficients
+        roots = np.roots(polynomial[::-1])
+        real = roots.real[(np.abs(roots.imag) <= 1e-9 * np.abs(roots)) & (roots.real > 0)]
+        if real.size == 0:
+            return self.flow_range[1]
+        return float(real.min()) * self.flow_scale
+
+    def to_analyzer(self, base: Optional[PumpSystemAnalyzer] = None) -> PumpSystemAnalyzer:
+        """
+        Build an analyzer that uses the fitted pump.
+
+        A quadratic fit sets pump_max_head and pump_coefficient for the
+        base analyzer's pipe area (keeping its pump_velocity_factor), so
+        every module built on those parameters uses it. Other fits are
+        installed as the analyzer's pump_curve.
+
+        Args:
+            base: Analyzer providing the system (copied; default: a new one)
+
+        Returns:
+            Analyzer with the fitted pump characteristic
+        """
+        analyzer = copy.copy(base) if base is not None else PumpSystemAnalyzer()
+        if self.is_quadratic:
+            max_head, flow_coefficient = self.coefficients
+            # c·(k·v)² = -b·(A·v)²  =>  c = -b·A²/k²
+            analyzer.pump_coefficient = -flow_coefficient * analyzer.area ** 2 / \
+                analyzer.pump_velocity_factor ** 2
+            analyzer.pump_max_head = max_head
+            analyzer.pump_curve = None
+        else:
+            analyzer.pump_max_head = float(self.head(0.0))
+            analyzer.pump_curve = self
+        return analyzer
+
+
+class PumpCurveFitter:
+    """
+    Streaming least-squares accumulator for pump curves.
+
+    Example:
+        fitter = PumpCurveFitter()
+        for flow, head in chunks:
+            fitter.update(flow, head)
+        analyzer = fitter.fit().to_analyzer()
+    """
+
+    def __init__(self, degree: Optional[int] = None,
+                 powers: Optional[Sequence[int]] = None,
+                 flow_scale: Optional[float] = None):
+        """
+        Initialize an empty fit.
+
+        Args:
+            degree: Fit a full polynomial of this degree (all powers up to it)
+            powers: Explicit powers of flow (default: QUADRATIC_POWERS, the
+                analyzer's own form; ignored when degree is given)
+            flow_scale: Flow scale in m³/s (default: the largest flow of
+                the first chunk)
+        """
+        if degree is not None:
+            powers = range(degree + 1)
+        self.powers = tuple(sorted(set(QUADRATIC_POWERS if powers is None else powers)))
+        if min(self.powers) < 0:
+            raise ValueError("Pump curve powers must be non-negative")
+        self.flow_scale = flow_scale
+        size = len(self.powers)
+        self.gram = np.zeros((size, size))
+        self.moment = np.zeros(size)
+        self.head_sum = 0.0
+        self.head_square_sum = 0.0
+        self.samples = 0
+        self.flow_min = np.inf
+        self.flow_max = -np.inf
+
+    def update(self, flow: ArrayLike, head: ArrayLike) -> int:
+        """
+        Add a chunk of measurements to the normal equations.
+
+        Rows with a non-finite flow or head are skipped.
+
+        Args:
+            flow: Measured flow rates in m³/s
+            head: Measured heads in meters
+
+        Returns:
+            Number of rows added
+        """
+        flow = np.asarray(flow, dtype=float).ravel()
+        head = np.asarray(head, dtype=float).ravel()
+        valid = np.isfinite(flow) & np.isfinite(head)
+        if not valid.all():
+            flow, head = flow[valid], head[valid]
+        if flow.size == 0:
+            return 0
+
+        if self.flow_scale is None:
+            self.flow_scale = float(np.max(np.abs(flow))) or 1.0
+        design = (flow / self.flow_scale)[:, None] ** np.array(self.powers, dtype=float)
+        self.gram += design.T @ design
+        self.moment += design.T @ head
+        self.head_sum += float(head.sum())
+        self.head_square_sum += float(head @ head)
+        self.samples += flow.size
+        self.flow_min = min(self.flow_min, float(flow.min()))
+        self.flow_max = max(self.flow_max, float(flow.max()))
+        return flow.size
+
+    def merge(self, other: 'PumpCurveFitter') -> 'PumpCurveFitter':
+        """
+        Add the accumulated sums of another fitter (e.g. from another process).
+
+        Both fitters must use the same powers and flow scale.
+
+        Returns:
+            self
+        """
+        if other.samples == 0:
+            return self
+        if other.powers != self.powers or (self.samples and other.flow_scale != self.flow_scale):
+            raise ValueError("Only fitters with the same powers and flow scale can be merged")
+        self.flow_scale = other.flow_scale
+        self.gram += other.gram
+        self.moment += other.moment
+        self.head_sum += other.head_sum
+        self.head_square_sum += other.head_square_sum
+        self.samples += other.samples
+        self.flow_min = min(self.flow_min, other.flow_min)
+        self.flow_max = max(self.flow_max, other.flow_max)
+        return self
+
+    def fit(self) -> PumpCurveFit:
+        """
+        Solve the accumulated normal equations.
+
+        Returns:
+            PumpCurveFit of the data seen so far
+
+        Raises:
+            ValueError: If there are fewer rows than coefficients
+        """
+        size = len(self.powers)
+        if self.samples < size:
+            raise ValueError(f"At least {size} measurements are needed, got {self.samples}")
+        # Jacobi scaling keeps the solve accurate when the powers differ in size
+        norm = np.sqrt(np.diag(self.gram))
+        norm[norm == 0] = 1.0
+        scaled = np.linalg.lstsq(self.gram / np.outer(norm, norm), self.moment / norm,
+                                 rcond=None)[0]
+        coefficients = scaled / norm
+
+        residual = self.head_square_sum - 2 * coefficients @ self.moment + \
+            coefficients @ self.gram @ coefficients
+        total = self.head_square_sum - self.head_sum ** 2 / self.samples
+        residual = max(residual, 0.0)
+        return PumpCurveFit(
+            self.powers, coefficients, self.flow_scale, self.samples,
+            rms=float(np.sqrt(residual / self.samples)),
+            r_squared=float(1 - residual / total) if total > 0 else 1.0,
+            flow_range=(self.flow_min, self.flow_max)
+        )
+
+
+def fit_pump_curve(source, flow_column: str = 'flow', head_column: str = 'head',
+                   degree: Optional[int] = None, powers: Optional[Sequence[int]] = None,
+                   flow_unit: float = 1.0, chunk_size: int = 1_000_000) -> PumpCurveFit:
+    """
+    Fit a pump curve to a measured log without loading it whole.
+
+    Args:
+        source: CSV file path, or an iterable of (flow, head) array chunks
+        flow_column: Flow column of a CSV file
+        head_column: Head column of a CSV file
+        degree: Fit a full polynomial of this degree
+        powers: Explicit powers of flow (default: the analyzer's a - b·Q²)
+        flow_unit: Factor converting logged flows to m³/s (e.g. 1e-3 for L/s)
+        chunk_size: Rows read per CSV chunk
+
+    Returns:
+        PumpCurveFit of the whole log
+    """
+    if isinstance(source, str):
+        source = _csv_chunks(source, flow_column, head_column, chunk_size)
+    fitter = PumpCurveFitter(degree=degree, powers=powers)
+    for flow, head in source:
+        fitter.update(np.asarray(flow, dtype=float) * flow_unit, head)
+    return fitter.fit()
+
+
+def _csv_chunks(path: str, flow_column: str, head_column: str,
+                chunk_size: int) -> Iterable[Tuple[np.ndarray, np.ndarray]]:
+    """Read the flow and head columns of a CSV log in chunks"""
+    import pandas as pd
+
+    for chunk in pd.read_csv(path, usecols=[flow_column, head_column], chunksize=chunk_size):
+        yield chunk[flow_column].to_numpy(dtype=float), chunk[head_column].to_numpy(dtype=float)
@@ -4,9 +4,14 @@ Calculates system curves, pump curves, and operating points
 """
 
 import numpy as np
-from math import log10
-from scipy.optimize import fsolve
-from typing import Dict, Tuple, List
+from typing import Callable, Dict, Tuple, List, Optional, Union
+
+from . import profiling
+from .root_finding import bracketed_newton
+from .friction import FrictionModel, get_friction_model
+from .results import OperatingPoint
+
+ArrayLike = Union[float, np.ndarray]
 
 
 class PumpSystemAnalyzer:
@@ -15,18 +20,22 @@ class PumpSystemAnalyzer:
     Calculates friction factors, system curves, pump curves, and operating points.
     """
     
-    def __init__(self, diameter: float = 0.0203):
+    def __init__(self, diameter: float = 0.0203,
+                 friction_model: Union[str, FrictionModel] = 'swamee_jain'):
         """
         Initialize pump system analyzer.
         
         Args:
             diameter: Pipe diameter in meters (default: 0.0203 m)
+            friction_model: Friction correlation name or instance (see
+                friction.FRICTION_MODELS; default: 'swamee_jain', the
+                original formula)
         """
         self.diameter = diameter
         self.area = np.pi * (diameter / 2) ** 2
         
         # System parameters (from original code)
-        self.roughness_factor = 81.2  # 3.7 * D/ε
+        self.roughness_factor = 81.2  # D/ε (relative roughness ε/D = 1/81.2)
         self.reynolds_coefficient = 22706.9
         self.static_head = 7.85  # m
         self.loss_coefficient_1 = 8694.6
@@ -37,98 +46,221 @@ class PumpSystemAnalyzer:
         self.pump_max_head = 24.4  # m
         self.pump_coefficient = 0.0678
         self.pump_velocity_factor = 19.42
+        # Optional measured characteristic replacing the formula above: an
+        # object with head(flow), derivative(flow) and shutoff_flow(), flow
+        # in m³/s (see pump_fit.PumpCurveFit)
+        self.pump_curve = None
+        
+        # Friction correlation
+        self.friction_model = get_friction_model(friction_model)
         
-    def calculate_friction_factor(self, velocity: float) -> float:
+    def calculate_friction_factor(self, velocity: ArrayLike) -> ArrayLike:
         """
-        Calculate Darcy friction factor using Colebrook-White equation.
+        Calculate Darcy friction factor with the configured friction model.
         
         Args:
-            velocity: Flow velocity in m/s
+            velocity: Flow velocity in m/s (scalar or array of any shape)
             
         Returns:
-            Friction factor F (dimensionless)
+            Friction factor F (dimensionless), same shape as velocity
         """
-        term1 = 1 / (3.7 * self.roughness_factor)
-        term2 = 5.74 / (self.reynolds_coefficient * velocity) ** 0.9
-        F = 0.25 / (log10(term1 + term2)) ** 2
-        return F
+        velocity = np.asarray(velocity, dtype=float)
+        return self.friction_model.friction_factor(self.reynolds_coefficient * velocity,
+                                                   1 / self.roughness_factor)
     
-    def calculate_system_head(self, velocity: float) -> float:
+    def calculate_system_head(self, velocity: ArrayLike) -> ArrayLike:
         """
         Calculate system required head (ha) - System Resistance Curve.
         
         Args:
-            velocity: Flow velocity in m/s
+            velocity: Flow velocity in m/s (scalar or array of any shape)
             
         Returns:
-            System head in meters
+            System head in meters, same shape as velocity
         """
+        velocity = np.asarray(velocity, dtype=float)
         F = self.calculate_friction_factor(velocity)
         dynamic_loss = (self.loss_coefficient_1 * F + self.loss_coefficient_2) * \
                        (velocity ** 2 / self.gravity_factor)
         ha = self.static_head + dynamic_loss
         return ha
     
-    def calculate_pump_head(self, velocity: float) -> float:
+    def calculate_pump_head(self, velocity: ArrayLike) -> ArrayLike:
         """
         Calculate pump available head (Ha) - Pump Characteristic Curve.
         
         Args:
-            velocity: Flow velocity in m/s
+            velocity: Flow velocity in m/s (scalar or array of any shape)
             
         Returns:
-            Pump head in meters
+            Pump head in meters, same shape as velocity
         """
+        velocity = np.asarray(velocity, dtype=float)
+        if self.pump_curve is not None:
+            return self.pump_curve.head(velocity * self.area)
         Ha = self.pump_max_head - self.pump_coefficient * \
              (self.pump_velocity_factor * velocity) ** 2
         return Ha
     
-    def calculate_flow_rate(self, velocity: float) -> float:
+    def calculate_friction_factor_derivative(self, velocity: ArrayLike) -> ArrayLike:
+        """
+        Calculate the analytic derivative dF/dv of the friction factor.
+        
+        Args:
+            velocity: Flow velocity in m/s (scalar or array of any shape)
+            
+        Returns:
+            dF/dv in s/m, same shape as velocity
+        """
+        velocity = np.asarray(velocity, dtype=float)
+        return self.reynolds_coefficient * self.friction_model.derivative(
+            self.reynolds_coefficient * velocity, 1 / self.roughness_factor
+        )
+    
+    def calculate_system_head_derivative(self, velocity: ArrayLike) -> ArrayLike:
+        """
+        Calculate the analytic derivative dha/dv of the system curve.
+        
+        Args:
+            velocity: Flow velocity in m/s (scalar or array of any shape)
+            
+        Returns:
+            dha/dv in s, same shape as velocity
+        """
+        velocity = np.asarray(velocity, dtype=float)
+        F = self.calculate_friction_factor(velocity)
+        dF = self.calculate_friction_factor_derivative(velocity)
+        return (self.loss_coefficient_1 * dF * velocity ** 2 +
+                2 * velocity * (self.loss_coefficient_1 * F + self.loss_coefficient_2)) / \
+            self.gravity_factor
+    
+    def calculate_pump_head_derivative(self, velocity: ArrayLike) -> ArrayLike:
+        """
+        Calculate the analytic derivative dHa/dv of the pump curve.
+        
+        Args:
+            velocity: Flow velocity in m/s (scalar or array of any shape)
+            
+        Returns:
+            dHa/dv in s, same shape as velocity
+        """
+        velocity = np.asarray(velocity, dtype=float)
+        if self.pump_curve is not None:
+            return self.pump_curve.derivative(velocity * self.area) * self.area
+        return -2 * self.pump_coefficient * self.pump_velocity_factor ** 2 * velocity
+    
+    def calculate_shutoff_velocity(self) -> ArrayLike:
+        """
+        Calculate the velocity at which the pump head drops to zero.
+        
+        Returns:
+            Shutoff velocity in m/s
+        """
+        if self.pump_curve is not None:
+            return self.pump_curve.shutoff_flow() / self.area
+        return np.sqrt(self.pump_max_head / self.pump_coefficient) / self.pump_velocity_factor
+    
+    def calculate_flow_rate(self, velocity: ArrayLike) -> ArrayLike:
         """
         Calculate volumetric flow rate from velocity.
         
         Args:
-            velocity: Flow velocity in m/s
+            velocity: Flow velocity in m/s (scalar or array of any shape)
+            
+        Returns:
+            Flow rate in m³/s, same shape as velocity
+        """
+        return np.asarray(velocity, dtype=float) * self.area
+    
+    def _operating_point_result(self, v_operating: float) -> Dict[str, float]:
+        """
+        Build the operating point dictionary for a solved velocity.
+        
+        Args:
+            v_operating: Operating velocity in m/s
             
         Returns:
-            Flow rate in m³/s
+            Dictionary with operating point data
         """
-        return velocity * self.area
+        ha_operating = float(self.calculate_system_head(v_operating))
+        Ha_operating = float(self.calculate_pump_head(v_operating))
+        Q_operating = float(self.calculate_flow_rate(v_operating))
+        F_operating = float(self.calculate_friction_factor(v_operating))
+        
+        # Calculate Reynolds number approximation
+        reynolds_partial = self.reynolds_coefficient * v_operating
+        
+        return {
+            'velocity': v_operating,
+            'head': ha_operating,
+            'head_pump': Ha_operating,
+            'flow_rate_m3s': Q_operating,
+            'flow_rate_ls': Q_operating * 1000,
+            'friction_factor': F_operating,
+            'reynolds_partial': reynolds_partial,
+            'difference': abs(ha_operating - Ha_operating),
+            'success': True
+        }
     
-    def find_operating_point(self, initial_guess: float = 0.5) -> Dict[str, float]:
+    @profiling.timed('find_operating_point')
+    def find_operating_point(self, initial_guess: float = 0.5, method: str = 'fsolve',
+                             v_min: Optional[float] = None, v_max: Optional[float] = None,
+                             num_points: int = 500) -> Dict[str, float]:
         """
         Find the operating point where system curve intersects pump curve.
         
         Args:
-            initial_guess: Initial velocity guess for solver in m/s
+            initial_guess: Initial velocity guess for solver in m/s ('fsolve' only)
+            method: 'fsolve' for a single local solve from initial_guess, or
+                'bracket' to bracket sign changes on a sampled grid and refine
+                them (returns the lowest-velocity intersection)
+            v_min: Minimum admissible velocity in m/s (default 0.1 for 'bracket')
+            v_max: Maximum admissible velocity in m/s (default 2.0 for 'bracket')
+            num_points: Number of grid points used to bracket roots
             
         Returns:
             Dictionary with operating point data
         """
+        if method == 'bracket':
+            intersections = self.find_all_operating_points(
+                0.1 if v_min is None else v_min,
+                2.0 if v_max is None else v_max,
+                num_points
+            )
+            if not intersections['success']:
+                return {
+                    'success': False,
+                    'error': intersections['message']
+                }
+            result = dict(intersections['operating_points'][0])
+            result['intersections'] = intersections['count']
+            return result
+        if method != 'fsolve':
+            raise ValueError(f"Unknown solver method: {method!r}")
+        
         def difference(v):
             return self.calculate_pump_head(v) - self.calculate_system_head(v)
         
+        def difference_derivative(v):
+            return np.atleast_2d(self.calculate_pump_head_derivative(v) -
+                                 self.calculate_system_head_derivative(v))
+        
+        # SciPy is only needed for this solver path; import it on first use
+        from scipy.optimize import fsolve
+        
         try:
-            v_operating = fsolve(difference, initial_guess)[0]
-            ha_operating = self.calculate_system_head(v_operating)
-            Ha_operating = self.calculate_pump_head(v_operating)
-            Q_operating = self.calculate_flow_rate(v_operating)
-            F_operating = self.calculate_friction_factor(v_operating)
-            
-            # Calculate Reynolds number approximation
-            reynolds_partial = self.reynolds_coefficient * v_operating
-            
-            result = {
-                'velocity': v_operating,
-                'head': ha_operating,
-                'head_pump': Ha_operating,
-                'flow_rate_m3s': Q_operating,
-                'flow_rate_ls': Q_operating * 1000,
-                'friction_factor': F_operating,
-                'reynolds_partial': reynolds_partial,
-                'difference': abs(ha_operating - Ha_operating),
-                'success': True
-            }
+            solution, info, ier, message = fsolve(difference, initial_guess,
+                                                  fprime=difference_derivative,
+                                                  full_output=True)
+            profiling.count(evaluations=int(info['nfev']), iterations=max(int(info['nfev']) - 1, 0))
+            if ier != 1:
+                raise RuntimeError(message)
+            v_operating = float(solution[0])
+            if (v_min is not None and v_operating < v_min) or \
+               (v_max is not None and v_operating > v_max):
+                raise RuntimeError(f"Solution v = {v_operating:.4f} m/s lies outside "
+                                   f"[{v_min}, {v_max}] m/s")
+            result = self._operating_point_result(v_operating)
             
         except Exception as e:
             result = {
@@ -138,6 +270,79 @@ class PumpSystemAnalyzer:
         
         return result
     
+    def operating_point(self, **options) -> Optional[OperatingPoint]:
+        """
+        Typed counterpart of find_operating_point.
+        
+        Args:
+            **options: Forwarded to find_operating_point
+            
+        Returns:
+            OperatingPoint record, or None when no operating point was found
+        """
+        return OperatingPoint.from_dict(self.find_operating_point(**options))
+    
+    @profiling.timed('find_all_operating_points')
+    def find_all_operating_points(self, v_min: float = 0.1, v_max: float = 2.0,
+                                  num_points: int = 500,
+                                  curves: Optional[Dict[str, np.ndarray]] = None,
+                                  tol: float = 1e-10) -> Dict:
+        """
+        Find every intersection of the pump and system curves in a range.
+        
+        Sign changes of Ha - ha on the sampled grid are bracketed and each
+        bracket is refined with a bisection-safeguarded Newton step that uses
+        the analytic derivatives.
+        
+        Args:
+            v_min: Minimum velocity in m/s
+            v_max: Maximum velocity in m/s
+            num_points: Number of grid points used to bracket roots
+            curves: Precomputed output of generate_curves to reuse as grid
+            tol: Absolute head residual tolerance in meters
+            
+        Returns:
+            Dictionary with the list of operating points (ascending velocity),
+            their count, a success flag and a status message
+        """
+        if curves is None:
+            curves = self.generate_curves(v_min, v_max, num_points)
+        velocities = curves['velocities']
+        difference = curves['pump_head'] - curves['system_head']
+        
+        signs = np.sign(difference)
+        brackets = np.nonzero(signs[:-1] != signs[1:])[0]
+        
+        roots = np.empty(0)
+        if brackets.size:
+            solution = bracketed_newton(
+                profiling.counted(lambda v: self.calculate_pump_head(v) -
+                                  self.calculate_system_head(v)),
+                lambda v: (self.calculate_pump_head_derivative(v) -
+                           self.calculate_system_head_derivative(v)),
+                velocities[brackets], velocities[brackets + 1], ftol=tol
+            )
+            profiling.count(iterations=int(solution['iterations'].sum()))
+            roots = np.sort(solution['root'][solution['converged']])
+            if roots.size:
+                # A root sitting exactly on a grid point is found by two brackets
+                keep = np.concatenate(([True], np.diff(roots) > 1e-9 * (1 + roots[1:])))
+                roots = roots[keep]
+        
+        operating_points = [self._operating_point_result(float(v)) for v in roots]
+        if operating_points:
+            message = f"{len(operating_points)} intersection(s) found"
+        else:
+            message = f"No intersection in range [{v_min}, {v_max}] m/s"
+        
+        return {
+            'operating_points': operating_points,
+            'count': len(operating_points),
+            'success': bool(operating_points),
+            'message': message
+        }
+    
+    @profiling.timed('generate_curves')
     def generate_curves(self, v_min: float = 0.1, v_max: float = 2.0, 
                        num_points: int = 500) -> Dict[str, np.ndarray]:
         """
@@ -152,10 +357,11 @@ class PumpSystemAnalyzer:
             Dictionary with velocity, flow rate, system head, and pump head arrays
         """
         velocities = np.linspace(v_min, v_max, num_points)
+        profiling.count(evaluations=velocities.size)
         
-        ha_values = np.array([self.calculate_system_head(v) for v in velocities])
-        Ha_values = np.array([self.calculate_pump_head(v) for v in velocities])
-        flow_rates = np.array([self.calculate_flow_rate(v) for v in velocities])
+        ha_values = self.calculate_system_head(velocities)
+        Ha_values = self.calculate_pump_head(velocities)
+        flow_rates = self.calculate_flow_rate(velocities)
         
         return {
             'velocities': velocities,
@@ -164,6 +370,7 @@ class PumpSystemAnalyzer:
             'pump_head': Ha_values
         }
     
+    @profiling.timed('get_system_info')
     def get_system_info(self) -> Dict[str, float]:
         """
         Get system configuration information.
@@ -176,11 +383,15 @@ class PumpSystemAnalyzer:
             'area': self.area,
             'static_head': self.static_head,
             'pump_max_head': self.pump_max_head,
-            'roughness_factor': self.roughness_factor
+            'roughness_factor': self.roughness_factor,
+            'friction_model': self.friction_model.name
         }
     
+    @profiling.timed('analyze_complete_system')
     def analyze_complete_system(self, v_min: float = 0.1, v_max: float = 2.0,
-                               num_points: int = 500) -> Dict:
+                               num_points: int = 500, method: str = 'bracket',
+                               curve_tol: Optional[float] = None,
+                               checkpoint: Optional[Callable[[], None]] = None) -> Dict:
         """
         Perform complete system analysis including curves and operating point.
         
@@ -188,12 +399,36 @@ class PumpSystemAnalyzer:
             v_min: Minimum velocity in m/s
             v_max: Maximum velocity in m/s
             num_points: Number of points for curves
+            method: Operating point solver ('bracket' or 'fsolve')
+            curve_tol: Sample the curves adaptively to this interpolation
+                error in meters (see adaptive_sampling) instead of on
+                num_points uniform points
+            checkpoint: Called after the curves and after the operating
+                point; an exception it raises abandons the analysis (used
+                to cancel superseded GUI requests)
             
         Returns:
             Complete analysis dictionary with all results
         """
-        curves = self.generate_curves(v_min, v_max, num_points)
-        operating_point = self.find_operating_point()
+        if curve_tol is not None:
+            # Imported here: adaptive_sampling builds on this module
+            from .adaptive_sampling import generate_adaptive_curves
+            curves = generate_adaptive_curves(self, v_min, v_max, tol=curve_tol)
+        else:
+            curves = self.generate_curves(v_min, v_max, num_points)
+        if checkpoint is not None:
+            checkpoint()
+        if method == 'bracket':
+            intersections = self.find_all_operating_points(v_min, v_max, curves=curves)
+            if intersections['success']:
+                operating_point = dict(intersections['operating_points'][0])
+                operating_point['intersections'] = intersections['count']
+            else:
+                operating_point = {'success': False, 'error': intersections['message']}
+        else:
+            operating_point = self.find_operating_point(method=method, v_min=v_min, v_max=v_max)
+        if checkpoint is not None:
+            checkpoint()
         system_info = self.get_system_info()
         
         return {
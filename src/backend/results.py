@@ -0,0 +1,197 @@
+"""
+Result Records Module
+Compact typed operating points and a columnar container for batches
+
+OperatingPoint is a frozen, slotted record of the fields that
+find_operating_point reports; derived values (flow in L/s, head
+difference) are computed on access instead of stored. OperatingPointBatch
+keeps a batch as one NumPy array per field: a million rows take about
+50 MB (versus the better part of a gigabyte as a list of dicts), slices
+are views that copy nothing, and to_pandas/to_records convert without
+per-row Python objects.
+"""
+
+from dataclasses import dataclass, fields
+from typing import Dict, Iterator, Optional, Union
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class OperatingPoint:
+    """
+    Operating point of one pump/system configuration.
+    """
+
+    # Declared by hand (not dataclass(slots=True), which needs Python 3.10)
+    __slots__ = ('velocity', 'head', 'head_pump', 'flow_rate_m3s', 'friction_factor',
+                 'reynolds_partial')
+
+    velocity: float  # m/s
+    head: float  # system head ha in m
+    head_pump: float  # pump head Ha in m
+    flow_rate_m3s: float  # m³/s
+    friction_factor: float
+    reynolds_partial: float
+
+    def __reduce__(self):
+        # Slotted frozen instances cannot restore state by assignment
+        return self.__class__, tuple(getattr(self, name) for name in self.__slots__)
+
+    @property
+    def flow_rate_ls(self) -> float:
+        """Flow rate in L/s"""
+        return self.flow_rate_m3s * 1000
+
+    @property
+    def difference(self) -> float:
+        """Residual |ha - Ha| in m"""
+        return abs(self.head - self.head_pump)
+
+    @classmethod
+    def from_dict(cls, result: Dict) -> Optional['OperatingPoint']:
+        """
+        Convert a find_operating_point dictionary.
+
+        Returns:
+            The operating point, or None when the solve did not succeed
+        """
+        if not result.get('success', False):
+            return None
+        return cls(**{field.name: float(result[field.name]) for field in fields(cls)})
+
+    def to_dict(self) -> Dict[str, float]:
+        """Dictionary in the find_operating_point format"""
+        result = {field.name: getattr(self, field.name) for field in fields(self)}
+        result['flow_rate_ls'] = self.flow_rate_ls
+        result['difference'] = self.difference
+        result['success'] = True
+        return result
+
+
+# Columns of a batch, with their dtypes
+BATCH_COLUMNS = {
+    'velocity': np.float64,
+    'head': np.float64,
+    'head_pump': np.float64,
+    'flow_rate_m3s': np.float64,
+    'friction_factor': np.float64,
+    'converged': np.bool_,
+    'iterations': np.int32,
+}
+
+
+class OperatingPointBatch:
+    """
+    Column-oriented operating points of many configurations.
+
+    Columns are read as attributes or items (batch.velocity,
+    batch['head']). Integer indexing returns an OperatingPoint (None where
+    the row did not converge); slices, boolean masks and index arrays
+    return a new batch (views for slices).
+    """
+
+    __slots__ = ('_columns', '_reynolds_coefficient')
+
+    def __init__(self, columns: Dict[str, np.ndarray],
+                 reynolds_coefficient: Union[float, np.ndarray] = 22706.9):
+        """
+        Args:
+            columns: Arrays keyed by BATCH_COLUMNS names (e.g. the output of
+                solve_analyzer_batch or run_sweep); other keys are ignored.
+                Arrays already of the right dtype are used without copying.
+            reynolds_coefficient: Coefficient (scalar or per row) used for
+                reynolds_partial in OperatingPoint records
+        """
+        self._columns = {name: np.asarray(columns[name], dtype=dtype)
+                         for name, dtype in BATCH_COLUMNS.items()}
+        lengths = {len(column) for column in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All batch columns must have the same length")
+        self._reynolds_coefficient = reynolds_coefficient
+
+    @classmethod
+    def empty(cls, size: int) -> 'OperatingPointBatch':
+        """Batch of non-converged rows, to be filled in place"""
+        return cls({name: np.zeros(size, dtype=dtype) for name, dtype in BATCH_COLUMNS.items()})
+
+    def __len__(self) -> int:
+        return len(self._columns['velocity'])
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise AttributeError(f"{type(self).__name__!r} has no column {name!r}") from None
+
+    def __getitem__(self, key) -> Union[np.ndarray, Optional[OperatingPoint],
+                                         'OperatingPointBatch']:
+        if isinstance(key, str):
+            return self._columns[key]
+        if isinstance(key, (int, np.integer)):
+            return self.record(int(key))
+        coefficient = self._reynolds_coefficient
+        if np.ndim(coefficient):
+            coefficient = coefficient[key]
+        return OperatingPointBatch({name: column[key] for name, column in self._columns.items()},
+                                   coefficient)
+
+    def __iter__(self) -> Iterator[Optional[OperatingPoint]]:
+        for index in range(len(self)):
+            yield self.record(index)
+
+    def __repr__(self) -> str:
+        return f"OperatingPointBatch({len(self)} rows, {int(self.converged.sum())} converged)"
+
+    @property
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The column arrays (not copies)"""
+        return dict(self._columns)
+
+    @property
+    def flow_rate_ls(self) -> np.ndarray:
+        return self._columns['flow_rate_m3s'] * 1000
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the column arrays in bytes"""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def record(self, index: int) -> Optional[OperatingPoint]:
+        """
+        Operating point of one row.
+
+        Returns:
+            OperatingPoint, or None when the row did not converge
+        """
+        columns = self._columns
+        if not columns['converged'][index]:
+            return None
+        velocity = float(columns['velocity'][index])
+        coefficient = self._reynolds_coefficient
+        coefficient = float(coefficient[index] if np.ndim(coefficient) else coefficient)
+        return OperatingPoint(velocity=velocity,
+                              head=float(columns['head'][index]),
+                              head_pump=float(columns['head_pump'][index]),
+                              flow_rate_m3s=float(columns['flow_rate_m3s'][index]),
+                              friction_factor=float(columns['friction_factor'][index]),
+                              reynolds_partial=coefficient * velocity)
+
+    def to_records(self) -> np.ndarray:
+        """Copy into a NumPy structured array (one record per row)"""
+        records = np.empty(len(self), dtype=[(name, dtype) for name, dtype in BATCH_COLUMNS.items()])
+        for name, column in self._columns.items():
+            records[name] = column
+        return records
+
+    def to_pandas(self) -> 'pandas.DataFrame':
+        """
+        Convert to a pandas DataFrame with one column per field.
+
+        pandas may share the column buffers instead of copying them, so
+        treat the result as read-only if the batch is still in use.
+        """
+        import pandas as pd
+        return pd.DataFrame(self._columns, copy=False)
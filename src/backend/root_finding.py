@@ -0,0 +1,169 @@
+"""
+Root Finding Module
+Vectorized, bracket-safeguarded Newton iteration shared by the solvers
+"""
+
+import numpy as np
+from typing import Callable, Dict, Optional
+
+
+def bracketed_newton(func: Callable[[np.ndarray], np.ndarray],
+                     derivative: Callable[[np.ndarray], np.ndarray],
+                     lower: np.ndarray, upper: np.ndarray,
+                     initial_guess: Optional[np.ndarray] = None,
+                     xtol: float = 1e-12, ftol: float = 1e-10,
+                     max_iter: int = 60) -> Dict[str, np.ndarray]:
+    """
+    Solve func(x) = 0 element-wise inside the brackets [lower, upper].
+
+    Every element takes a Newton step when it stays strictly inside its
+    bracket and falls back to bisection otherwise, so each row converges
+    whenever its bracket holds a sign change. All rows advance together in
+    array operations; rows that converged are frozen.
+
+    Args:
+        func: Vectorized function returning an array shaped like its input
+        derivative: Vectorized analytic derivative of func
+        lower: Lower bracket ends
+        upper: Upper bracket ends
+        initial_guess: Optional starting points (clipped into the bracket)
+        xtol: Relative bracket-width tolerance
+        ftol: Absolute residual tolerance
+        max_iter: Maximum number of iterations
+
+    Returns:
+        Dictionary with root, residual, converged flag, iteration count and
+        a bracketed flag (False where func did not change sign)
+    """
+    lower, upper = np.broadcast_arrays(np.asarray(lower, dtype=float),
+                                       np.asarray(upper, dtype=float))
+    lo = lower.copy()
+    hi = upper.copy()
+    f_lo = np.asarray(func(lo), dtype=float)
+    f_hi = np.asarray(func(hi), dtype=float)
+    bracketed = np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) * np.sign(f_hi) <= 0)
+
+    if initial_guess is None:
+        x = 0.5 * (lo + hi)
+    else:
+        x = np.clip(np.broadcast_to(np.asarray(initial_guess, dtype=float), lo.shape),
+                    lo, hi).copy()
+
+    converged = np.zeros(lo.shape, dtype=bool)
+    iterations = np.zeros(lo.shape, dtype=np.int32)
+    active = bracketed.copy()
+    fx = np.full(lo.shape, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for _ in range(max_iter):
+            if not active.any():
+                break
+            fx = np.where(active, func(x), fx)
+            done = active & ((np.abs(fx) <= ftol) |
+                             (hi - lo <= xtol * (1.0 + np.abs(x))))
+            converged |= done
+            active &= ~done
+            if not active.any():
+                break
+            iterations += active
+
+            # Shrink brackets around the current iterate
+            same_side = np.sign(fx) == np.sign(f_lo)
+            lo = np.where(active & same_side, x, lo)
+            f_lo = np.where(active & same_side, fx, f_lo)
+            hi = np.where(active & ~same_side, x, hi)
+
+            # Newton step, safeguarded by bisection
+            step = fx / derivative(x)
+            x_newton = x - step
+            inside = np.isfinite(x_newton) & (x_newton > lo) & (x_newton < hi)
+            x = np.where(active, np.where(inside, x_newton, 0.5 * (lo + hi)), x)
+
+    if active.any():
+        fx = np.where(active, func(x), fx)
+        converged |= active & (np.abs(fx) <= ftol)
+
+    return {
+        'root': np.where(bracketed, x, np.nan),
+        'residual': fx,
+        'converged': converged,
+        'iterations': iterations,
+        'bracketed': bracketed
+    }
+
+
+def bracketed_secant(func: Callable[[np.ndarray], np.ndarray],
+                     lower: np.ndarray, upper: np.ndarray,
+                     xtol: float = 1e-12, ftol: float = 1e-12,
+                     max_iter: int = 60) -> Dict[str, np.ndarray]:
+    """
+    Solve func(x) = 0 element-wise inside [lower, upper] without derivatives.
+
+    Uses the Illinois variant of regula falsi, which keeps every row
+    bracketed and converges superlinearly. Meant for functions that are
+    only piecewise smooth (e.g. built from interpolated tables), where
+    bracketed_newton has no analytic derivative to use.
+
+    Args:
+        func: Vectorized function returning an array shaped like its input
+        lower: Lower bracket ends
+        upper: Upper bracket ends
+        xtol: Relative bracket-width tolerance
+        ftol: Absolute residual tolerance
+        max_iter: Maximum number of iterations
+
+    Returns:
+        Dictionary with root, residual, converged flag, iteration count and
+        a bracketed flag (False where func did not change sign)
+    """
+    lower, upper = np.broadcast_arrays(np.asarray(lower, dtype=float),
+                                       np.asarray(upper, dtype=float))
+    lo = lower.copy()
+    hi = upper.copy()
+    f_lo = np.asarray(func(lo), dtype=float)
+    f_hi = np.asarray(func(hi), dtype=float)
+    bracketed = np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) * np.sign(f_hi) <= 0)
+
+    x = np.where(np.abs(f_lo) <= np.abs(f_hi), lo, hi)
+    fx = np.where(np.abs(f_lo) <= np.abs(f_hi), f_lo, f_hi)
+    converged = bracketed & (np.abs(fx) <= ftol)
+    iterations = np.zeros(lo.shape, dtype=np.int32)
+    active = bracketed & ~converged
+    # Side (-1 low, +1 high) replaced in the previous iteration
+    last_side = np.zeros(lo.shape, dtype=np.int8)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for _ in range(max_iter):
+            if not active.any():
+                break
+            iterations += active
+            x_new = np.where(f_hi != f_lo, (lo * f_hi - hi * f_lo) / (f_hi - f_lo),
+                             0.5 * (lo + hi))
+            x_new = np.where(np.isfinite(x_new) & (x_new >= lo) & (x_new <= hi),
+                             x_new, 0.5 * (lo + hi))
+            x = np.where(active, x_new, x)
+            fx = np.where(active, func(x), fx)
+
+            same_as_low = np.sign(fx) == np.sign(f_lo)
+            move_low = active & same_as_low
+            move_high = active & ~same_as_low
+            # Illinois: halve the stale end's value when the same end moves twice
+            f_hi = np.where(move_low & (last_side == -1), 0.5 * f_hi, f_hi)
+            f_lo = np.where(move_high & (last_side == 1), 0.5 * f_lo, f_lo)
+            lo = np.where(move_low, x, lo)
+            f_lo = np.where(move_low, fx, f_lo)
+            hi = np.where(move_high, x, hi)
+            f_hi = np.where(move_high, fx, f_hi)
+            last_side = np.where(move_low, -1, np.where(move_high, 1, last_side)).astype(np.int8)
+
+            done = active & ((np.abs(fx) <= ftol) | (hi - lo <= xtol * (1.0 + np.abs(x))))
+            converged |= done
+            active &= ~done
+
+    return {
+        'root': np.where(bracketed, x, np.nan),
+        'residual': fx,
+        'converged': converged,
+        'iterations': iterations,
+        'bracketed': bracketed
+    }
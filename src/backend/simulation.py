@@ -0,0 +1,328 @@
+"""
+Extended-Period Simulation Module
+Time-stepped operating points driven by suction and discharge tank levels
+
+The pump lifts water from a suction tank into a discharge tank. At every
+time step the static head follows the tank levels, the operating point is
+solved for that static head, and the tank levels are advanced with an
+explicit mass balance. Results are produced block by block by a generator,
+so arbitrarily long runs need constant memory.
+
+Between consecutive steps the static head barely moves, so each solve is
+warm-started from the previous velocity with a chord-Newton iteration:
+the pump head minus the friction losses (the lift) is cached at the current
+velocity and its slope is only refreshed when convergence slows down. A
+step usually costs a single curve evaluation.
+"""
+
+import copy
+import numpy as np
+from typing import Callable, Dict, Iterable, Iterator, Optional, TextIO, Tuple, Union
+
+from .pump_system import PumpSystemAnalyzer
+from .batch_solver import MIN_VELOCITY
+from .root_finding import bracketed_newton
+
+# A profile is a constant, a callable(times) returning values for an array
+# of times in seconds, or an array of per-step values repeated cyclically
+# (e.g. a daily pattern sampled at the time step)
+Profile = Union[float, Callable[[np.ndarray], np.ndarray], np.ndarray]
+
+# Columns of every result block, with the format used by write_csv
+SIMULATION_FIELDS = {
+    'time': '%.10g',
+    'static_head': '%.10g',
+    'velocity': '%.10g',
+    'flow_rate_m3s': '%.10g',
+    'head': '%.10g',
+    'suction_level': '%.10g',
+    'discharge_level': '%.10g',
+    'pump_on': '%d',
+    'evaluations': '%d',
+}
+
+
+class Tank:
+    """
+    Tank with a constant cross-section (area=inf gives a fixed-level reservoir).
+    """
+
+    def __init__(self, area: float = np.inf, level: float = 0.0,
+                 min_level: float = 0.0, max_level: float = np.inf):
+        """
+        Initialize a tank.
+
+        Args:
+            area: Cross-section area in m²
+            level: Initial water level in meters
+            min_level: Level below which the tank is empty in meters
+            max_level: Overflow level in meters
+        """
+        self.area = area
+        self.level = level
+        self.min_level = min_level
+        self.max_level = max_level
+
+    def __repr__(self) -> str:
+        return (f"Tank(area={self.area!r}, level={self.level!r}, "
+                f"min_level={self.min_level!r}, max_level={self.max_level!r})")
+
+
+def profile_values(profile: Profile, steps: np.ndarray, time_step: float) -> np.ndarray:
+    """
+    Evaluate a profile at a block of time steps.
+
+    Args:
+        profile: Constant, callable(times) or cyclic per-step array
+        steps: Integer step indices
+        time_step: Step length in seconds
+
+    Returns:
+        Array of profile values, one per step
+    """
+    if callable(profile):
+        return np.broadcast_to(np.asarray(profile(steps * time_step), dtype=float),
+                               steps.shape)
+    values = np.asarray(profile, dtype=float)
+    if values.ndim == 0:
+        return np.full(steps.shape, float(values))
+    return values[steps % values.size]
+
+
+class ExtendedPeriodSimulation:
+    """
+    Pump operating point tracked over time as the tank levels drift.
+    """
+
+    def __init__(self, analyzer: Optional[PumpSystemAnalyzer] = None,
+                 suction: Optional[Tank] = None, discharge: Optional[Tank] = None,
+                 inflow: Profile = 0.0, demand: Profile = 0.0, time_step: float = 1.0,
+                 start_level: Optional[float] = None, stop_level: Optional[float] = None,
+                 tol: float = 1e-9, max_iter: int = 20):
+        """
+        Initialize a simulation.
+
+        The analyzer's static_head is taken to hold at the initial levels;
+        afterwards it changes by the rise of the discharge level minus the
+        rise of the suction level.
+
+        Args:
+            analyzer: System and pump (copied; the original is not modified)
+            suction: Tank the pump draws from (default: fixed-level reservoir)
+            discharge: Tank the pump delivers to (default: fixed-level reservoir)
+            inflow: Inflow into the suction tank in m³/s
+            demand: Outflow drawn from the discharge tank in m³/s
+            time_step: Step length in seconds
+            start_level: Discharge level at or below which the pump starts
+            stop_level: Discharge level at or above which the pump stops
+            tol: Head residual tolerance of each solve in meters
+            max_iter: Chord iterations before falling back to a bracketed solve
+        """
+        self.analyzer = copy.copy(analyzer) if analyzer is not None else PumpSystemAnalyzer()
+        # Default tanks are bottomless fixed-level reservoirs
+        self.suction = suction if suction is not None else Tank(min_level=-np.inf)
+        self.discharge = discharge if discharge is not None else Tank(min_level=-np.inf)
+        self.inflow = inflow
+        self.demand = demand
+        self.time_step = time_step
+        self.start_level = start_level
+        self.stop_level = stop_level
+        self.tol = tol
+        self.max_iter = max_iter
+
+        self.head_offset = self.analyzer.static_head - (self.discharge.level -
+                                                        self.suction.level)
+        self.step = 0
+        self.pump_on = True
+        # Warm-start state: velocity, lift at that velocity and chord slope
+        self.velocity = float(self.analyzer.calculate_shutoff_velocity()) / 2
+        self._lift_value = float(self._lift(self.velocity))
+        self._slope = float(self._lift_slope(self.velocity))
+
+    @property
+    def time(self) -> float:
+        """Simulated time in seconds"""
+        return self.step * self.time_step
+
+    @property
+    def static_head(self) -> float:
+        """Static head at the current tank levels in meters"""
+        return self.head_offset + self.discharge.level - self.suction.level
+
+    def _lift(self, velocity):
+        """Pump head minus friction losses (the static head the pump can hold)"""
+        analyzer = self.analyzer
+        return analyzer.calculate_pump_head(velocity) - \
+            analyzer.calculate_system_head(velocity) + analyzer.static_head
+
+    def _lift_slope(self, velocity):
+        analyzer = self.analyzer
+        return analyzer.calculate_pump_head_derivative(velocity) - \
+            analyzer.calculate_system_head_derivative(velocity)
+
+    def _bracketed_solve(self, static_head: float) -> Tuple[float, int]:
+        """
+        Solve from scratch when the chord iteration fails.
+
+        Returns:
+            (velocity, evaluations); velocity is NaN when the pump cannot
+            overcome the static head
+        """
+        lower = MIN_VELOCITY
+        if self._lift(lower) < static_head:
+            return np.nan, 1
+        # The root lies beyond shutoff when the static head is negative
+        upper = float(self.analyzer.calculate_shutoff_velocity())
+        evaluations = 2
+        while self._lift(upper) > static_head and evaluations < 64:
+            upper *= 2
+            evaluations += 1
+        solution = bracketed_newton(
+            lambda v: self._lift(v) - static_head, self._lift_slope,
+            np.array([lower]), np.array([upper]), ftol=self.tol
+        )
+        evaluations += int(solution['iterations'][0]) + 2
+        if not solution['converged'][0]:
+            return np.nan, evaluations
+        return float(solution['root'][0]), evaluations
+
+    def _solve(self, static_head: float) -> Tuple[float, int]:
+        """
+        Warm-started chord-Newton solve of lift(v) = static_head.
+
+        Returns:
+            (velocity, evaluations); velocity is NaN when the pump cannot
+            overcome the static head
+        """
+        velocity, lift, slope = self.velocity, self._lift_value, self._slope
+        evaluations = 0
+        for _ in range(self.max_iter):
+            residual = lift - static_head
+            if abs(residual) <= self.tol:
+                self.velocity, self._lift_value, self._slope = velocity, lift, slope
+                return velocity, evaluations
+            candidate = velocity - residual / slope
+            if not candidate > MIN_VELOCITY:
+                break
+            candidate_lift = float(self._lift(candidate))
+            evaluations += 1
+            if abs(candidate_lift - static_head) > 0.01 * abs(residual):
+                slope = float(self._lift_slope(candidate))
+                evaluations += 1
+            elif abs(candidate - velocity) > 1e-6 * velocity:
+                # Secant slope of the step just taken, at no extra cost
+                slope = (candidate_lift - lift) / (candidate - velocity)
+            velocity, lift = candidate, candidate_lift
+
+        velocity, spent = self._bracketed_solve(static_head)
+        evaluations += spent
+        if np.isfinite(velocity):
+            self.velocity = velocity
+            self._lift_value = float(self._lift(velocity))
+            self._slope = float(self._lift_slope(velocity))
+            evaluations += 2
+        return velocity, evaluations
+
+    def run(self, duration: float, block_size: int = 3600) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Advance the simulation, yielding results block by block.
+
+        The simulation keeps its state, so consecutive runs continue where
+        the previous one stopped.
+
+        Args:
+            duration: Simulated time in seconds
+            block_size: Steps per yielded block
+
+        Yields:
+            Dictionary of per-step arrays (see SIMULATION_FIELDS): time,
+            static_head, velocity, flow_rate_m3s (zero while the pump is off
+            or cannot deliver), head (pump head, NaN while not delivering),
+            the tank levels at the start of the step, pump_on, and curve
+            evaluations spent
+        """
+        total = int(round(duration / self.time_step))
+        area = float(self.analyzer.area)
+        dt = self.time_step
+        suction, discharge = self.suction, self.discharge
+
+        end = self.step + total
+        while self.step < end:
+            steps = np.arange(self.step, min(self.step + block_size, end))
+            size = steps.size
+            inflow = profile_values(self.inflow, steps, dt).tolist()
+            demand = profile_values(self.demand, steps, dt).tolist()
+            block = {name: np.zeros(size, dtype=np.int32 if fmt == '%d' else float)
+                     for name, fmt in SIMULATION_FIELDS.items()}
+            static_column = block['static_head']
+            velocity_column = block['velocity']
+            suction_column = block['suction_level']
+            discharge_column = block['discharge_level']
+            pump_column = block['pump_on']
+            evaluation_column = block['evaluations']
+
+            for k in range(size):
+                # Level control with hysteresis; never run a dry suction tank
+                if self.stop_level is not None and discharge.level >= self.stop_level:
+                    self.pump_on = False
+                elif self.start_level is not None and discharge.level <= self.start_level:
+                    self.pump_on = True
+                running = self.pump_on and suction.level > suction.min_level
+
+                static_head = self.head_offset + discharge.level - suction.level
+                flow = 0.0
+                if running:
+                    velocity, evaluations = self._solve(static_head)
+                    evaluation_column[k] = evaluations
+                    if velocity == velocity:
+                        flow = velocity * area
+                        velocity_column[k] = velocity
+                static_column[k] = static_head
+                suction_column[k] = suction.level
+                discharge_column[k] = discharge.level
+                pump_column[k] = running
+
+                suction.level = min(max(suction.level + (inflow[k] - flow) * dt / suction.area,
+                                        suction.min_level), suction.max_level)
+                discharge.level = min(max(discharge.level + (flow - demand[k]) * dt /
+                                          discharge.area, discharge.min_level),
+                                      discharge.max_level)
+
+            delivering = velocity_column > 0
+            block['time'] = steps * dt
+            block['flow_rate_m3s'] = velocity_column * area
+            block['head'] = np.where(delivering, self.analyzer.calculate_pump_head(
+                np.where(delivering, velocity_column, 0.0)), np.nan)
+            self.step += size
+            yield block
+
+
+def write_csv(blocks: Iterable[Dict[str, np.ndarray]], output: Union[str, TextIO],
+              formats: Optional[Dict[str, str]] = None) -> int:
+    """
+    Write result blocks to CSV as they are produced.
+
+    Args:
+        blocks: Iterable of column dictionaries (e.g. ExtendedPeriodSimulation.run)
+        output: File path or open text file
+        formats: printf-style format per column (default: SIMULATION_FIELDS,
+            '%.10g' for other columns)
+
+    Returns:
+        Number of rows written
+    """
+    formats = SIMULATION_FIELDS if formats is None else formats
+    handle = open(output, 'w', newline='') if isinstance(output, str) else output
+    rows = 0
+    try:
+        for block in blocks:
+            names = list(block)
+            if rows == 0:
+                handle.write(','.join(names) + '\n')
+            np.savetxt(handle, np.column_stack([block[name] for name in names]),
+                       fmt=[formats.get(name, '%.10g') for name in names], delimiter=',')
+            rows += len(block[names[0]])
+    finally:
+        if handle is not output:
+            handle.close()
+    return rows
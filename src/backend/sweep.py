@@ -0,0 +1,135 @@
+"""
+Parameter Sweep Module
+Cartesian and Latin-hypercube sweeps solved in parallel chunks
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from .pump_system import PumpSystemAnalyzer
+from .batch_solver import BATCH_PARAMETERS, broadcast_analyzer, solve_analyzer_batch
+
+
+# Result columns produced for every design point
+RESULT_FIELDS = {
+    'velocity': np.float64,
+    'head': np.float64,
+    'head_pump': np.float64,
+    'flow_rate_m3s': np.float64,
+    'friction_factor': np.float64,
+    'converged': np.bool_,
+    'iterations': np.int32,
+}
+
+
+def cartesian_design(ranges: Dict[str, Sequence[float]]) -> Dict[str, np.ndarray]:
+    """
+    Build a full-factorial design from per-parameter value lists.
+
+    Args:
+        ranges: Values to combine, keyed by analyzer parameter name
+            (e.g. {'diameter': np.linspace(0.015, 0.05, 20)})
+
+    Returns:
+        Dictionary of flat parameter columns, one row per grid cell
+        (C order: the last parameter varies fastest)
+    """
+    names = list(ranges)
+    grids = np.meshgrid(*[np.asarray(ranges[name], dtype=float) for name in names],
+                        indexing='ij')
+    return {name: grid.ravel() for name, grid in zip(names, grids)}
+
+
+def latin_hypercube_design(bounds: Dict[str, Tuple[float, float]], num_samples: int,
+                           seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Build a Latin-hypercube design over parameter bounds.
+
+    Args:
+        bounds: (low, high) bounds keyed by analyzer parameter name
+        num_samples: Number of design points
+        seed: Random seed for reproducible designs
+
+    Returns:
+        Dictionary of flat parameter columns, one row per sample
+    """
+    rng = np.random.default_rng(seed)
+    design = {}
+    for name, (low, high) in bounds.items():
+        strata = (rng.permutation(num_samples) + rng.random(num_samples)) / num_samples
+        design[name] = low + strata * (high - low)
+    return design
+
+
+def _solve_chunk(start: int, parameters: Dict[str, np.ndarray],
+                 base: Optional[PumpSystemAnalyzer],
+                 solver_options: Dict) -> Tuple[int, Dict[str, np.ndarray]]:
+    """Solve one chunk of a sweep (runs inside a worker process)."""
+    analyzer = broadcast_analyzer(base, **parameters)
+    return start, solve_analyzer_batch(analyzer, **solver_options)
+
+
+def run_sweep(design: Dict[str, np.ndarray], base: Optional[PumpSystemAnalyzer] = None,
+              jobs: Optional[int] = None, chunk_size: int = 20000,
+              progress: Optional[Callable[[int, int], None]] = None,
+              **solver_options) -> Dict[str, np.ndarray]:
+    """
+    Solve the operating point of every design point across a process pool.
+
+    The design is split into contiguous chunks that are solved with the
+    vectorized batch solver. Results are written into preallocated arrays
+    at their design index, so ordering does not depend on completion order.
+
+    Args:
+        design: Flat parameter columns (see cartesian_design and
+            latin_hypercube_design)
+        base: Analyzer providing the parameters not in the design
+        jobs: Worker processes (default: number of CPU cores; 1 runs inline)
+        chunk_size: Design points solved per task
+        progress: Optional callback called as progress(done, total)
+        **solver_options: Forwarded to solve_analyzer_batch
+
+    Returns:
+        Dictionary with the design columns followed by the result columns
+        velocity, head, head_pump, flow_rate_m3s, friction_factor,
+        converged and iterations
+    """
+    unknown = set(design) - set(BATCH_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    columns = {name: np.asarray(values, dtype=float) for name, values in design.items()}
+    total = len(next(iter(columns.values()))) if columns else 0
+    if any(len(values) != total for values in columns.values()):
+        raise ValueError("All design columns must have the same length")
+
+    results = {name: np.empty(total, dtype=dtype) for name, dtype in RESULT_FIELDS.items()}
+    starts = range(0, total, chunk_size)
+    jobs = jobs or os.cpu_count() or 1
+    done = 0
+
+    def store(start, chunk):
+        nonlocal done
+        stop = start + len(chunk['velocity'])
+        for name in RESULT_FIELDS:
+            results[name][start:stop] = chunk[name]
+        done += stop - start
+        if progress is not None:
+            progress(done, total)
+
+    def chunk_parameters(start):
+        return {name: values[start:start + chunk_size] for name, values in columns.items()}
+
+    if jobs == 1 or len(starts) <= 1:
+        for start in starts:
+            store(*_solve_chunk(start, chunk_parameters(start), base, solver_options))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(starts))) as executor:
+            futures = [executor.submit(_solve_chunk, start, chunk_parameters(start),
+                                       base, solver_options)
+                       for start in starts]
+            for future in as_completed(futures):
+                store(*future.result())
+
+    return {**columns, **results}
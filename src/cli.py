@@ -0,0 +1,592 @@
+"""
+Command-Line Interface
+Headless operating-point analysis of single systems and case files
+
+Usage:
+    python main.py                                     # default system
+    python main.py --set static_head=9.5 --plot curves.png
+    python main.py --adaptive 1e-4 --curves curves.csv  # error-controlled curves
+    python main.py cases.csv -o results.csv --jobs 8   # one case per row
+    python main.py cases.parquet -o results.parquet --chunk-size 50000
+    python main.py --optimize --catalogue pumps.csv --min-flow 0.0003
+    python main.py --energy levels.csv --time-step 0.0166667   # minute data
+
+Case files hold one system per row. Columns named after analyzer
+parameters (see batch_solver.BATCH_PARAMETERS) override the base system;
+any other column (e.g. a case id) is copied to the output unchanged. Cases
+are read in chunks, solved with the vectorized batch solver (across worker
+processes with --jobs) and appended to the output as soon as each chunk is
+done, in input order, so files larger than memory can be processed.
+
+Nothing here imports Qt or needs a display; Matplotlib is only imported
+(with the non-interactive Agg backend) when --plot is given. --adaptive
+samples the single-system curves on an error-controlled, non-uniform grid
+(adaptive_sampling) for the plot, --curves and the printed summary. --profile
+prints the time, curve evaluations and solver iterations of every stage to
+stderr. Stages run by worker processes are summed over workers, so their
+total is CPU time; the report ends with the wall time of the run.
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, TextIO
+
+import numpy as np
+
+from .backend import profiling
+from .backend.pump_system import PumpSystemAnalyzer
+from .backend.batch_solver import BATCH_PARAMETERS, broadcast_analyzer, solve_analyzer_batch
+from .backend.friction import FRICTION_MODELS
+from .backend.optimization import CostModel, PUMP_PARAMETERS, optimize_design
+from .backend.energy import CONTROLS, QUANTITIES, annual_energy
+
+# Result columns appended to every case
+RESULT_COLUMNS = ('velocity', 'head', 'head_pump', 'flow_rate_m3s', 'flow_rate_ls',
+                  'friction_factor', 'converged', 'iterations')
+
+
+def _file_format(path: str, requested: Optional[str] = None) -> str:
+    if requested:
+        return requested
+    return 'parquet' if path.lower().endswith(('.parquet', '.pq')) else 'csv'
+
+
+def read_cases(path: str, chunk_size: int = 100_000,
+               file_format: Optional[str] = None) -> Iterator['pandas.DataFrame']:
+    """
+    Read a case file in chunks.
+
+    Args:
+        path: CSV or Parquet file ('-' reads CSV from standard input)
+        chunk_size: Rows per chunk
+        file_format: 'csv' or 'parquet' (default: from the file extension)
+
+    Yields:
+        DataFrames of at most chunk_size rows
+    """
+    import pandas as pd
+
+    if _file_format(path, file_format) == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(sys.stdin if path == '-' else path, chunksize=chunk_size)
+
+
+def solve_cases(cases: 'pandas.DataFrame', base: PumpSystemAnalyzer,
+                solver_options: Optional[Dict] = None) -> 'pandas.DataFrame':
+    """
+    Solve the operating point of every case in a DataFrame.
+
+    Args:
+        cases: One case per row; parameter columns override the base system
+        base: Analyzer providing the parameters missing from the cases
+        solver_options: Forwarded to solve_analyzer_batch
+
+    Returns:
+        The cases with the RESULT_COLUMNS appended
+    """
+    parameters = {name: cases[name].to_numpy(dtype=float)
+                  for name in BATCH_PARAMETERS if name in cases.columns}
+    # Broadcasting a length-n column keeps one configuration per row
+    analyzer = broadcast_analyzer(base, diameter=np.broadcast_to(
+        parameters.pop('diameter', base.diameter), (len(cases),)), **parameters)
+    solution = solve_analyzer_batch(analyzer, **(solver_options or {}))
+    solution['flow_rate_ls'] = solution['flow_rate_m3s'] * 1000
+    results = cases.copy()
+    for name in RESULT_COLUMNS:
+        results[name] = solution[name]
+    return results
+
+
+def _solve_chunk(cases: 'pandas.DataFrame', base: PumpSystemAnalyzer,
+                 solver_options: Optional[Dict], file_format: str, profile: bool = False):
+    """
+    Solve one chunk and encode it for the writer (runs inside a worker process).
+
+    CSV formatting costs far more than solving, so it is done here, in
+    parallel, rather than by the process writing the file.
+
+    Returns:
+        (results or CSV text without header, column names, rows, converged
+        rows, Profile of the chunk or None)
+    """
+    with profiling.collect() if profile else contextlib.nullcontext() as collected:
+        with profiling.stage('solve_cases'):
+            results = solve_cases(cases, base, solver_options)
+        converged = int(results['converged'].sum())
+        encoded = results
+        if file_format == 'csv':
+            with profiling.stage('encode_csv'):
+                encoded = results.to_csv(header=False, index=False)
+    return encoded, list(results.columns), len(results), converged, collected
+
+
+def _timed_chunks(chunks: Iterator) -> Iterator:
+    """Pass chunks through, timing each read as a stage"""
+    while True:
+        with profiling.stage('read_cases'):
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class ResultWriter:
+    """
+    Appends result chunks to a CSV or Parquet file.
+    """
+
+    def __init__(self, path: str, file_format: Optional[str] = None):
+        """
+        Args:
+            path: Output file ('-' writes CSV to standard output)
+            file_format: 'csv' or 'parquet' (default: from the file extension)
+        """
+        self.path = path
+        self.file_format = _file_format(path, file_format)
+        self.rows = 0
+        self._handle: Optional[TextIO] = None
+        self._parquet = None
+
+    def write(self, chunk, columns: List[str], rows: int) -> None:
+        """
+        Append one chunk.
+
+        Args:
+            chunk: DataFrame, or CSV text without header for CSV output
+            columns: Column names (written as the CSV header before the first chunk)
+            rows: Number of rows in the chunk
+        """
+        if self.file_format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            else:
+                # Chunks may infer different column types; keep the first schema
+                table = table.cast(self._parquet.schema)
+            self._parquet.write_table(table)
+        else:
+            if self._handle is None:
+                self._handle = sys.stdout if self.path == '-' else \
+                    open(self.path, 'w', newline='')
+                self._handle.write(','.join(columns) + '\n')
+            if not isinstance(chunk, str):
+                chunk = chunk.to_csv(header=False, index=False)
+            self._handle.write(chunk)
+        self.rows += rows
+
+    def close(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._handle is not None and self._handle is not sys.stdout:
+            self._handle.close()
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def run_batch(input_path: str, output_path: str, base: PumpSystemAnalyzer,
+              jobs: int = 1, chunk_size: int = 100_000,
+              solver_options: Optional[Dict] = None,
+              input_format: Optional[str] = None,
+              output_format: Optional[str] = None,
+              profile: Optional[profiling.Profile] = None) -> Dict[str, int]:
+    """
+    Solve a case file chunk by chunk and stream the results to a file.
+
+    With several jobs, at most two chunks per worker are in flight; results
+    are still written in input order.
+
+    Args:
+        input_path: Case file (CSV or Parquet)
+        output_path: Result file (CSV or Parquet)
+        base: Analyzer providing the parameters missing from the cases
+        jobs: Worker processes (1 solves inline)
+        chunk_size: Rows read, solved and written at a time
+        solver_options: Forwarded to solve_analyzer_batch
+        input_format: Format of the case file (default: from its extension)
+        output_format: Format of the result file (default: from its extension)
+        profile: Profile receiving the stages of the run (default: not profiled)
+
+    Returns:
+        Dictionary with the number of rows and of converged rows
+    """
+    chunks = read_cases(input_path, chunk_size, input_format)
+    converged = 0
+    with profiling.collect(profile) if profile is not None else contextlib.nullcontext(), \
+            ResultWriter(output_path, output_format) as writer:
+        if profile is not None:
+            chunks = _timed_chunks(iter(chunks))
+
+        def store(encoded):
+            nonlocal converged
+            chunk, columns, rows, chunk_converged, chunk_profile = encoded
+            converged += chunk_converged
+            if chunk_profile is not None:
+                profile.merge(chunk_profile)
+            with profiling.stage('write_results'):
+                writer.write(chunk, columns, rows)
+
+        def wait(future):
+            with profiling.stage('wait_for_workers'):
+                return future.result()
+
+        task = (base, solver_options, writer.file_format, profile is not None)
+        if jobs <= 1:
+            for cases in chunks:
+                store(_solve_chunk(cases, *task))
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                pending = deque()
+                for cases in chunks:
+                    pending.append(executor.submit(_solve_chunk, cases, *task))
+                    if len(pending) >= 2 * jobs:
+                        store(wait(pending.popleft()))
+                while pending:
+                    store(wait(pending.popleft()))
+        rows = writer.rows
+    return {'rows': rows, 'converged': converged}
+
+
+def save_plot(analysis: Dict, path: str) -> None:
+    """
+    Save the head-velocity and head-flow plots of an analysis without a display.
+
+    Args:
+        analysis: Output of PumpSystemAnalyzer.analyze_complete_system
+        path: Image file; the format follows the extension (png, svg, pdf...)
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+
+    curves = analysis['curves']
+    point = analysis['operating_point']
+    figure = Figure(figsize=(16, 7))
+    axes = figure.subplots(1, 2)
+    for ax, key, unit in ((axes[0], 'velocities', 'Velocidad (v) [m/s]'),
+                          (axes[1], 'flow_rates', 'Caudal (Q) [m³/s]')):
+        x = curves[key]
+        ax.plot(x, curves['system_head'], 'b-', linewidth=2, label='SRC')
+        ax.plot(x, curves['pump_head'], 'r-', linewidth=2, label='Ha (Head available)')
+        if point['success']:
+            x_op = point['velocity' if key == 'velocities' else 'flow_rate_m3s']
+            ax.plot(x_op, point['head'], 'go', markersize=12, label='Intersección')
+            ax.axvline(x=x_op, color='g', linestyle='--', alpha=0.5)
+            ax.axhline(y=point['head'], color='g', linestyle='--', alpha=0.5)
+        ax.set_xlabel(unit, fontsize=11)
+        ax.set_ylabel('Altura (h) [m]', fontsize=11)
+        ax.set_title('Ha y ha vs ' + unit.split()[0], fontsize=12, fontweight='bold')
+        ax.legend(fontsize=9, loc='best')
+        ax.grid(True, alpha=0.3)
+        ax.set_xlim(x[0], x[-1])
+    figure.tight_layout()
+    figure.savefig(path)
+
+
+def save_curves(curves: Dict[str, np.ndarray], path: str) -> None:
+    """
+    Write sampled curves to a CSV file, one row per velocity.
+
+    Args:
+        curves: Output of generate_curves or generate_adaptive_curves
+        path: CSV file ('-' for stdout)
+    """
+    columns = ('velocities', 'flow_rates', 'system_head', 'pump_head')
+    table = np.column_stack([curves[name] for name in columns])
+    header = 'velocity,flow_rate_m3s,system_head,pump_head'
+    np.savetxt(sys.stdout if path == '-' else path, table, fmt='%.10g', delimiter=',',
+               header=header, comments='')
+
+
+def print_operating_point(analysis: Dict, stream: TextIO = sys.stdout) -> None:
+    """Print the operating point and system information of an analysis"""
+    point = analysis['operating_point']
+    if not point['success']:
+        print(f"No operating point: {point['error']}", file=stream)
+    else:
+        print("Operating point:", file=stream)
+        print(f"  Velocity (v):        {point['velocity']:.4f} m/s", file=stream)
+        print(f"  Flow rate (Q):       {point['flow_rate_m3s']:.6f} m³/s = "
+              f"{point['flow_rate_ls']:.4f} L/s", file=stream)
+        print(f"  Head (ha = Ha):      {point['head']:.4f} m", file=stream)
+        print(f"  Difference:          {point['difference']:.6f} m", file=stream)
+        print(f"  Friction factor (F): {point['friction_factor']:.6f}", file=stream)
+        print(f"  Reynolds (partial):  {point['reynolds_partial']:.2f}", file=stream)
+    info = analysis['system_info']
+    print("System:", file=stream)
+    print(f"  Diameter:            {info['diameter']} m", file=stream)
+    print(f"  Area:                {info['area']:.6f} m²", file=stream)
+    print(f"  Static head:         {info['static_head']} m", file=stream)
+    print(f"  Friction model:      {info['friction_model']}", file=stream)
+    curves = analysis['curves']
+    sampling = f" (adaptive, max error {curves['max_error']:.2g} m)" \
+        if 'max_error' in curves else ''
+    print(f"  Curve points:        {curves['velocities'].size}{sampling}", file=stream)
+
+
+def print_design(design: Dict, stream: TextIO = sys.stdout, top: int = 5) -> None:
+    """Print the best design of an optimization and the runners-up"""
+    if not design['success']:
+        print(f"No design: {design['error']}", file=stream)
+        return
+    print("Lowest life-cycle cost design:", file=stream)
+    print(f"  Pump:                {design['pump_name']}", file=stream)
+    print(f"  Diameter:            {design['diameter']:.5f} m"
+          f"{' (on a constraint)' if design['on_constraint'] else ''}", file=stream)
+    print(f"  Velocity (v):        {design['velocity']:.4f} m/s", file=stream)
+    print(f"  Flow rate (Q):       {design['flow_rate_m3s']:.6f} m³/s", file=stream)
+    print(f"  Head:                {design['head']:.4f} m", file=stream)
+    print(f"  Running time:        {design['running_hours']:.0f} h/year", file=stream)
+    print(f"  Capital cost:        {design['capital_cost']:.2f}", file=stream)
+    print(f"  Energy cost (PV):    {design['energy_cost']:.2f}", file=stream)
+    print(f"  Total cost:          {design['total_cost']:.2f}", file=stream)
+    candidates = design['candidates']
+    order = np.argsort(np.where(candidates['feasible'], candidates['total_cost'], np.inf))
+    order = order[candidates['feasible'][order]][:top]
+    print(f"Best {len(order)} of {int(candidates['feasible'].sum())} feasible pumps:",
+          file=stream)
+    for index in order:
+        print(f"  {candidates['pump_name'][index]:<20} D = {candidates['diameter'][index]:.5f} m"
+              f"  total = {candidates['total_cost'][index]:.2f}", file=stream)
+
+
+def print_energy(energy: Dict, stream: TextIO = sys.stdout) -> None:
+    """Print the energy of a load profile and its load-duration bins"""
+    print(f"Annual energy ({energy['quantity']} profile, "
+          f"{energy['total_hours']:.1f} h):", file=stream)
+    print(f"  Hydraulic energy:    {energy['hydraulic_energy_kwh']:.3f} kWh "
+          f"± {abs(energy['binning_error_kwh']):.3g} (binning, "
+          f"{energy['relative_binning_error']:.2e} relative)", file=stream)
+    print(f"  Input energy:        {energy['energy_kwh']:.3f} kWh", file=stream)
+    print(f"  Mean power:          {energy['mean_power_w']:.2f} W", file=stream)
+    print(f"  Peak power:          {energy['peak_power_w']:.2f} W", file=stream)
+    if energy['unserved_hours']:
+        print(f"  Unserved:            {energy['unserved_hours']:.1f} h", file=stream)
+    if energy['skipped']:
+        print(f"  Skipped values:      {energy['skipped']}", file=stream)
+    bins = energy['bins']
+    print(f"{'from':>12} {'to':>12} {'hours':>10} {'power W':>10} {'kWh':>12}", file=stream)
+    for index in np.flatnonzero(bins['hours'] > 0):
+        print(f"{bins['edges'][index]:12.6g} {bins['edges'][index + 1]:12.6g} "
+              f"{bins['hours'][index]:10.2f} {bins['power_w'][index]:10.2f} "
+              f"{bins['energy_kwh'][index]:12.4f}", file=stream)
+
+
+def read_profile(path: str, column: str) -> np.ndarray:
+    """Read one column of a load profile CSV ('-' for stdin)"""
+    import pandas as pd
+
+    return pd.read_csv(sys.stdin if path == '-' else path,
+                       usecols=[column])[column].to_numpy(dtype=float)
+
+
+def read_catalogue(path: str) -> List[Dict]:
+    """
+    Read a pump catalogue CSV.
+
+    Columns: name, price, efficiency and any of PUMP_PARAMETERS (referred
+    to the base pipe); missing values come from the base system.
+    """
+    import pandas as pd
+
+    table = pd.read_csv(path)
+    columns = [name for name in ('name', 'price', 'efficiency') + PUMP_PARAMETERS
+               if name in table.columns]
+    return [{name: value for name, value in row.items() if pd.notna(value)}
+            for row in table[columns].to_dict('records')]
+
+
+def _cost_setting(text: str):
+    name, separator, value = text.partition('=')
+    if not separator or not hasattr(CostModel(), name):
+        raise argparse.ArgumentTypeError(
+            f"expected NAME=VALUE with NAME in {', '.join(vars(CostModel()))}")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a number") from None
+
+
+def _parameter(text: str):
+    name, separator, value = text.partition('=')
+    if not separator or name not in BATCH_PARAMETERS:
+        raise argparse.ArgumentTypeError(
+            f"expected NAME=VALUE with NAME in {', '.join(BATCH_PARAMETERS)}")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a number") from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description="Pump/system operating points without a GUI. Without an input "
+                    "file the base system is analyzed; with one, every row is solved.")
+    parser.add_argument('input', nargs='?',
+                        help="case file (.csv or .parquet, '-' for CSV on stdin)")
+    parser.add_argument('-o', '--output', default='-',
+                        help="result file (.csv or .parquet; default: CSV on stdout)")
+    parser.add_argument('--input-format', choices=('csv', 'parquet'))
+    parser.add_argument('--output-format', choices=('csv', 'parquet'))
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="worker processes (0: one per CPU core)")
+    parser.add_argument('--chunk-size', type=int, default=100_000,
+                        help="rows read, solved and written at a time")
+    parser.add_argument('--diameter', type=float, default=0.0203,
+                        help="pipe diameter of the base system in meters")
+    parser.add_argument('--friction-model', default='swamee_jain',
+                        choices=sorted(FRICTION_MODELS) + ['table'])
+    parser.add_argument('--set', dest='parameters', type=_parameter, action='append',
+                        default=[], metavar='NAME=VALUE',
+                        help="override a base system parameter (repeatable)")
+    parser.add_argument('--tol', type=float, default=1e-10,
+                        help="head residual tolerance in meters")
+    parser.add_argument('--v-min', type=float, default=0.1,
+                        help="minimum velocity of the single-system analysis")
+    parser.add_argument('--v-max', type=float, default=2.0,
+                        help="maximum velocity of the single-system analysis")
+    parser.add_argument('--num-points', type=int, default=500,
+                        help="curve points of the single-system analysis")
+    parser.add_argument('--plot', metavar='PATH',
+                        help="save the curves of the single-system analysis to an image")
+    parser.add_argument('--curves', metavar='PATH',
+                        help="write the curves of the single-system analysis to a CSV file")
+    parser.add_argument('--adaptive', type=float, metavar='TOL',
+                        help="sample the single-system curves adaptively to an "
+                             "interpolation error of TOL meters (replaces --num-points)")
+    optimization = parser.add_argument_group(
+        'design optimization', "choose the pipe diameter (and pump) with the lowest "
+                               "life-cycle cost for the base system")
+    optimization.add_argument('--optimize', action='store_true',
+                              help="run the design optimization")
+    optimization.add_argument('--catalogue', metavar='PATH',
+                              help="pump catalogue CSV (default: the base pump only)")
+    optimization.add_argument('--min-flow', type=float, default=0.0,
+                              help="smallest acceptable flow in m³/s")
+    optimization.add_argument('--velocity-range', type=float, nargs=2, default=(0.3, 3.0),
+                              metavar=('MIN', 'MAX'), help="acceptable velocities in m/s")
+    optimization.add_argument('--diameter-range', type=float, nargs=2, default=(0.01, 0.2),
+                              metavar=('MIN', 'MAX'), help="diameters searched in m")
+    optimization.add_argument('--standard-diameters', type=float, nargs='+', metavar='D',
+                              help="choose among these diameters instead of a range")
+    optimization.add_argument('--cost', dest='costs', type=_cost_setting, action='append',
+                              default=[], metavar='NAME=VALUE',
+                              help="cost model setting, e.g. energy_price=0.2 (repeatable)")
+    energy = parser.add_argument_group(
+        'annual energy', "pumping energy of a static-head or flow-demand profile, "
+                         "solved per load-duration bin")
+    energy.add_argument('--energy', metavar='PATH',
+                        help="profile CSV with one value per time step ('-' for stdin)")
+    energy.add_argument('--quantity', choices=QUANTITIES, default='static_head',
+                        help="profile quantity: static head in m or demanded flow in m³/s")
+    energy.add_argument('--column',
+                        help="profile column (default: the quantity name)")
+    energy.add_argument('--time-step', type=float, default=1.0,
+                        help="hours per profile value (1/60 for minute data)")
+    energy.add_argument('--bins', type=int, default=64,
+                        help="load-duration bins")
+    energy.add_argument('--control', choices=CONTROLS, default='throttle',
+                        help="flow control of a demand profile")
+    energy.add_argument('--efficiency', type=float, default=1.0,
+                        help="wire-to-water efficiency for the input energy")
+    parser.add_argument('--profile', action='store_true',
+                        help="print per-stage timings, evaluations and iterations to stderr")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command-line interface.
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+
+    Returns:
+        Exit status
+    """
+    args = build_parser().parse_args(argv)
+    base = PumpSystemAnalyzer(diameter=args.diameter, friction_model=args.friction_model)
+    for name, value in args.parameters:
+        setattr(base, name, value)
+    base.area = np.pi * (base.diameter / 2) ** 2
+
+    profile = profiling.Profile() if args.profile else None
+
+    if args.optimize:
+        costs = CostModel(**dict(args.costs))
+        with profiling.collect(profile) if profile is not None else contextlib.nullcontext():
+            design = optimize_design(
+                base, read_catalogue(args.catalogue) if args.catalogue else None, costs,
+                *args.diameter_range, diameters=args.standard_diameters,
+                min_flow=args.min_flow, velocity_range=args.velocity_range,
+                solver_options={'tol': args.tol})
+        print_design(design)
+        if profile is not None:
+            print(profile.format_report(), file=sys.stderr)
+        return 0 if design['success'] else 1
+
+    if args.energy:
+        values = read_profile(args.energy, args.column or args.quantity)
+        with profiling.collect(profile) if profile is not None else contextlib.nullcontext():
+            energy = annual_energy(values, args.quantity, base, time_step=args.time_step,
+                                   bins=args.bins, control=args.control,
+                                   efficiency=args.efficiency,
+                                   solver_options={'tol': args.tol})
+        print_energy(energy)
+        if profile is not None:
+            print(profile.format_report(), file=sys.stderr)
+        return 0
+
+    if args.input is None:
+        with profiling.collect(profile) if profile is not None else contextlib.nullcontext():
+            analysis = base.analyze_complete_system(args.v_min, args.v_max, args.num_points,
+                                                    curve_tol=args.adaptive)
+            print_operating_point(analysis)
+            if args.plot:
+                with profiling.stage('save_plot'):
+                    save_plot(analysis, args.plot)
+            if args.curves:
+                save_curves(analysis['curves'], args.curves)
+        if profile is not None:
+            print(profile.format_report(), file=sys.stderr)
+        return 0 if analysis['operating_point']['success'] else 1
+
+    start = time.perf_counter()
+    try:
+        summary = run_batch(args.input, args.output, base,
+                            jobs=args.jobs or os.cpu_count() or 1,
+                            chunk_size=args.chunk_size,
+                            solver_options={'tol': args.tol},
+                            input_format=args.input_format,
+                            output_format=args.output_format,
+                            profile=profile)
+    except ImportError as error:
+        # Only the optional file-format dependencies get a friendly message
+        module = (error.name or '').partition('.')[0]
+        if module == 'pyarrow':
+            print("error: pyarrow is required for Parquet files", file=sys.stderr)
+        elif module == 'pandas':
+            print("error: pandas is required for case files", file=sys.stderr)
+        else:
+            raise
+        return 2
+    elapsed = time.perf_counter() - start
+    print(f"{summary['rows']} cases solved ({summary['converged']} converged) "
+          f"in {elapsed:.2f} s", file=sys.stderr)
+    if profile is not None:
+        print(profile.format_report(), file=sys.stderr)
+    return 0
@@ -0,0 +1,143 @@
+"""
+Background Analysis Worker
+Runs pump system analyses off the Qt main thread with request coalescing
+"""
+
+import functools
+import itertools
+from PyQt6.QtCore import QCoreApplication, QObject, QThread, pyqtSignal, pyqtSlot
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside the worker when a newer request supersedes the current one"""
+
+
+class AnalysisWorker(QObject):
+    """Worker object living in a QThread; computes one analysis per request"""
+
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, controller):
+        super().__init__()
+        self._controller = controller
+
+    def _check_current(self, request_id):
+        if request_id != self._controller.latest_request:
+            raise AnalysisCancelled()
+
+    @pyqtSlot(int, object)
+    def compute(self, request_id, params):
+        """
+        Compute an analysis unless a newer request has already arrived.
+
+        Args:
+            request_id: Monotonic request number
+            params: Dictionary with diameter, v_min, v_max and num_points
+        """
+        try:
+            # Requests queued behind a newer one are dropped without computing
+            self._check_current(request_id)
+            # Backend (NumPy) is imported on first use, off the main thread
+            from src.backend.pump_system import PumpSystemAnalyzer
+            from src.backend.cache import cached_analysis
+            from src.backend import profiling
+            analyzer = PumpSystemAnalyzer(params['diameter'])
+            for name, value in params.get('overrides', {}).items():
+                setattr(analyzer, name, value)
+            # Profiling costs microseconds per analysis, so it is always on
+            # (a cache hit records no analyzer stages). A newer request stops
+            # the analysis at its next stage boundary.
+            checkpoint = functools.partial(self._check_current, request_id)
+            with profiling.collect() as profile:
+                if params.get('cache', True):
+                    analysis = cached_analysis(analyzer, params['v_min'], params['v_max'],
+                                               params.get('num_points', 500),
+                                               checkpoint=checkpoint)
+                else:
+                    analysis = analyzer.analyze_complete_system(
+                        params['v_min'], params['v_max'], params.get('num_points', 500),
+                        checkpoint=checkpoint)
+            self._check_current(request_id)
+            self.finished.emit(request_id, {'analyzer': analyzer, 'analysis': analysis,
+                                            'profile': profile,
+                                            'live': params.get('live', False)})
+        except AnalysisCancelled:
+            pass
+        except Exception as e:
+            self.failed.emit(request_id, str(e))
+
+
+class AnalysisController(QObject):
+    """
+    Front-end to the analysis thread.
+
+    Every submit() supersedes all earlier requests: stale requests are
+    skipped by the worker and stale results are never delivered. A running
+    analysis is cooperative: a newer submit() or cancel() stops it at its
+    next stage boundary (after the curves or the operating point), so at
+    most one stage of superseded work still runs. Results carry the
+    profiling.Profile of the worker's stages.
+    """
+
+    result_ready = pyqtSignal(object)
+    error = pyqtSignal(str)
+    busy_changed = pyqtSignal(bool)
+    _requested = pyqtSignal(int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ids = itertools.count(1)
+        self.latest_request = 0
+        self._thread = QThread()
+        self._worker = AnalysisWorker(self)
+        self._worker.moveToThread(self._thread)
+        self._requested.connect(self._worker.compute)
+        self._worker.finished.connect(self._on_finished)
+        self._worker.failed.connect(self._on_failed)
+        self._thread.start()
+
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def submit(self, params):
+        """
+        Queue an analysis, superseding any pending or running request.
+
+        Args:
+            params: Dictionary with diameter, v_min, v_max and optional
+                num_points, overrides (analyzer attribute values), cache
+                (False skips the analysis cache, e.g. for the throwaway
+                frames of a slider drag) and live (passed through to the
+                result)
+        """
+        request_id = next(self._ids)
+        self.latest_request = request_id
+        self.busy_changed.emit(True)
+        self._requested.emit(request_id, params)
+
+    def cancel(self):
+        """Discard every outstanding request and stop the running one at its next stage"""
+        self.latest_request = next(self._ids)
+        self.busy_changed.emit(False)
+
+    def _on_finished(self, request_id, result):
+        if request_id != self.latest_request:
+            return
+        self.busy_changed.emit(False)
+        self.result_ready.emit(result)
+
+    def _on_failed(self, request_id, message):
+        if request_id != self.latest_request:
+            return
+        self.busy_changed.emit(False)
+        self.error.emit(message)
+
+    def shutdown(self):
+        """Stop the worker thread (safe to call more than once)"""
+        if not self._thread.isRunning():
+            return
+        self.cancel()
+        self._thread.quit()
+        self._thread.wait()
@@ -7,114 +7,38 @@ import sys
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
-    QGroupBox, QSplitter, QTabWidget, QMessageBox, QFrame
+    QGroupBox, QSplitter, QTabWidget, QMessageBox, QFrame, QProgressBar,
+    QScrollArea
 )
 from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont, QPalette, QColor, QIcon
-import matplotlib
-matplotlib.use('QtAgg')
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-from matplotlib.figure import Figure
-import numpy as np
 
-# Import backend
+# Import application modules (Matplotlib, NumPy and the backend are loaded
+# lazily so the window can be shown before they finish importing)
 import sys
 import os
+import time
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from src.backend.pump_system import PumpSystemAnalyzer
+from src.frontend.analysis_worker import AnalysisController
+from src.frontend.parameter_controls import LABEL_WIDTH, MODEL_PARAMETERS, ParameterSlider
+from src.backend import profiling
+from src import startup_timing
 
 
-class MatplotlibCanvas(FigureCanvas):
-    """Custom Matplotlib canvas for PyQt6 integration"""
-    
-    def __init__(self, parent=None, width=8, height=6, dpi=100):
-        self.fig = Figure(figsize=(width, height), dpi=dpi)
-        super().__init__(self.fig)
-        self.setParent(parent)
-        
-        # Set figure background
-        self.fig.patch.set_facecolor('#2b2b2b')
-        
-    def plot_system_curves(self, curves_data, operating_point, plot_type='velocity'):
-        """
-        Plot system and pump curves.
-        
-        Args:
-            curves_data: Dictionary with curve arrays
-            operating_point: Operating point data
-            plot_type: 'velocity' or 'flowrate'
-        """
-        self.fig.clear()
-        ax = self.fig.add_subplot(111)
-        
-        # Set dark theme colors
-        ax.set_facecolor('#1e1e1e')
-        ax.tick_params(colors='white', which='both')
-        ax.spines['bottom'].set_color('white')
-        ax.spines['top'].set_color('white')
-        ax.spines['left'].set_color('white')
-        ax.spines['right'].set_color('white')
-        
-        if plot_type == 'velocity':
-            x_data = curves_data['velocities']
-            x_label = 'Velocidad (v) [m/s]'
-            x_op = operating_point['velocity']
-            annotation_text = f'v = {x_op:.4f} m/s\nh = {operating_point["head"]:.4f} m'
-            annotation_pos = (x_op + 0.15, operating_point["head"] + 2)
-        else:  # flowrate
-            x_data = curves_data['flow_rates']
-            x_label = 'Caudal (Q) [m³/s]'
-            x_op = operating_point['flow_rate_m3s']
-            annotation_text = f'Q = {x_op:.6f} m³/s\n({operating_point["flow_rate_ls"]:.4f} L/s)\nh = {operating_point["head"]:.4f} m'
-            annotation_pos = (x_op + 0.00005, operating_point["head"] + 2)
-        
-        # Plot curves
-        ax.plot(x_data, curves_data['system_head'], linewidth=2.5, 
-                label='ha (System Required Curve)', color='#3498db')
-        ax.plot(x_data, curves_data['pump_head'], linewidth=2.5, 
-                label='Ha (Pump Available Head)', color='#e74c3c')
-        
-        # Plot operating point
-        if operating_point['success']:
-            ax.plot(x_op, operating_point["head"], 'o', markersize=12, 
-                   color='#2ecc71', markeredgecolor='white', markeredgewidth=2,
-                   label='Operating Point', zorder=5)
-            
-            # Add crosshairs
-            ax.axvline(x=x_op, color='#2ecc71', linestyle='--', alpha=0.5, linewidth=1.5)
-            ax.axhline(y=operating_point["head"], color='#2ecc71', linestyle='--', 
-                      alpha=0.5, linewidth=1.5)
-            
-            # Annotation
-            ax.annotate(annotation_text,
-                       xy=(x_op, operating_point["head"]),
-                       xytext=annotation_pos,
-                       fontsize=9,
-                       color='black',
-                       bbox=dict(boxstyle='round,pad=0.5', facecolor='#f39c12', 
-                                alpha=0.9, edgecolor='white', linewidth=2),
-                       arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0.2',
-                                     color='white', lw=2))
-        
-        # Labels and title
-        ax.set_xlabel(x_label, fontsize=12, color='white', fontweight='bold')
-        ax.set_ylabel('Altura (h) [m]', fontsize=12, color='white', fontweight='bold')
-        
-        title = 'Ha y ha vs Velocidad' if plot_type == 'velocity' else 'Ha y ha vs Caudal'
-        ax.set_title(title, fontsize=14, color='white', fontweight='bold', pad=20)
-        
-        # Legend
-        legend = ax.legend(fontsize=10, loc='best', facecolor='#2b2b2b', 
-                          edgecolor='white', framealpha=0.9)
-        for text in legend.get_texts():
-            text.set_color('white')
-        
-        # Grid
-        ax.grid(True, alpha=0.2, color='white', linestyle='--')
-        
-        self.fig.tight_layout()
-        self.draw()
+def __getattr__(name):
+    """Lazily expose MatplotlibCanvas, which now lives in plot_canvas"""
+    if name == 'MatplotlibCanvas':
+        from src.frontend.plot_canvas import MatplotlibCanvas
+        return MatplotlibCanvas
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Slider drags: coarse analyses at most once per LIVE_INTERVAL_MS (~60 fps),
+# then one fine analysis once the value has rested for SETTLE_MS
+LIVE_INTERVAL_MS = 16
+SETTLE_MS = 150
+COARSE_POINTS = 100
+FINE_POINTS = 500
 
 
 class PumpSystemWindow(QMainWindow):
@@ -122,11 +46,32 @@ class PumpSystemWindow(QMainWindow):
     
     def __init__(self):
         super().__init__()
-        self.analyzer = PumpSystemAnalyzer()
+        self.analyzer = None
+        self.velocity_canvas = None
+        self.flowrate_canvas = None
+        self._pending_analysis = None
+        self.analysis_controller = AnalysisController(self)
+        self.analysis_controller.result_ready.connect(self.on_analysis_ready)
+        self.analysis_controller.error.connect(self.on_analysis_error)
+        self.analysis_controller.busy_changed.connect(self.set_busy)
+        
+        # Throttle for live frames and debounce for the fine pass of a drag
+        self.live_timer = QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.timeout.connect(lambda: self.calculate_and_update(live=True))
+        self._last_live = 0.0
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(SETTLE_MS)
+        self.settle_timer.timeout.connect(self.calculate_and_update)
+        
         self.setup_ui()
         self.apply_dark_theme()
         self.calculate_and_update()
         
+        # Plotting stack is imported once the event loop has shown the window
+        QTimer.singleShot(0, self.initialize_plots)
+        
     def setup_ui(self):
         """Initialize the user interface"""
         self.setWindowTitle("🌊 Pump System Analysis - Fluid Mechanics Suite")
@@ -142,8 +87,11 @@ class PumpSystemWindow(QMainWindow):
         # Create splitter for resizable panels
         splitter = QSplitter(Qt.Orientation.Horizontal)
         
-        # Left panel - Controls and Results
-        left_panel = self.create_left_panel()
+        # Left panel - Controls and Results (scrolls on short screens)
+        left_panel = QScrollArea()
+        left_panel.setWidget(self.create_left_panel())
+        left_panel.setWidgetResizable(True)
+        left_panel.setFrameShape(QFrame.Shape.NoFrame)
         splitter.addWidget(left_panel)
         
         # Right panel - Visualizations
@@ -155,9 +103,21 @@ class PumpSystemWindow(QMainWindow):
         
         main_layout.addWidget(splitter)
         
+        # Status bar with busy indicator
+        self.busy_indicator = QProgressBar()
+        self.busy_indicator.setRange(0, 0)
+        self.busy_indicator.setMaximumWidth(150)
+        self.busy_indicator.setVisible(False)
+        self.statusBar().addPermanentWidget(self.busy_indicator)
+        
+        # Per-stage timings of the last update (full table in the tooltip)
+        self.timing_label = QLabel()
+        self.statusBar().addPermanentWidget(self.timing_label)
+        
     def create_left_panel(self):
         """Create left control panel"""
         panel = QWidget()
+        panel.setObjectName("controlPanel")
         layout = QVBoxLayout(panel)
         layout.setSpacing(15)
         
@@ -196,22 +156,21 @@ class PumpSystemWindow(QMainWindow):
         group = QGroupBox("📊 Input Parameters")
         group.setFont(QFont("Arial", 11, QFont.Weight.Bold))
         layout = QVBoxLayout()
-        layout.setSpacing(10)
-        
-        # Diameter input
-        diameter_layout = QHBoxLayout()
-        diameter_label = QLabel("Pipe Diameter (m):")
-        diameter_label.setMinimumWidth(150)
-        self.diameter_input = QLineEdit("0.0203")
-        self.diameter_input.setFont(QFont("Arial", 10))
-        diameter_layout.addWidget(diameter_label)
-        diameter_layout.addWidget(self.diameter_input)
-        layout.addLayout(diameter_layout)
+        layout.setSpacing(6)
+        
+        # One slider per model parameter; dragging updates the plots live
+        self.parameter_sliders = {}
+        for spec in MODEL_PARAMETERS:
+            slider = ParameterSlider(spec)
+            slider.value_changed.connect(self.on_parameter_changed)
+            slider.value_committed.connect(self.on_parameter_committed)
+            self.parameter_sliders[spec.name] = slider
+            layout.addWidget(slider)
         
         # Velocity range
         v_min_layout = QHBoxLayout()
         v_min_label = QLabel("Min Velocity (m/s):")
-        v_min_label.setMinimumWidth(150)
+        v_min_label.setFixedWidth(LABEL_WIDTH)
         self.v_min_input = QLineEdit("0.1")
         self.v_min_input.setFont(QFont("Arial", 10))
         v_min_layout.addWidget(v_min_label)
@@ -220,7 +179,7 @@ class PumpSystemWindow(QMainWindow):
         
         v_max_layout = QHBoxLayout()
         v_max_label = QLabel("Max Velocity (m/s):")
-        v_max_label.setMinimumWidth(150)
+        v_max_label.setFixedWidth(LABEL_WIDTH)
         self.v_max_input = QLineEdit("2.0")
         self.v_max_input.setFont(QFont("Arial", 10))
         v_max_layout.addWidget(v_max_label)
@@ -242,6 +201,7 @@ class PumpSystemWindow(QMainWindow):
         self.results_table.horizontalHeader().setStretchLastSection(True)
         self.results_table.setFont(QFont("Consolas", 9))
         self.results_table.setAlternatingRowColors(True)
+        self.results_table.setMinimumHeight(280)
         
         layout.addWidget(self.results_table)
         group.setLayout(layout)
@@ -260,6 +220,7 @@ class PumpSystemWindow(QMainWindow):
         self.system_table.horizontalHeader().setStretchLastSection(True)
         self.system_table.setFont(QFont("Consolas", 9))
         self.system_table.setAlternatingRowColors(True)
+        self.system_table.setMinimumHeight(190)
         
         layout.addWidget(self.system_table)
         group.setLayout(layout)
@@ -281,74 +242,184 @@ class PumpSystemWindow(QMainWindow):
         self.tab_widget = QTabWidget()
         self.tab_widget.setFont(QFont("Arial", 10))
         
-        # Velocity plot tab
-        velocity_tab = QWidget()
-        velocity_layout = QVBoxLayout(velocity_tab)
-        self.velocity_canvas = MatplotlibCanvas(self, width=8, height=6, dpi=100)
-        velocity_toolbar = NavigationToolbar(self.velocity_canvas, self)
-        velocity_layout.addWidget(velocity_toolbar)
-        velocity_layout.addWidget(self.velocity_canvas)
-        self.tab_widget.addTab(velocity_tab, "📉 Head vs Velocity")
-        
-        # Flow rate plot tab
-        flowrate_tab = QWidget()
-        flowrate_layout = QVBoxLayout(flowrate_tab)
-        self.flowrate_canvas = MatplotlibCanvas(self, width=8, height=6, dpi=100)
-        flowrate_toolbar = NavigationToolbar(self.flowrate_canvas, self)
-        flowrate_layout.addWidget(flowrate_toolbar)
-        flowrate_layout.addWidget(self.flowrate_canvas)
-        self.tab_widget.addTab(flowrate_tab, "📉 Head vs Flow Rate")
+        # Plot tabs show a placeholder until initialize_plots() runs
+        self.velocity_tab_layout = self.create_plot_tab("📉 Head vs Velocity")
+        self.flowrate_tab_layout = self.create_plot_tab("📉 Head vs Flow Rate")
+        
+        self.tab_widget.currentChanged.connect(self.flush_visible_canvas)
         
         layout.addWidget(self.tab_widget)
         
         return panel
     
-    def calculate_and_update(self):
-        """Calculate system and update all displays"""
+    def create_plot_tab(self, title):
+        """Create a plot tab holding a loading placeholder"""
+        tab = QWidget()
+        tab_layout = QVBoxLayout(tab)
+        placeholder = QLabel("⏳ Loading plotting engine...")
+        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        placeholder.setFont(QFont("Arial", 12))
+        tab_layout.addWidget(placeholder)
+        self.tab_widget.addTab(tab, title)
+        return tab_layout
+    
+    def initialize_plots(self):
+        """Import Matplotlib and replace the placeholders with canvases"""
+        if self.velocity_canvas is not None:
+            return
+        from src.frontend.plot_canvas import MatplotlibCanvas, NavigationToolbar
+        
+        canvases = []
+        for tab_layout in (self.velocity_tab_layout, self.flowrate_tab_layout):
+            placeholder = tab_layout.takeAt(0).widget()
+            placeholder.deleteLater()
+            canvas = MatplotlibCanvas(self, width=8, height=6, dpi=100)
+            toolbar = NavigationToolbar(canvas, self)
+            tab_layout.addWidget(toolbar)
+            tab_layout.addWidget(canvas)
+            canvases.append(canvas)
+        self.velocity_canvas, self.flowrate_canvas = canvases
+        startup_timing.mark('plots ready')
+        
+        if self._pending_analysis is not None:
+            analysis, self._pending_analysis = self._pending_analysis, None
+            self.update_plots(analysis)
+    
+    def calculate_and_update(self, live=False):
+        """
+        Read inputs and queue an analysis on the worker thread.
+        
+        Args:
+            live: Coarse, uncached frame of a slider drag
+        """
+        if not live:
+            self.live_timer.stop()
+            self.settle_timer.stop()
         try:
             # Get input values
-            diameter = float(self.diameter_input.text())
             v_min = float(self.v_min_input.text())
             v_max = float(self.v_max_input.text())
+        except ValueError as e:
+            if not live:
+                QMessageBox.warning(self, "Input Error", 
+                                  f"Please enter valid numeric values.\n{str(e)}")
+            return
+        
+        values = {name: slider.value() for name, slider in self.parameter_sliders.items()}
+        if live:
+            self._last_live = time.perf_counter()
+        
+        # Superseded requests are dropped; only the newest result is applied
+        self.analysis_controller.submit({
+            'diameter': values.pop('diameter'),
+            'overrides': values,
+            'v_min': v_min,
+            'v_max': v_max,
+            'num_points': COARSE_POINTS if live else FINE_POINTS,
+            'cache': not live,
+            'live': live
+        })
+    
+    def on_parameter_changed(self, name, value):
+        """Schedule a live frame and (re)start the settle debounce"""
+        if not self.live_timer.isActive():
+            # Frames are spaced from the previous one, not from this change
+            elapsed_ms = (time.perf_counter() - self._last_live) * 1000
+            self.live_timer.start(max(0, int(LIVE_INTERVAL_MS - elapsed_ms)))
+        self.settle_timer.start()
+    
+    def on_parameter_committed(self, name, value):
+        """Run the fine analysis as soon as a drag or edit ends"""
+        self.calculate_and_update()
+    
+    def on_analysis_ready(self, result):
+        """Apply a finished analysis to all displays"""
+        try:
+            self.analyzer = result['analyzer']
+            analysis = result['analysis']
+            profile = result['profile']
+            live = result.get('live', False)
             
-            # Update analyzer
-            self.analyzer = PumpSystemAnalyzer(diameter)
-            
-            # Perform analysis
-            analysis = self.analyzer.analyze_complete_system(v_min, v_max, 500)
-            
-            # Update results table
-            self.update_results_table(analysis['operating_point'])
-            
-            # Update system info table
-            self.update_system_table(analysis['system_info'])
-            
-            # Update plots
-            self.velocity_canvas.plot_system_curves(
-                analysis['curves'], 
-                analysis['operating_point'], 
-                'velocity'
-            )
-            
-            self.flowrate_canvas.plot_system_curves(
-                analysis['curves'], 
-                analysis['operating_point'], 
-                'flowrate'
-            )
+            with profiling.collect(profile):
+                with profiling.stage('tables'):
+                    # Update results table
+                    self.update_results_table(analysis['operating_point'])
+                    
+                    # Update system info table
+                    self.update_system_table(analysis['system_info'])
+                
+                # Update plots
+                if self.velocity_canvas is None:
+                    self._pending_analysis = analysis
+                else:
+                    with profiling.stage('render'):
+                        self.update_plots(analysis, live)
+            startup_timing.mark('first result')
+            # Full redraws are deferred to the event loop; report after them
+            QTimer.singleShot(0, lambda: self.show_timing(profile))
             
-        except ValueError as e:
-            QMessageBox.warning(self, "Input Error", 
-                              f"Please enter valid numeric values.\n{str(e)}")
         except Exception as e:
-            QMessageBox.critical(self, "Calculation Error", 
-                               f"An error occurred during calculation:\n{str(e)}")
+            self.on_analysis_error(str(e))
+    
+    def update_plots(self, analysis, live=False):
+        """Hand results to both canvases (hidden tab redraws when shown)"""
+        self.velocity_canvas.set_curves(
+            analysis['curves'], 
+            analysis['operating_point'], 
+            'velocity',
+            live
+        )
+        
+        self.flowrate_canvas.set_curves(
+            analysis['curves'], 
+            analysis['operating_point'], 
+            'flowrate',
+            live
+        )
+        self.flush_visible_canvas()
+    
+    def flush_visible_canvas(self, index=None):
+        """Render pending data on the canvas of the visible tab"""
+        index = self.tab_widget.currentIndex() if index is None else index
+        canvas = self.velocity_canvas if index == 0 else self.flowrate_canvas
+        if canvas is not None:
+            canvas.flush()
+    
+    def show_timing(self, profile):
+        """Show the stage timings of an update in the status bar"""
+        canvases = [canvas for canvas in (self.velocity_canvas, self.flowrate_canvas)
+                    if canvas is not None]
+        draw_seconds = sum(canvas.draw_seconds for canvas in canvases)
+        for canvas in canvases:
+            canvas.draw_seconds = 0.0
+        if draw_seconds:
+            profile.add('draw', draw_seconds)
+        self.timing_label.setText(profile.format_summary())
+        self.timing_label.setToolTip(profile.format_report())
+    
+    def on_analysis_error(self, message):
+        """Report a failed analysis"""
+        QMessageBox.critical(self, "Calculation Error", 
+                           f"An error occurred during calculation:\n{message}")
+    
+    def set_busy(self, busy):
+        """Show or hide the busy indicator"""
+        self.busy_indicator.setVisible(busy)
+        if busy:
+            self.statusBar().showMessage("Calculating...")
+        else:
+            self.statusBar().clearMessage()
+    
+    def closeEvent(self, event):
+        """Stop the worker thread before closing"""
+        self.analysis_controller.shutdown()
+        super().closeEvent(event)
     
     def update_results_table(self, operating_point):
         """Update results table with operating point data"""
         if not operating_point['success']:
-            self.results_table.setRowCount(1)
-            self.results_table.setItem(0, 0, QTableWidgetItem("Error"))
-            self.results_table.setItem(0, 1, QTableWidgetItem(operating_point.get('error', 'Unknown error')))
+            self.fill_table(self.results_table,
+                            [("Error", operating_point.get('error', 'Unknown error'))])
             return
         
         results = [
@@ -362,18 +433,7 @@ class PumpSystemWindow(QMainWindow):
             ("Head Difference", f"{operating_point['difference']:.6f} m"),
         ]
         
-        self.results_table.setRowCount(len(results))
-        
-        for i, (param, value) in enumerate(results):
-            param_item = QTableWidgetItem(param)
-            param_item.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-            value_item = QTableWidgetItem(value)
-            value_item.setFont(QFont("Consolas", 10))
-            
-            self.results_table.setItem(i, 0, param_item)
-            self.results_table.setItem(i, 1, value_item)
-        
-        self.results_table.resizeColumnsToContents()
+        self.fill_table(self.results_table, results)
     
     def update_system_table(self, system_info):
         """Update system information table"""
@@ -385,18 +445,32 @@ class PumpSystemWindow(QMainWindow):
             ("Roughness Factor", f"{system_info['roughness_factor']:.2f}"),
         ]
         
-        self.system_table.setRowCount(len(info))
+        self.fill_table(self.system_table, info)
+    
+    def fill_table(self, table, rows):
+        """
+        Show (name, value) rows in a two-column table.
         
-        for i, (prop, value) in enumerate(info):
-            prop_item = QTableWidgetItem(prop)
-            prop_item.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-            value_item = QTableWidgetItem(value)
-            value_item.setFont(QFont("Consolas", 10))
+        Items are created only when the row count changes; otherwise their
+        text is replaced in place, so tables can follow live updates.
+        """
+        if table.rowCount() != len(rows) or table.item(0, 0) is None:
+            table.setRowCount(len(rows))
+            for i, (name, value) in enumerate(rows):
+                name_item = QTableWidgetItem(name)
+                name_item.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+                value_item = QTableWidgetItem(value)
+                value_item.setFont(QFont("Consolas", 10))
+                
+                table.setItem(i, 0, name_item)
+                table.setItem(i, 1, value_item)
             
-            self.system_table.setItem(i, 0, prop_item)
-            self.system_table.setItem(i, 1, value_item)
+            table.resizeColumnsToContents()
+            return
         
-        self.system_table.resizeColumnsToContents()
+        for i, (name, value) in enumerate(rows):
+            table.item(i, 0).setText(name)
+            table.item(i, 1).setText(value)
     
     def apply_dark_theme(self):
         """Apply professional dark theme"""
@@ -425,6 +499,9 @@ class PumpSystemWindow(QMainWindow):
             QMainWindow {
                 background-color: #1e1e1e;
             }
+            QWidget#controlPanel {
+                background-color: #1e1e1e;
+            }
             QGroupBox {
                 border: 2px solid #3498db;
                 border-radius: 8px;
@@ -506,8 +583,11 @@ def main():
     
     window = PumpSystemWindow()
     window.show()
+    startup_timing.mark('window shown')
     
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    startup_timing.report()
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,141 @@
+"""
+Parameter Slider Controls
+Slider and value box for every PumpSystemAnalyzer model parameter
+
+Only Qt is imported here (no NumPy or backend), so the controls can be
+built before the analysis stack has loaded. Sliders map their integer
+positions linearly or logarithmically onto each parameter's range; the
+value box accepts any number, including values outside the slider range.
+"""
+
+import math
+from dataclasses import dataclass
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QLineEdit, QSlider
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont
+
+# Integer positions of every slider
+SLIDER_STEPS = 1000
+# Label column width, shared with other input rows so the controls line up
+LABEL_WIDTH = 215
+
+
+@dataclass(frozen=True)
+class ParameterSpec:
+    """Range and presentation of one analyzer parameter"""
+
+    name: str
+    label: str
+    default: float
+    minimum: float
+    maximum: float
+    log_scale: bool = False
+
+    def to_position(self, value: float) -> int:
+        """Slider position of a value (clamped to the range)"""
+        value = min(max(value, self.minimum), self.maximum)
+        if self.log_scale:
+            fraction = math.log(value / self.minimum) / math.log(self.maximum / self.minimum)
+        else:
+            fraction = (value - self.minimum) / (self.maximum - self.minimum)
+        return round(fraction * SLIDER_STEPS)
+
+    def from_position(self, position: int) -> float:
+        """Value at a slider position"""
+        fraction = position / SLIDER_STEPS
+        if self.log_scale:
+            return self.minimum * (self.maximum / self.minimum) ** fraction
+        return self.minimum + fraction * (self.maximum - self.minimum)
+
+
+# Model parameters of PumpSystemAnalyzer.__init__ with their defaults
+MODEL_PARAMETERS = (
+    ParameterSpec('diameter', "Pipe Diameter (m)", 0.0203, 0.005, 0.1, log_scale=True),
+    ParameterSpec('static_head', "Static Head (m)", 7.85, 0.0, 20.0),
+    ParameterSpec('loss_coefficient_1', "Friction Loss Coef. (L/D)", 8694.6, 500.0, 50000.0,
+                  log_scale=True),
+    ParameterSpec('loss_coefficient_2', "Minor Loss Coef. (ΣK)", 23.65, 0.0, 100.0),
+    ParameterSpec('roughness_factor', "Roughness Factor (D/ε)", 81.2, 10.0, 10000.0,
+                  log_scale=True),
+    ParameterSpec('reynolds_coefficient', "Reynolds Coef. (D/ν)", 22706.9, 1000.0, 500000.0,
+                  log_scale=True),
+    ParameterSpec('gravity_factor', "Gravity Factor (2g)", 19.62, 2.0, 30.0),
+    ParameterSpec('pump_max_head', "Pump Max Head (m)", 24.4, 5.0, 60.0),
+    ParameterSpec('pump_coefficient', "Pump Coefficient", 0.0678, 0.005, 0.5, log_scale=True),
+    ParameterSpec('pump_velocity_factor', "Pump Velocity Factor", 19.42, 1.0, 100.0,
+                  log_scale=True),
+)
+
+
+class ParameterSlider(QWidget):
+    """
+    Labeled slider with an editable value box for one parameter.
+
+    value_changed is emitted for every change (each slider step while
+    dragging); value_committed when an edit is finished (slider released,
+    or a value typed into the box), so listeners can follow a drag cheaply
+    and refine once it ends.
+    """
+
+    value_changed = pyqtSignal(str, float)
+    value_committed = pyqtSignal(str, float)
+
+    def __init__(self, spec: ParameterSpec, parent=None):
+        super().__init__(parent)
+        self.spec = spec
+        self._value = spec.default
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        label = QLabel(spec.label + ":")
+        label.setFixedWidth(LABEL_WIDTH)
+        self.slider = QSlider(Qt.Orientation.Horizontal)
+        self.slider.setRange(0, SLIDER_STEPS)
+        self.slider.setValue(spec.to_position(spec.default))
+        self.value_input = QLineEdit(self._format(spec.default))
+        self.value_input.setFont(QFont("Arial", 10))
+        self.value_input.setFixedWidth(80)
+        layout.addWidget(label)
+        layout.addWidget(self.slider, 1)
+        layout.addWidget(self.value_input)
+
+        self.slider.valueChanged.connect(self._on_slider_moved)
+        self.slider.sliderReleased.connect(self._commit)
+        self.value_input.editingFinished.connect(self._on_text_edited)
+
+    @staticmethod
+    def _format(value: float) -> str:
+        return f"{value:.5g}"
+
+    def value(self) -> float:
+        """Current parameter value"""
+        return self._value
+
+    def set_value(self, value: float) -> None:
+        """Set the value without emitting signals"""
+        self._value = float(value)
+        self.slider.blockSignals(True)
+        self.slider.setValue(self.spec.to_position(self._value))
+        self.slider.blockSignals(False)
+        self.value_input.setText(self._format(self._value))
+
+    def _on_slider_moved(self, position: int) -> None:
+        self._value = self.spec.from_position(position)
+        self.value_input.setText(self._format(self._value))
+        self.value_changed.emit(self.spec.name, self._value)
+
+    def _on_text_edited(self) -> None:
+        try:
+            value = float(self.value_input.text())
+        except ValueError:
+            self.value_input.setText(self._format(self._value))
+            return
+        if self._format(value) == self._format(self._value):
+            self.value_input.setText(self._format(self._value))
+            return
+        self.set_value(value)
+        self.value_changed.emit(self.spec.name, self._value)
+        self._commit()
+
+    def _commit(self) -> None:
+        self.value_committed.emit(self.spec.name, self._value)
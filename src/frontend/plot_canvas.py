@@ -0,0 +1,142 @@
+"""
+Matplotlib Canvas for Pump System Analysis Application
+Embedded, incrementally updated plots (imported lazily by the main window)
+"""
+
+import time
+import matplotlib
+matplotlib.use('QtAgg')
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.figure import Figure
+import numpy as np
+
+from src.frontend.plot_style import (FIGURE_COLOR, expand_limits, style_curve_axes,
+                                     update_curve_artists)
+
+
+class MatplotlibCanvas(FigureCanvas):
+    """
+    Custom Matplotlib canvas for PyQt6 integration.
+    
+    The axes and all artists are built once; later updates change artist
+    data in place. When the axis limits do not change, only the dynamic
+    artists are redrawn over a cached background (blitting).
+    
+    Live updates (e.g. while a slider is dragged) keep the blitting path
+    nearly every frame: limits only grow, with headroom, and the operating
+    point annotation, whose arrow costs most of a blit, is hidden until the
+    next regular update fits the limits to the data again.
+    """
+    
+    def __init__(self, parent=None, width=8, height=6, dpi=100):
+        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        super().__init__(self.fig)
+        self.setParent(parent)
+        
+        # Set figure background
+        self.fig.patch.set_facecolor(FIGURE_COLOR)
+        
+        self.ax = None
+        self.plot_type = None
+        self._artists = {}
+        self._background = None
+        self._pending = None
+        self.draw_seconds = 0.0  # time in full redraws, reset by the reader
+        self.mpl_connect('draw_event', self._on_draw)
+    
+    def _build_axes(self, plot_type):
+        """Create the axes and persistent artists for a plot type"""
+        self.fig.clear()
+        ax = self.fig.add_subplot(111)
+        self.ax = ax
+        self.plot_type = plot_type
+        
+        self._artists = style_curve_axes(ax, plot_type)
+        for artist in self._artists.values():
+            artist.set_animated(True)
+        
+        self.fig.tight_layout()
+        self._background = None
+    
+    def draw(self):
+        """Full redraw (timed; usually deferred by draw_idle)"""
+        started = time.perf_counter()
+        super().draw()
+        self.draw_seconds += time.perf_counter() - started
+    
+    def _on_draw(self, event):
+        """Cache the static background and paint dynamic artists after a full draw"""
+        if self.ax is None:
+            return
+        self._background = self.copy_from_bbox(self.fig.bbox)
+        self._draw_dynamic_artists()
+    
+    def _draw_dynamic_artists(self):
+        for artist in self._artists.values():
+            if artist.get_visible():
+                self.fig.draw_artist(artist)
+    
+    def print_figure(self, *args, **kwargs):
+        """Include the animated artists when saving the figure"""
+        for artist in self._artists.values():
+            artist.set_animated(False)
+        try:
+            return super().print_figure(*args, **kwargs)
+        finally:
+            for artist in self._artists.values():
+                artist.set_animated(True)
+    
+    def set_curves(self, curves_data, operating_point, plot_type='velocity', live=False):
+        """
+        Store data to plot on the next flush() (used for hidden tabs).
+        
+        Args:
+            curves_data: Dictionary with curve arrays
+            operating_point: Operating point data
+            plot_type: 'velocity' or 'flowrate'
+            live: Intermediate frame of a live update
+        """
+        self._pending = (curves_data, operating_point, plot_type, live)
+    
+    def flush(self):
+        """Render pending data, if any"""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self.plot_system_curves(*pending)
+    
+    def plot_system_curves(self, curves_data, operating_point, plot_type='velocity',
+                           live=False):
+        """
+        Plot system and pump curves.
+        
+        Args:
+            curves_data: Dictionary with curve arrays
+            operating_point: Operating point data
+            plot_type: 'velocity' or 'flowrate'
+            live: Intermediate frame of a live update (grow-only limits,
+                no annotation)
+        """
+        self._pending = None
+        if self.ax is None or plot_type != self.plot_type:
+            self._build_axes(plot_type)
+        xlim, ylim = update_curve_artists(self._artists, curves_data, operating_point,
+                                          plot_type)
+        if live:
+            self._artists['annotation'].set_visible(False)
+            if self._background is not None:
+                xlim = expand_limits(self.ax.get_xlim(), xlim)
+                ylim = expand_limits(self.ax.get_ylim(), ylim)
+        
+        if (self._background is not None and
+                np.allclose(self.ax.get_xlim(), xlim) and np.allclose(self.ax.get_ylim(), ylim)):
+            # Limits unchanged: blit dynamic artists over the cached background
+            self.restore_region(self._background)
+            self._draw_dynamic_artists()
+            self.blit(self.fig.bbox)
+        else:
+            self.ax.set_xlim(*xlim)
+            self.ax.set_ylim(*ylim)
+            # Frames until the deferred redraw must not blit the old limits' background
+            self._background = None
+            self.draw_idle()
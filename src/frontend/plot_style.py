@@ -0,0 +1,164 @@
+"""
+Curve Plot Styling
+Dark-theme head curve axes shared by the Qt canvas and headless reports
+
+Only Matplotlib artists are created here (no backend or Qt import), so the
+same styled axes can live on a QtAgg canvas or on an Agg figure.
+"""
+
+import numpy as np
+from typing import Dict, Tuple
+
+FIGURE_COLOR = '#2b2b2b'
+AXES_COLOR = '#1e1e1e'
+
+
+def style_curve_axes(ax, plot_type: str) -> Dict[str, object]:
+    """
+    Style an axes and create the persistent artists of a curve plot.
+
+    Args:
+        ax: Matplotlib axes
+        plot_type: 'velocity' or 'flowrate'
+
+    Returns:
+        Dictionary of artists: system, pump, marker, vline, hline, annotation
+    """
+    # Set dark theme colors
+    ax.set_facecolor(AXES_COLOR)
+    ax.tick_params(colors='white', which='both')
+    for spine in ax.spines.values():
+        spine.set_color('white')
+
+    # Curves
+    system_line, = ax.plot([], [], linewidth=2.5,
+                           label='ha (System Required Curve)', color='#3498db')
+    pump_line, = ax.plot([], [], linewidth=2.5,
+                         label='Ha (Pump Available Head)', color='#e74c3c')
+
+    # Operating point
+    marker, = ax.plot([], [], 'o', markersize=12,
+                      color='#2ecc71', markeredgecolor='white', markeredgewidth=2,
+                      label='Operating Point', zorder=5)
+
+    # Crosshairs
+    vline = ax.axvline(x=0, color='#2ecc71', linestyle='--', alpha=0.5, linewidth=1.5)
+    hline = ax.axhline(y=0, color='#2ecc71', linestyle='--', alpha=0.5, linewidth=1.5)
+
+    # Annotation
+    annotation = ax.annotate('',
+                             xy=(0, 0),
+                             xytext=(0, 0),
+                             fontsize=9,
+                             color='black',
+                             bbox=dict(boxstyle='round,pad=0.5', facecolor='#f39c12',
+                                       alpha=0.9, edgecolor='white', linewidth=2),
+                             arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0.2',
+                                             color='white', lw=2))
+
+    # Labels and title
+    x_label = 'Velocidad (v) [m/s]' if plot_type == 'velocity' else 'Caudal (Q) [m³/s]'
+    ax.set_xlabel(x_label, fontsize=12, color='white', fontweight='bold')
+    ax.set_ylabel('Altura (h) [m]', fontsize=12, color='white', fontweight='bold')
+
+    title = 'Ha y ha vs Velocidad' if plot_type == 'velocity' else 'Ha y ha vs Caudal'
+    ax.set_title(title, fontsize=14, color='white', fontweight='bold', pad=20)
+
+    # Legend
+    legend = ax.legend(fontsize=10, loc='upper right', facecolor=FIGURE_COLOR,
+                       edgecolor='white', framealpha=0.9)
+    for text in legend.get_texts():
+        text.set_color('white')
+
+    # Grid
+    ax.grid(True, alpha=0.2, color='white', linestyle='--')
+
+    return {
+        'system': system_line,
+        'pump': pump_line,
+        'marker': marker,
+        'vline': vline,
+        'hline': hline,
+        'annotation': annotation
+    }
+
+
+def update_curve_artists(artists: Dict[str, object], curves_data: Dict[str, np.ndarray],
+                         operating_point: Dict, plot_type: str
+                         ) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """
+    Put new curves and an operating point into the artists of a curve plot.
+
+    Args:
+        artists: Output of style_curve_axes
+        curves_data: Dictionary with curve arrays
+        operating_point: Operating point data
+        plot_type: 'velocity' or 'flowrate'
+
+    Returns:
+        (xlim, ylim) fitting the data with the default 5% margins
+    """
+    if plot_type == 'velocity':
+        x_data = curves_data['velocities']
+    else:  # flowrate
+        x_data = curves_data['flow_rates']
+
+    # Update curves
+    artists['system'].set_data(x_data, curves_data['system_head'])
+    artists['pump'].set_data(x_data, curves_data['pump_head'])
+
+    y_values = [np.min(curves_data['system_head']), np.max(curves_data['system_head']),
+                np.min(curves_data['pump_head']), np.max(curves_data['pump_head'])]
+
+    # Update operating point
+    success = operating_point['success']
+    for name in ('marker', 'vline', 'hline', 'annotation'):
+        artists[name].set_visible(success)
+    if success:
+        head = operating_point["head"]
+        if plot_type == 'velocity':
+            x_op = operating_point['velocity']
+            annotation_text = f'v = {x_op:.4f} m/s\nh = {head:.4f} m'
+            annotation_pos = (x_op + 0.15, head + 2)
+        else:
+            x_op = operating_point['flow_rate_m3s']
+            annotation_text = f'Q = {x_op:.6f} m³/s\n({operating_point["flow_rate_ls"]:.4f} L/s)\nh = {head:.4f} m'
+            annotation_pos = (x_op + 0.00005, head + 2)
+        artists['marker'].set_data([x_op], [head])
+        artists['vline'].set_xdata([x_op, x_op])
+        artists['hline'].set_ydata([head, head])
+        artists['annotation'].set_text(annotation_text)
+        artists['annotation'].xy = (x_op, head)
+        artists['annotation'].set_position(annotation_pos)
+        y_values.append(head)
+
+    # Axis limits with the default 5% margins
+    x_lo, x_hi = float(np.min(x_data)), float(np.max(x_data))
+    y_lo, y_hi = float(min(y_values)), float(max(y_values))
+    x_pad = 0.05 * (x_hi - x_lo) or 0.5
+    y_pad = 0.05 * (y_hi - y_lo) or 0.5
+    return (x_lo - x_pad, x_hi + x_pad), (y_lo - y_pad, y_hi + y_pad)
+
+
+def expand_limits(current: Tuple[float, float], fitted: Tuple[float, float],
+                  headroom: float = 0.25) -> Tuple[float, float]:
+    """
+    Axis limits that only grow, for live updates.
+
+    Args:
+        current: Current (low, high) limits
+        fitted: Limits fitting the new data
+        headroom: Extra fraction of the span added on a side that grows,
+            so a steadily moving curve does not grow the limits every frame
+
+    Returns:
+        current when it already contains fitted, otherwise their union
+        widened by headroom on the growing sides
+    """
+    low, high = current
+    span = max(high, fitted[1]) - min(low, fitted[0])
+    if fitted[0] < low:
+        low = fitted[0] - headroom * span
+    if fitted[1] > high:
+        high = fitted[1] + headroom * span
+    return low, high
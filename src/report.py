@@ -0,0 +1,393 @@
+"""
+Report Rendering Module
+Headless head-velocity / head-flow figures for every case of a sweep
+
+Each case gets the dark-theme figure of the GUI (both plots side by side),
+rendered with the Agg backend (no display or Qt needed) to PNG, SVG or PDF
+files and optionally to one multi-page PDF.
+
+Every worker process builds one template figure and only updates artist
+data per case. With shared axis limits (the default) the static part of the
+figure - axes, ticks, labels, legend - is identical for all cases, so raster
+figures are produced by restoring a cached background and drawing only the
+curves and the operating point on top, followed by a fast PNG encode.
+Vector outputs and per-case limits need a full draw per figure.
+
+The defaults (72 dpi, no annotation boxes) are the fast path: about 100
+PNG figures per second per core for the 1008x432 pixel figure, of which
+the zlib deflate of the PNG takes about half. The request's target of
+hundreds per core is only reached for smaller images (about 150/s at
+dpi=50); the GUI look (dpi=100, annotations=True) renders about 25/s.
+
+Usage:
+    from src.report import render_reports
+    from src.backend.sweep import cartesian_design
+
+    design = cartesian_design({'diameter': np.linspace(0.015, 0.04, 40),
+                               'static_head': np.linspace(2, 15, 25)})
+    render_reports(design, 'figures', formats=('png',), pdf_path='report.pdf')
+"""
+
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .backend.pump_system import PumpSystemAnalyzer
+from .backend.batch_solver import BATCH_PARAMETERS, broadcast_analyzer, solve_analyzer_batch
+from .frontend.plot_style import FIGURE_COLOR, style_curve_axes, update_curve_artists
+
+RASTER_FORMATS = ('png', 'jpg', 'jpeg', 'webp', 'tif', 'tiff')
+PLOT_TYPES = ('velocity', 'flowrate')
+
+# Limits per plot type: {'velocity': (xlim, ylim), 'flowrate': (xlim, ylim)}
+Limits = Dict[str, Tuple[Tuple[float, float], Tuple[float, float]]]
+
+
+def case_data(base: Optional[PumpSystemAnalyzer], parameters: Dict[str, np.ndarray],
+              velocities: np.ndarray) -> Iterator[Tuple[Dict[str, np.ndarray], Dict]]:
+    """
+    Compute the curves and operating point of a chunk of cases at once.
+
+    Args:
+        base: Analyzer providing the parameters not in the chunk
+        parameters: Equal-length parameter columns, one case per row
+        velocities: Velocity grid of the curves in m/s
+
+    Yields:
+        (curves_data, operating_point) per case, shaped like the output of
+        generate_curves and find_operating_point
+    """
+    rows = broadcast_analyzer(base, **{name: np.asarray(column, dtype=float)[:, None]
+                                       for name, column in parameters.items()})
+    shape = (np.shape(rows.diameter)[0], velocities.size)
+    system = np.broadcast_to(rows.calculate_system_head(velocities), shape)
+    pump = np.broadcast_to(rows.calculate_pump_head(velocities), shape)
+    area = np.broadcast_to(rows.area, (shape[0], 1))[:, 0]
+
+    solution = solve_analyzer_batch(broadcast_analyzer(base, **parameters))
+    for k in range(shape[0]):
+        curves = {
+            'velocities': velocities,
+            'flow_rates': velocities * area[k],
+            'system_head': system[k],
+            'pump_head': pump[k]
+        }
+        success = bool(solution['converged'][k])
+        point = {'success': success}
+        if success:
+            point.update(velocity=float(solution['velocity'][k]),
+                         head=float(solution['head'][k]),
+                         flow_rate_m3s=float(solution['flow_rate_m3s'][k]),
+                         flow_rate_ls=float(solution['flow_rate_m3s'][k]) * 1000)
+        yield curves, point
+
+
+def shared_limits(design: Dict[str, np.ndarray], base: Optional[PumpSystemAnalyzer] = None,
+                  v_min: float = 0.1, v_max: float = 2.0, num_points: int = 200,
+                  chunk_size: int = 2000) -> Limits:
+    """
+    Axis limits that fit every case of a design (with 5% margins).
+
+    Returns:
+        Limits keyed by plot type
+    """
+    velocities = np.linspace(v_min, v_max, num_points)
+    total = len(next(iter(design.values())))
+    y_lo, y_hi = np.inf, -np.inf
+    flow_lo, flow_hi = np.inf, -np.inf
+    for start in range(0, total, chunk_size):
+        parameters = {name: column[start:start + chunk_size] for name, column in design.items()}
+        for curves, point in case_data(base, parameters, velocities):
+            heads = [curves['system_head'].min(), curves['system_head'].max(),
+                     curves['pump_head'].min(), curves['pump_head'].max()]
+            if point['success']:
+                heads.append(point['head'])
+            y_lo, y_hi = min(y_lo, *heads), max(y_hi, *heads)
+            flow_lo = min(flow_lo, curves['flow_rates'][0])
+            flow_hi = max(flow_hi, curves['flow_rates'][-1])
+
+    def padded(low, high):
+        pad = 0.05 * (high - low) or 0.5
+        return (float(low - pad), float(high + pad))
+
+    ylim = padded(y_lo, y_hi)
+    return {'velocity': (padded(v_min, v_max), ylim),
+            'flowrate': (padded(flow_lo, flow_hi), ylim)}
+
+
+def encode_png(rgba: np.ndarray, compress_level: int = 1) -> bytes:
+    """
+    Encode an RGBA pixel buffer as an RGB PNG.
+
+    Rows are stored unfiltered and deflated once at a low level, which is
+    several times faster than the adaptive filtering of general-purpose
+    encoders and compresses flat plot images nearly as well.
+
+    Args:
+        rgba: Array of shape (height, width, 4), uint8
+        compress_level: zlib level (0-9)
+
+    Returns:
+        PNG file contents
+    """
+    height, width, _ = rgba.shape
+    rows = np.empty((height, 1 + 3 * width), dtype=np.uint8)
+    rows[:, 0] = 0
+    # One strided copy per channel is several times faster than one 3-D copy
+    for channel in range(3):
+        rows[:, 1 + channel::3] = rgba[:, :, channel]
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + \
+            struct.pack('>I', zlib.crc32(tag + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + \
+        chunk(b'IDAT', zlib.compress(rows, compress_level)) + chunk(b'IEND', b'')
+
+
+class ReportTemplate:
+    """
+    Reusable Agg figure with the velocity and flow-rate plots side by side.
+    """
+
+    def __init__(self, width: float = 14, height: float = 6, dpi: int = 72,
+                 limits: Optional[Limits] = None, annotations: bool = False):
+        """
+        Args:
+            width: Figure width in inches
+            height: Figure height in inches
+            dpi: Raster resolution
+            limits: Fixed axis limits for every case (None fits each case)
+            annotations: Draw the operating point annotation boxes (their text
+                layout and arrow clipping cost more than the rest of a
+                blitted figure; the marker and crosshairs remain without them)
+        """
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.figure = Figure(figsize=(width, height), dpi=dpi, facecolor=FIGURE_COLOR)
+        self.canvas = FigureCanvasAgg(self.figure)
+        axes = self.figure.subplots(1, 2)
+        self.panels = [(ax, plot_type, style_curve_axes(ax, plot_type))
+                       for ax, plot_type in zip(axes, PLOT_TYPES)]
+        self.limits = limits
+        self.annotations = annotations
+        if limits is not None:
+            for ax, plot_type, _ in self.panels:
+                ax.set_xlim(*limits[plot_type][0])
+                ax.set_ylim(*limits[plot_type][1])
+        self.figure.tight_layout()
+        self._background = None
+
+    def _artists(self):
+        for _, _, artists in self.panels:
+            yield from artists.values()
+
+    def update(self, curves_data: Dict[str, np.ndarray], operating_point: Dict) -> None:
+        """Put one case into the figure (limits follow the case unless fixed)"""
+        for ax, plot_type, artists in self.panels:
+            xlim, ylim = update_curve_artists(artists, curves_data, operating_point, plot_type)
+            if not self.annotations:
+                artists['annotation'].set_visible(False)
+            if self.limits is None and (not np.allclose(ax.get_xlim(), xlim) or
+                                        not np.allclose(ax.get_ylim(), ylim)):
+                ax.set_xlim(*xlim)
+                ax.set_ylim(*ylim)
+                self._background = None
+
+    def render_raster(self, path: str, image_format: str = 'png', compress_level: int = 1) -> None:
+        """
+        Write the current case as a raster image.
+
+        The static background is drawn once and reused while the limits do
+        not change; only the dynamic artists are drawn per call.
+        """
+        if self._background is None:
+            for artist in self._artists():
+                artist.set_animated(True)
+            self.canvas.draw()
+            self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        else:
+            self.canvas.restore_region(self._background)
+        renderer = self.canvas.get_renderer()
+        for artist in self._artists():
+            if artist.get_visible():
+                artist.draw(renderer)
+
+        if image_format == 'png':
+            with open(path, 'wb') as handle:
+                handle.write(encode_png(np.asarray(self.canvas.buffer_rgba()), compress_level))
+        else:
+            from PIL import Image
+            image = Image.frombuffer('RGBA', self.canvas.get_width_height(),
+                                     self.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+            image.convert('RGB').save(path, format=Image.registered_extensions().get(
+                '.' + image_format, image_format.upper()))
+
+    def render_vector(self, target, image_format: Optional[str] = None) -> None:
+        """Write the current case with a full draw (SVG/PDF files or a PdfPages page)"""
+        for artist in self._artists():
+            artist.set_animated(False)
+        if hasattr(target, 'savefig'):
+            target.savefig(self.figure, facecolor=FIGURE_COLOR)
+        else:
+            self.figure.savefig(target, format=image_format, facecolor=FIGURE_COLOR)
+
+
+# Template of the current worker process, rebuilt only when the settings change
+_template: Optional[ReportTemplate] = None
+_template_settings: Optional[tuple] = None
+
+
+def _worker_template(settings: tuple) -> ReportTemplate:
+    global _template, _template_settings
+    if _template is None or settings != _template_settings:
+        _template = ReportTemplate(*settings)
+        _template_settings = settings
+    return _template
+
+
+def _render_chunk(start: int, parameters: Dict[str, np.ndarray],
+                  base: Optional[PumpSystemAnalyzer], output_dir: str,
+                  formats: Sequence[str], name_pattern: str, velocities: np.ndarray,
+                  settings: tuple) -> int:
+    """Render the figure files of one chunk (runs inside a worker process)"""
+    template = _worker_template(settings)
+    written = 0
+    for offset, (curves, point) in enumerate(case_data(base, parameters, velocities)):
+        template.update(curves, point)
+        name = name_pattern.format(index=start + offset)
+        for image_format in formats:
+            path = os.path.join(output_dir, f"{name}.{image_format}")
+            if image_format in RASTER_FORMATS:
+                template.render_raster(path, image_format)
+            else:
+                template.render_vector(path, image_format)
+            written += 1
+    return written
+
+
+def _render_pdf(pdf_path: str, design: Dict[str, np.ndarray],
+                base: Optional[PumpSystemAnalyzer], velocities: np.ndarray,
+                settings: tuple, chunk_size: int) -> int:
+    """Render every case as one page of a multi-page PDF (runs in one process)"""
+    template = _worker_template(settings)
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    total = len(next(iter(design.values())))
+    pages = 0
+    with PdfPages(pdf_path) as pdf:
+        for start in range(0, total, chunk_size):
+            parameters = {name: column[start:start + chunk_size]
+                          for name, column in design.items()}
+            for curves, point in case_data(base, parameters, velocities):
+                template.update(curves, point)
+                template.render_vector(pdf)
+                pages += 1
+    return pages
+
+
+def render_reports(design: Dict[str, np.ndarray], output_dir: Optional[str] = None,
+                   formats: Sequence[str] = ('png',), pdf_path: Optional[str] = None,
+                   base: Optional[PumpSystemAnalyzer] = None, jobs: Optional[int] = None,
+                   chunk_size: int = 200, v_min: float = 0.1, v_max: float = 2.0,
+                   num_points: int = 200, limits: Optional[Limits] = None,
+                   fit_each_case: bool = False, width: float = 14, height: float = 6,
+                   dpi: int = 72, annotations: bool = False, name_pattern: str = 'case_{index:06d}',
+                   progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """
+    Render the curve figure of every case of a design across a process pool.
+
+    Args:
+        design: Flat parameter columns (see sweep.cartesian_design)
+        output_dir: Directory of the per-case figure files (None: no files)
+        formats: File formats per case, e.g. ('png',) or ('png', 'svg')
+        pdf_path: Optional multi-page PDF with one page per case; it is
+            written by a single worker while the others render files
+        base: Analyzer providing the parameters not in the design
+        jobs: Worker processes (default: number of CPU cores; 1 runs inline)
+        chunk_size: Cases rendered per task
+        v_min: Minimum velocity of the curves in m/s
+        v_max: Maximum velocity of the curves in m/s
+        num_points: Points per curve
+        limits: Fixed axis limits (default: fitted to all cases)
+        fit_each_case: Fit the axis limits of every figure to its own case
+            instead (as the GUI does); this needs a full draw per figure
+        width: Figure width in inches
+        height: Figure height in inches
+        dpi: Raster resolution
+        annotations: Draw the operating point annotation boxes (as the
+            GUI does; they roughly double the time per blitted figure)
+        name_pattern: File name (without extension) formatted with the case index
+        progress: Optional callback called as progress(done, total) in cases
+
+    Returns:
+        Dictionary with the number of cases, files and PDF pages written,
+        the elapsed time and the figures rendered per second
+    """
+    unknown = set(design) - set(BATCH_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown design parameters: {sorted(unknown)}")
+    columns = {name: np.asarray(values, dtype=float) for name, values in design.items()}
+    total = len(next(iter(columns.values()))) if columns else 0
+    if any(len(values) != total for values in columns.values()):
+        raise ValueError("All design columns must have the same length")
+
+    started = time.perf_counter()
+    velocities = np.linspace(v_min, v_max, num_points)
+    if not fit_each_case and limits is None:
+        limits = shared_limits(columns, base, v_min, v_max, num_points)
+    settings = (width, height, dpi, None if fit_each_case else limits, annotations)
+    formats = [image_format.lower().lstrip('.') for image_format in formats]
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    tasks = []
+    if output_dir is not None and formats:
+        tasks = [(start, {name: values[start:start + chunk_size]
+                          for name, values in columns.items()})
+                 for start in range(0, total, chunk_size)]
+    files = pages = done = 0
+    jobs = jobs or os.cpu_count() or 1
+
+    def chunk_done(start, written):
+        nonlocal files, done
+        files += written
+        done += min(chunk_size, total - start)
+        if progress is not None:
+            progress(done, total)
+
+    if jobs == 1:
+        for start, parameters in tasks:
+            chunk_done(start, _render_chunk(start, parameters, base, output_dir, formats,
+                                            name_pattern, velocities, settings))
+        if pdf_path is not None:
+            pages = _render_pdf(pdf_path, columns, base, velocities, settings, chunk_size)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            pdf_future = None
+            if pdf_path is not None:
+                pdf_future = executor.submit(_render_pdf, pdf_path, columns, base,
+                                             velocities, settings, chunk_size)
+            futures = {executor.submit(_render_chunk, start, parameters, base, output_dir,
+                                       formats, name_pattern, velocities, settings): start
+                       for start, parameters in tasks}
+            for future, start in futures.items():
+                chunk_done(start, future.result())
+            if pdf_future is not None:
+                pages = pdf_future.result()
+
+    elapsed = time.perf_counter() - started
+    return {
+        'cases': total,
+        'files': files,
+        'pdf_pages': pages,
+        'elapsed': elapsed,
+        'figures_per_second': (files + pages) / elapsed if elapsed > 0 else float('inf')
+    }
@@ -0,0 +1,449 @@
+"""
+Analysis Service
+Local HTTP/JSON server for operating points and curves (asyncio, stdlib only)
+
+Usage:
+    python -m src.service --port 8765 --workers 4
+
+Endpoints (JSON bodies; parameters are analyzer attributes from
+batch_solver.BATCH_PARAMETERS, missing ones come from the base system):
+    POST /operating-point  {"diameter": 0.025, "static_head": 9.0}
+                           or a list of such objects (answered with a list)
+    POST /curves           {"parameters": {...}, "v_min": 0.1, "v_max": 2.0,
+                            "num_points": 500}
+    GET  /health           {"status": "ok"}
+    GET  /stats            request, batch and cache counters
+
+Operating-point requests that arrive while the worker processes are busy
+are queued and solved together: whenever a worker is free, everything
+queued (up to max_batch rows) becomes one vectorized solve_analyzer_batch
+call. Under light load a request is solved alone and immediately; under
+heavy load batches grow, so the per-request cost falls as the rate rises.
+Results are kept in a shared LRU AnalysisCache keyed by the parameter
+values, and identical rows within a batch are solved once.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .backend.pump_system import PumpSystemAnalyzer
+from .backend.batch_solver import BATCH_PARAMETERS, broadcast_analyzer, solve_analyzer_batch
+from .backend.cache import AnalysisCache
+from .backend.friction import FRICTION_MODELS
+
+# Fields of every operating-point answer
+RESULT_FIELDS = ('velocity', 'head', 'head_pump', 'flow_rate_m3s', 'flow_rate_ls',
+                 'friction_factor', 'converged', 'iterations')
+
+MAX_BODY_BYTES = 16 * 1024 ** 2
+MAX_CURVE_POINTS = 100_000
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# Base analyzer of a worker process, set once by _init_worker
+_worker_base: Optional[PumpSystemAnalyzer] = None
+
+
+def _init_worker(base: PumpSystemAnalyzer) -> None:
+    global _worker_base
+    _worker_base = base
+
+
+def _solve_rows(rows: np.ndarray, solver_options: Dict,
+                base: Optional[PumpSystemAnalyzer] = None) -> np.ndarray:
+    """
+    Solve a batch of parameter rows (runs in a worker).
+
+    Args:
+        rows: Array (n, len(BATCH_PARAMETERS)) of parameter values
+        solver_options: Forwarded to solve_analyzer_batch
+        base: Base analyzer (default: the one given to the worker process)
+
+    Returns:
+        Array (n, len(RESULT_FIELDS)) of results
+    """
+    analyzer = broadcast_analyzer(base if base is not None else _worker_base,
+                                  **dict(zip(BATCH_PARAMETERS, rows.T)))
+    solution = solve_analyzer_batch(analyzer, **solver_options)
+    solution['flow_rate_ls'] = solution['flow_rate_m3s'] * 1000
+    return np.column_stack([solution[name] for name in RESULT_FIELDS]).astype(float)
+
+
+def _curves(row: Tuple[float, ...], v_min: float, v_max: float, num_points: int,
+            base: Optional[PumpSystemAnalyzer] = None) -> bytes:
+    """
+    Generate curves for one parameter row and encode them as JSON (runs in a worker).
+    """
+    analyzer = broadcast_analyzer(base if base is not None else _worker_base,
+                                  **dict(zip(BATCH_PARAMETERS, row)))
+    # Invalid parameters give NaN heads, rejected below
+    with np.errstate(divide='ignore', invalid='ignore'):
+        curves = analyzer.generate_curves(v_min, v_max, num_points)
+    # NaN or infinity would make the body invalid JSON; raises ValueError instead
+    return json.dumps({name: values.tolist() for name, values in curves.items()},
+                      allow_nan=False).encode()
+
+
+class RequestError(Exception):
+    """Invalid request, answered with an HTTP error status"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class AnalysisService:
+    """
+    Micro-batching, caching front-end to a pool of analysis workers.
+
+    The coroutine methods can be awaited directly; serve() exposes them
+    over HTTP.
+    """
+
+    def __init__(self, base: Optional[PumpSystemAnalyzer] = None,
+                 workers: Optional[int] = None, max_batch: int = 4096,
+                 cache: Optional[AnalysisCache] = None,
+                 solver_options: Optional[Dict] = None):
+        """
+        Initialize the service (the worker pool starts on first use).
+
+        Args:
+            base: Analyzer providing parameters missing from requests
+            workers: Worker processes (default: one per CPU core; 0 solves
+                in a background thread of this process)
+            max_batch: Maximum rows per vectorized solve
+            cache: Result cache (default: a new 100 000-entry cache)
+            solver_options: Forwarded to solve_analyzer_batch
+        """
+        self.base = base if base is not None else PumpSystemAnalyzer()
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_batch = max_batch
+        self.cache = cache if cache is not None else AnalysisCache(max_entries=100_000)
+        self.solver_options = solver_options or {}
+        self.defaults = tuple(float(getattr(self.base, name)) for name in BATCH_PARAMETERS)
+
+        self._executor: Optional[Executor] = None
+        self._pending: Dict[Tuple[float, ...], List[asyncio.Future]] = {}
+        self._in_flight = 0
+        self._flush_scheduled = False
+        self.counters = {'requests': 0, 'rows': 0, 'batches': 0, 'solved_rows': 0}
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.workers > 0:
+                self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                     initargs=(self.base,))
+            else:
+                self._executor = ThreadPoolExecutor(1)
+        return self._executor
+
+    def _worker_args(self) -> Tuple:
+        # Thread workers share this process, where _worker_base is not set
+        return () if self.workers > 0 else (self.base,)
+
+    def close(self) -> None:
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            if sys.version_info >= (3, 9):
+                self._executor.shutdown(wait=True, cancel_futures=True)
+            else:
+                # No cancel_futures before Python 3.9: queued batches still run
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def parameter_row(self, parameters: Dict) -> Tuple[float, ...]:
+        """
+        Convert request parameters into a full parameter row.
+
+        Raises:
+            RequestError: For unknown names or non-numeric values
+        """
+        if not isinstance(parameters, dict):
+            raise RequestError("Parameters must be a JSON object")
+        unknown = set(parameters) - set(BATCH_PARAMETERS)
+        if unknown:
+            raise RequestError(f"Unknown parameters: {sorted(unknown)}")
+        try:
+            return tuple(float(parameters[name]) if name in parameters else default
+                         for name, default in zip(BATCH_PARAMETERS, self.defaults))
+        except (TypeError, ValueError):
+            raise RequestError("Parameter values must be numbers") from None
+
+    async def operating_points(self, cases: List[Dict]) -> List[Dict]:
+        """
+        Solve the operating points of several cases.
+
+        Args:
+            cases: Parameter dictionaries
+
+        Returns:
+            One result dictionary (RESULT_FIELDS; NaN values as None) per case
+        """
+        rows = [self.parameter_row(case) for case in cases]
+        self.counters['requests'] += 1
+        self.counters['rows'] += len(rows)
+        loop = asyncio.get_running_loop()
+        results: List = [None] * len(rows)
+        waiting = []
+        for index, row in enumerate(rows):
+            cached = self.cache.get(('operating_point', row))
+            if cached is not None:
+                results[index] = cached
+                continue
+            future = loop.create_future()
+            self._pending.setdefault(row, []).append(future)
+            waiting.append((index, future))
+        if waiting:
+            self._schedule_flush()
+            for index, future in waiting:
+                results[index] = await future
+        return results
+
+    def _schedule_flush(self) -> None:
+        # Rows queued during the same loop iteration join one batch
+        if not self._flush_scheduled and self._in_flight < max(self.workers, 1):
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self) -> None:
+        """Send the queued rows to a worker as one batch"""
+        self._flush_scheduled = False
+        if not self._pending or self._in_flight >= max(self.workers, 1):
+            return
+        keys = []
+        for key in self._pending:
+            keys.append(key)
+            if len(keys) >= self.max_batch:
+                break
+        waiters = [self._pending.pop(key) for key in keys]
+        self._in_flight += 1
+        self.counters['batches'] += 1
+        self.counters['solved_rows'] += len(keys)
+        asyncio.get_running_loop().create_task(self._solve_batch(keys, waiters))
+
+    async def _solve_batch(self, keys: List[Tuple[float, ...]],
+                           waiters: List[List[asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            values = await loop.run_in_executor(self.executor, _solve_rows, np.array(keys),
+                                                self.solver_options, *self._worker_args())
+        except Exception as error:
+            for futures in waiters:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(error)
+        else:
+            for key, futures, row in zip(keys, waiters, values.tolist()):
+                result = {name: (None if value != value else value)
+                          for name, value in zip(RESULT_FIELDS, row)}
+                result['converged'] = bool(result['converged'])
+                result['iterations'] = int(result['iterations'])
+                self.cache.put(('operating_point', key), result)
+                for future in futures:
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            if self._pending:
+                self._schedule_flush()
+
+    async def curves(self, parameters: Dict, v_min: float = 0.1, v_max: float = 2.0,
+                     num_points: int = 500) -> bytes:
+        """
+        Generate the system and pump curves of one case.
+
+        Returns:
+            JSON-encoded curves (velocities, flow_rates, system_head, pump_head)
+
+        Raises:
+            RequestError: For an invalid velocity range or non-finite curves
+        """
+        row = self.parameter_row(parameters)
+        try:
+            v_min, v_max, num_points = float(v_min), float(v_max), int(num_points)
+        except (TypeError, ValueError):
+            raise RequestError("v_min, v_max and num_points must be numbers") from None
+        if not 2 <= num_points <= MAX_CURVE_POINTS:
+            raise RequestError(f"num_points must be between 2 and {MAX_CURVE_POINTS}")
+        if not 0 < v_min < v_max < np.inf:
+            raise RequestError("Expected 0 < v_min < v_max")
+        self.counters['requests'] += 1
+        key = ('curves', row, v_min, v_max, num_points)
+        body = self.cache.get(key)
+        if body is None:
+            try:
+                body = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, _curves, row, v_min, v_max, num_points,
+                    *self._worker_args())
+            except ValueError:
+                raise RequestError("The curves are not finite for these parameters") from None
+            self.cache.put(key, body)
+        return body
+
+    def stats(self) -> Dict:
+        """Request, batch and cache counters"""
+        stats = dict(self.counters)
+        stats['mean_batch_rows'] = stats['solved_rows'] / stats['batches'] \
+            if stats['batches'] else 0.0
+        stats['cache'] = self.cache.stats()
+        return stats
+
+    async def _route(self, method: str, path: str, body: bytes) -> bytes:
+        """Dispatch one request and return the JSON response body"""
+        if path == '/health':
+            return b'{"status": "ok"}'
+        if path == '/stats':
+            return json.dumps(self.stats()).encode()
+        if path not in ('/operating-point', '/curves'):
+            raise RequestError(f"Unknown endpoint {path}", 404)
+        if method != 'POST':
+            raise RequestError(f"{path} expects POST", 405)
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise RequestError("Body is not valid JSON") from None
+
+        if path == '/curves':
+            if not isinstance(payload, dict):
+                raise RequestError("Body must be a JSON object")
+            return await self.curves(payload.get('parameters', {}),
+                                     payload.get('v_min', 0.1), payload.get('v_max', 2.0),
+                                     payload.get('num_points', 500))
+        if isinstance(payload, list):
+            return json.dumps(await self.operating_points(payload)).encode()
+        return json.dumps((await self.operating_points([payload]))[0]).encode()
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one (keep-alive) connection"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        ConnectionError, asyncio.CancelledError):
+                    # Client gone, or idle connection closed at shutdown
+                    return
+                lines = head.decode('latin-1').split('\r\n')
+                parts = lines[0].split()
+                if len(parts) != 3:
+                    return
+                method, path, version = parts
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get('connection', '').lower() != 'close' and \
+                    version == 'HTTP/1.1'
+
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                status = 200
+                if length < 0:
+                    # The body cannot be skipped without its length
+                    status, body = 400, b'{"error": "Invalid Content-Length"}'
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, body = 413, b'{"error": "Body too large"}'
+                    keep_alive = False
+                else:
+                    try:
+                        body = await self._route(method, path.split('?', 1)[0],
+                                                 await reader.readexactly(length))
+                    except RequestError as error:
+                        status, body = error.status, json.dumps({'error': str(error)}).encode()
+                    except asyncio.IncompleteReadError:
+                        return
+                    except Exception as error:
+                        status, body = 500, json.dumps({'error': str(error)}).encode()
+
+                writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                             f"Content-Type: application/json\r\n"
+                             f"Content-Length: {len(body)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                             f"\r\n".encode() + body)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765) -> asyncio.Server:
+        """
+        Start listening (port 0 picks a free port; see server.sockets).
+
+        Returns:
+            The running asyncio server
+        """
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.service',
+        description="Local HTTP/JSON service for pump/system operating points and curves.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on")
+    parser.add_argument('--port', type=int, default=8765, help="port to listen on")
+    parser.add_argument('-j', '--workers', type=int,
+                        help="worker processes (default: one per CPU core; 0: a thread)")
+    parser.add_argument('--max-batch', type=int, default=4096,
+                        help="maximum rows per vectorized solve")
+    parser.add_argument('--cache-entries', type=int, default=100_000,
+                        help="results kept in the cache")
+    parser.add_argument('--diameter', type=float, default=0.0203,
+                        help="pipe diameter of the base system in meters")
+    parser.add_argument('--friction-model', default='swamee_jain',
+                        choices=sorted(FRICTION_MODELS) + ['table'])
+    parser.add_argument('--tol', type=float, default=1e-10,
+                        help="head residual tolerance in meters")
+    return parser
+
+
+async def _serve_forever(service: AnalysisService, host: str, port: int) -> None:
+    server = await service.serve(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"Serving on http://{address[0]}:{address[1]}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the service until interrupted.
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+
+    Returns:
+        Exit status
+    """
+    args = build_parser().parse_args(argv)
+    service = AnalysisService(
+        PumpSystemAnalyzer(diameter=args.diameter, friction_model=args.friction_model),
+        workers=args.workers, max_batch=args.max_batch,
+        cache=AnalysisCache(max_entries=args.cache_entries),
+        solver_options={'tol': args.tol})
+    try:
+        asyncio.run(_serve_forever(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
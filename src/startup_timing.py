@@ -0,0 +1,133 @@
+"""
+Startup Timing Module
+Measures per-module import cost and startup milestones of the application.
+
+Enabled with ``app_gui.py --startup-profile[=PATH]`` (or the environment
+variable PUMP_STARTUP_PROFILE=PATH). When disabled, mark() and report() do
+nothing. Works in the PyInstaller build too, where ``python -X importtime``
+is not available; the report is written to a file because the windowed
+executable has no console.
+"""
+
+import builtins
+import os
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+_start = time.perf_counter()
+_enabled = False
+_output_path: Optional[str] = None
+_original_import = builtins.__import__
+_imports: List[Tuple[str, float, float]] = []
+_local = threading.local()
+_milestones: List[Tuple[str, float]] = []
+
+DEFAULT_REPORT = 'startup_profile.txt'
+
+
+def _missing(name, fromlist) -> List[str]:
+    """Names that importing name (with its fromlist) would have to load"""
+    module = sys.modules.get(name)
+    if module is None:
+        return [name]
+    return [f"{name}.{item}" for item in fromlist or ()
+            if item != '*' and not hasattr(module, item)]
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """builtins.__import__ replacement recording first-time module imports"""
+    # Relative imports are attributed to the importing package
+    missing = [] if level else _missing(name, fromlist)
+    if not missing:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    # Each frame accumulates the time spent in nested first-time imports
+    stack = _local.__dict__.setdefault('stack', [])
+    stack.append([0.0])
+    started = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - started
+        child_time = stack.pop()[0]
+        if stack:
+            stack[-1][0] += elapsed
+        label = missing[0] if len(missing) == 1 else \
+            f"{name}.{{{','.join(item.rsplit('.', 1)[1] for item in missing)}}}"
+        _imports.append((label, elapsed, elapsed - child_time))
+
+
+def enable(output_path: Optional[str] = None) -> None:
+    """
+    Start recording imports and milestones.
+
+    Args:
+        output_path: Report file (default: startup_profile.txt)
+    """
+    global _enabled, _output_path
+    _enabled = True
+    _output_path = output_path or DEFAULT_REPORT
+    builtins.__import__ = _timed_import
+
+
+def enable_from_argv(argv: List[str]) -> List[str]:
+    """
+    Enable profiling if --startup-profile is present or the environment asks.
+
+    Args:
+        argv: Command-line arguments
+
+    Returns:
+        argv without the --startup-profile option
+    """
+    remaining = []
+    path = os.environ.get('PUMP_STARTUP_PROFILE')
+    requested = bool(path)
+    for arg in argv:
+        if arg == '--startup-profile':
+            requested = True
+        elif arg.startswith('--startup-profile='):
+            requested = True
+            path = arg.split('=', 1)[1]
+        else:
+            remaining.append(arg)
+    if requested:
+        enable(path)
+    return remaining
+
+
+def mark(label: str) -> None:
+    """Record a named milestone (seconds since process start of this module)"""
+    if _enabled:
+        _milestones.append((label, time.perf_counter() - _start))
+
+
+def format_report(limit: int = 40) -> str:
+    """
+    Format the recorded milestones and the slowest top-level imports.
+
+    Args:
+        limit: Number of modules listed
+
+    Returns:
+        Human-readable report
+    """
+    lines = ["STARTUP PROFILE", "=" * 60, "Milestones (s since launch):"]
+    for label, elapsed in _milestones:
+        lines.append(f"  {label:<30} {elapsed:8.3f}")
+    lines += ["", f"{'Module':<40} {'cumulative ms':>13} {'self ms':>9}"]
+    for name, cumulative, own in sorted(_imports, key=lambda item: -item[1])[:limit]:
+        lines.append(f"{name[:40]:<40} {cumulative * 1000:13.1f} {own * 1000:9.1f}")
+    total = sum(own for _, _, own in _imports)
+    lines.append(f"{'TOTAL (first-time imports)':<40} {total * 1000:13.1f}")
+    return "\n".join(lines)
+
+
+def report() -> None:
+    """Write the report to the configured file (no-op when disabled)"""
+    if not _enabled:
+        return
+    with open(_output_path, 'w', encoding='utf-8') as handle:
+        handle.write(format_report() + "\n")
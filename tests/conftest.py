@@ -0,0 +1,31 @@
+"""Test configuration: import the application package from the repository root"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.backend.pump_system import PumpSystemAnalyzer  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """Shared QApplication for widget tests (offscreen; skipped without PyQt6)"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    widgets = pytest.importorskip('PyQt6.QtWidgets')
+    return widgets.QApplication.instance() or widgets.QApplication([])
+
+
+@pytest.fixture
+def make_analyzer():
+    """Factory for a default analyzer with changed parameters (area follows the diameter)"""
+    def make(**parameters):
+        analyzer = PumpSystemAnalyzer()
+        for name, value in parameters.items():
+            setattr(analyzer, name, value)
+        analyzer.area = np.pi * (analyzer.diameter / 2) ** 2
+        return analyzer
+    return make
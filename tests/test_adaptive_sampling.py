@@ -0,0 +1,43 @@
+"""Regression checks for adaptive curve sampling"""
+
+import numpy as np
+import pytest
+
+from src.backend.adaptive_sampling import generate_adaptive_curves
+from src.backend.pump_system import PumpSystemAnalyzer
+
+
+@pytest.mark.parametrize('tol', [1e-2, 1e-3, 1e-4])
+def test_interpolation_error_meets_tolerance(tol):
+    analyzer = PumpSystemAnalyzer()
+    curves = generate_adaptive_curves(analyzer, tol=tol)
+    dense = np.linspace(0.1, 2.0, 200_001)
+    for name, exact in (('system_head', analyzer.calculate_system_head(dense)),
+                        ('pump_head', analyzer.calculate_pump_head(dense))):
+        interpolated = np.interp(dense, curves['velocities'], curves[name])
+        assert np.max(np.abs(interpolated - exact)) <= tol
+    assert np.all(np.diff(curves['velocities']) > 0)
+
+
+def test_default_tolerance_uses_fewer_points_than_uniform_grid():
+    curves = generate_adaptive_curves(PumpSystemAnalyzer())
+    assert curves['evaluations'] < 500
+    assert curves['max_error'] <= 1e-3
+
+
+def test_intersection_is_a_grid_point():
+    analyzer = PumpSystemAnalyzer()
+    curves = generate_adaptive_curves(analyzer)
+    velocity = analyzer.find_operating_point()['velocity']
+    np.testing.assert_allclose(curves['intersections'], [velocity], rtol=1e-9)
+    assert np.min(np.abs(curves['velocities'] - velocity)) < 1e-9
+
+
+def test_complete_analysis_on_adaptive_curves():
+    analyzer = PumpSystemAnalyzer()
+    uniform = analyzer.analyze_complete_system()
+    adaptive = analyzer.analyze_complete_system(curve_tol=1e-4)
+    assert 'max_error' in adaptive['curves']
+    assert adaptive['operating_point']['intersections'] == 1
+    assert adaptive['operating_point']['velocity'] == \
+        pytest.approx(uniform['operating_point']['velocity'], rel=1e-9)
@@ -0,0 +1,77 @@
+"""Regression checks for the background analysis worker"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('PyQt6')
+
+from src.backend import cache as analysis_cache  # noqa: E402
+from src.backend.pump_system import PumpSystemAnalyzer  # noqa: E402
+from src.frontend.analysis_worker import AnalysisController, AnalysisWorker  # noqa: E402
+
+PARAMS = {'diameter': 0.0203, 'v_min': 0.1, 'v_max': 2.0, 'num_points': 50, 'cache': False}
+
+
+def process_events(qapp, condition=lambda: False, timeout=10.0):
+    """Run the event loop until condition() holds or timeout seconds pass"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+def test_controller_delivers_only_the_latest_request(qapp):
+    controller = AnalysisController()
+    results, busy = [], []
+    controller.result_ready.connect(results.append)
+    controller.busy_changed.connect(busy.append)
+    try:
+        for diameter in (0.015, 0.02, 0.025):
+            controller.submit(dict(PARAMS, diameter=diameter))
+        process_events(qapp, lambda: results)
+        process_events(qapp, timeout=0.2)
+    finally:
+        controller.shutdown()
+    assert [result['analyzer'].diameter for result in results] == [0.025]
+    assert busy[-1] is False
+
+
+def test_cancel_discards_the_pending_result(qapp):
+    controller = AnalysisController()
+    results, busy = [], []
+    controller.result_ready.connect(results.append)
+    controller.busy_changed.connect(busy.append)
+    try:
+        controller.submit(PARAMS)
+        controller.cancel()
+        assert busy == [True, False]
+        process_events(qapp, timeout=0.5)
+    finally:
+        controller.shutdown()
+    assert results == []
+
+
+def test_newer_request_interrupts_running_analysis(qapp, monkeypatch):
+    controller = SimpleNamespace(latest_request=1)
+    generate_curves = PumpSystemAnalyzer.generate_curves
+    solved = []
+
+    def curves_then_supersede(self, *args, **kwargs):
+        curves = generate_curves(self, *args, **kwargs)
+        controller.latest_request = 2
+        return curves
+
+    monkeypatch.setattr(analysis_cache, 'default_cache', analysis_cache.AnalysisCache())
+    monkeypatch.setattr(PumpSystemAnalyzer, 'generate_curves', curves_then_supersede)
+    monkeypatch.setattr(PumpSystemAnalyzer, 'find_all_operating_points',
+                        lambda self, *args, **kwargs: solved.append(args))
+    worker = AnalysisWorker(controller)
+    finished, failed = [], []
+    worker.finished.connect(lambda *args: finished.append(args))
+    worker.failed.connect(lambda *args: failed.append(args))
+    for cache in (False, True):
+        controller.latest_request = 1
+        worker.compute(1, dict(PARAMS, cache=cache))
+    assert solved == [] and finished == [] and failed == []
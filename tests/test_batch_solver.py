@@ -0,0 +1,33 @@
+"""Regression checks for the batched operating-point solver"""
+
+import numpy as np
+import pytest
+
+from src.backend.batch_solver import broadcast_analyzer, solve_operating_points
+from src.backend.pump_system import PumpSystemAnalyzer
+
+
+def test_rows_match_scalar_solves(make_analyzer):
+    diameter = np.array([0.02, 0.03, 0.05])[:, None]
+    static_head = np.array([2.0, 6.0])
+    result = solve_operating_points(diameter=diameter, static_head=static_head)
+    assert result['velocity'].shape == (3, 2)
+    assert result['converged'].all()
+    for row in range(3):
+        for column in range(2):
+            expected = make_analyzer(diameter=float(diameter[row, 0]),
+                                     static_head=float(static_head[column])
+                                     ).find_operating_point()['velocity']
+            assert result['velocity'][row, column] == pytest.approx(expected, rel=1e-9)
+    np.testing.assert_allclose(result['head'], result['head_pump'], atol=1e-9)
+
+
+def test_rows_without_operating_point_are_flagged():
+    base = PumpSystemAnalyzer()
+    result = solve_operating_points(static_head=[5.0, base.pump_max_head + 1.0])
+    assert result['converged'].tolist() == [True, False]
+
+
+def test_unknown_parameter_raises():
+    with pytest.raises(ValueError):
+        broadcast_analyzer(pipe_length=[1.0, 2.0])
@@ -0,0 +1,63 @@
+"""Regression checks for the benchmark runner's baseline handling"""
+
+import importlib.util
+import json
+import os
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'run_benchmarks.py')
+
+
+@pytest.fixture
+def calls():
+    """Arguments of every (stubbed) suite run"""
+    return []
+
+
+@pytest.fixture
+def runner(monkeypatch, tmp_path, calls):
+    """The benchmark script with a stub suite and a temporary default baseline"""
+    spec = importlib.util.spec_from_file_location('run_benchmarks', SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    def run(selected, quick, include_gui):
+        calls.append(selected)
+        return {'solver': {'min': 2.0, 'median': 2.0, 'loops': 1, 'repeats': 1}}
+
+    monkeypatch.setattr(module, 'run', run)
+    monkeypatch.setattr(module, 'DEFAULT_BASELINE', str(tmp_path / 'baseline.json'))
+    return module
+
+
+@pytest.fixture
+def output(tmp_path):
+    return ['--output', str(tmp_path / 'results.json')]
+
+
+@pytest.mark.parametrize('content', [None, '{not json', '[]'])
+def test_bad_baseline_fails_before_running(runner, calls, output, tmp_path, capsys, content):
+    path = tmp_path / 'given.json'
+    if content is not None:
+        path.write_text(content)
+    with pytest.raises(SystemExit) as exit_info:
+        runner.main(output + ['--baseline', str(path)])
+    assert exit_info.value.code == 2 and calls == []
+    assert 'baseline' in capsys.readouterr().err
+
+
+def test_bad_threshold_fails_before_running(runner, calls, output, capsys):
+    with pytest.raises(SystemExit):
+        runner.main(output + ['--threshold-for', 'render'])
+    assert calls == [] and 'NAME=THRESHOLD' in capsys.readouterr().err
+
+
+def test_default_baseline_is_used_when_present(runner, calls, output):
+    # No baseline anywhere: nothing to compare
+    assert runner.main(output) == 0
+    with open(runner.DEFAULT_BASELINE, 'w', encoding='utf-8') as handle:
+        json.dump({'results': {'solver': {'min': 1.0}}}, handle)
+    assert runner.main(output) == 1
+    assert runner.main(output + ['--threshold-for', 'solver=1.5']) == 0
+    assert len(calls) == 3
@@ -0,0 +1,73 @@
+"""Regression checks for the analysis cache"""
+
+import numpy as np
+import pytest
+
+from src.backend.cache import (AnalysisCache, analyzer_key, cached_analysis,
+                               cached_operating_point)
+from src.backend.friction import ColebrookWhite
+from src.backend.pump_system import PumpSystemAnalyzer
+
+
+class RoundedRepr:
+    """Parameter object whose repr hides small differences"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return f"RoundedRepr({self.value:.3g})"
+
+    def cache_key(self):
+        return float(self.value).hex().encode()
+
+
+def test_equal_parameters_hash_equally():
+    changed = PumpSystemAnalyzer()
+    changed.static_head = 7.85
+    assert analyzer_key(PumpSystemAnalyzer()) == analyzer_key(changed)
+    changed.static_head = np.nextafter(7.85, 8.0)
+    assert analyzer_key(PumpSystemAnalyzer()) != analyzer_key(changed)
+    assert analyzer_key(PumpSystemAnalyzer()) != \
+        analyzer_key(PumpSystemAnalyzer(friction_model=ColebrookWhite()))
+
+
+def test_cache_key_method_replaces_repr():
+    first, second = PumpSystemAnalyzer(), PumpSystemAnalyzer()
+    first.pump_curve, second.pump_curve = RoundedRepr(1.0), RoundedRepr(1.0 + 1e-9)
+    assert repr(first.pump_curve) == repr(second.pump_curve)
+    assert analyzer_key(first) != analyzer_key(second)
+
+
+def test_cached_operating_point_hits_and_copies():
+    cache = AnalysisCache()
+    first = cached_operating_point(PumpSystemAnalyzer(), cache=cache)
+    first['velocity'] = -1.0
+    second = cached_operating_point(PumpSystemAnalyzer(), cache=cache)
+    assert second['velocity'] == PumpSystemAnalyzer().find_operating_point()['velocity']
+    assert cache.stats()['hits'] == 1
+
+
+class Abandoned(Exception):
+    pass
+
+
+def test_abandoned_analysis_is_not_cached():
+    cache = AnalysisCache()
+    stages = []
+
+    def stop_after_curves():
+        stages.append('checkpoint')
+        raise Abandoned()
+
+    with pytest.raises(Abandoned):
+        cached_analysis(PumpSystemAnalyzer(), num_points=50, cache=cache,
+                        checkpoint=stop_after_curves)
+    assert stages == ['checkpoint'] and cache.stats()['entries'] == 0
+
+    # A full run reaches both stage boundaries; a hit reaches none
+    cached_analysis(PumpSystemAnalyzer(), num_points=50, cache=cache,
+                    checkpoint=lambda: stages.append('run'))
+    cached_analysis(PumpSystemAnalyzer(), num_points=50, cache=cache,
+                    checkpoint=lambda: stages.append('hit'))
+    assert stages == ['checkpoint', 'run', 'run']
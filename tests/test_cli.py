@@ -0,0 +1,39 @@
+"""Regression checks for the command-line interface"""
+
+import pytest
+
+from src import cli
+
+
+def write_cases(path, heads):
+    path.write_text('case,static_head\n' + ''.join(f'{index},{head}\n'
+                                                 for index, head in enumerate(heads)))
+
+
+def test_batch_results_keep_case_order(tmp_path):
+    cases, output = tmp_path / 'cases.csv', tmp_path / 'results.csv'
+    write_cases(cases, [5.0, 6.0, 7.0, 8.0, 9.0])
+    assert cli.main([str(cases), '-o', str(output), '--jobs', '2', '--chunk-size', '2']) == 0
+    lines = output.read_text().splitlines()
+    assert lines[0].startswith('case,static_head,velocity')
+    assert [line.split(',')[0] for line in lines[1:]] == ['0', '1', '2', '3', '4']
+
+
+@pytest.mark.parametrize('module, message', [('pyarrow.parquet', 'pyarrow is required'),
+                                             ('pandas', 'pandas is required')])
+def test_missing_file_format_dependency_is_reported(monkeypatch, capsys, module, message):
+    def missing(*args, **kwargs):
+        raise ImportError(f"No module named {module!r}", name=module)
+
+    monkeypatch.setattr(cli, 'run_batch', missing)
+    assert cli.main(['cases.parquet', '-o', 'results.parquet']) == 2
+    assert message in capsys.readouterr().err
+
+
+def test_other_import_errors_propagate(monkeypatch):
+    def missing(*args, **kwargs):
+        raise ImportError("No module named 'scipy'", name='scipy')
+
+    monkeypatch.setattr(cli, 'run_batch', missing)
+    with pytest.raises(ImportError):
+        cli.main(['cases.csv', '-o', 'results.csv'])
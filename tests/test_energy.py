@@ -0,0 +1,69 @@
+"""Regression checks for annual pumping energy"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from src.backend.energy import annual_energy, hydraulic_power, load_duration_histogram
+from src.backend.pump_system import PumpSystemAnalyzer
+
+
+def tank_levels(hours=8760, seed=0):
+    """Hourly static heads of a tank cycling between about 5 and 10 m"""
+    rng = np.random.default_rng(seed)
+    time = np.arange(hours)
+    return 7.5 + 2.0 * np.sin(2 * np.pi * time / 24) + rng.normal(0, 0.3, hours)
+
+
+def pointwise_energy(values, quantity, control='throttle'):
+    power = hydraulic_power(PumpSystemAnalyzer(), values, quantity, control)['power_w']
+    return power.sum() / 1000.0
+
+
+def test_histogram_keeps_hours_and_means():
+    values = tank_levels()
+    histogram = load_duration_histogram(values, time_step=0.5, bins=16)
+    assert histogram['total_hours'] == pytest.approx(0.5 * values.size)
+    assert histogram['count'].sum() == values.size
+    occupied = histogram['hours'] > 0
+    mean = np.sum(histogram['mean'][occupied] * histogram['hours'][occupied]) / \
+        histogram['total_hours']
+    assert mean == pytest.approx(values.mean(), rel=1e-12)
+
+
+def test_binned_energy_and_error_estimate_match_pointwise_solve():
+    values = tank_levels()
+    exact = pointwise_energy(values, 'static_head')
+    result = annual_energy(values, bins=16)
+    error = exact - result['hydraulic_energy_kwh']
+    assert abs(error) / exact < 1e-3
+    # The second-order estimate predicts most of the remaining error
+    corrected = result['hydraulic_energy_kwh'] + result['binning_error_kwh']
+    assert abs(exact - corrected) < 0.2 * abs(error)
+    assert result['energy_kwh'] == pytest.approx(result['hydraulic_energy_kwh'])
+
+
+def test_demand_profile_reports_unserved_hours():
+    capacity = PumpSystemAnalyzer().find_operating_point()['flow_rate_m3s']
+    demand = np.concatenate([np.zeros(100), np.full(300, 0.5 * capacity),
+                             np.full(50, 2.0 * capacity)])
+    for control in ('throttle', 'speed'):
+        result = annual_energy(demand, 'flow', control=control, bins=8)
+        assert result['unserved_hours'] == pytest.approx(50.0)
+        assert result['hydraulic_energy_kwh'] == \
+            pytest.approx(pointwise_energy(demand, 'flow', control), rel=1e-9)
+
+
+def test_zero_demand_under_speed_control_has_no_warnings():
+    demand = np.array([0.0, 0.0, 5e-5, 8e-5])
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        power = hydraulic_power(PumpSystemAnalyzer(), demand, 'flow', 'speed')
+    assert np.all(power['power_w'][:2] == 0.0)
+    assert np.all(power['power_w'][2:] > 0.0)
+
+
+def test_unknown_quantity_raises():
+    with pytest.raises(ValueError):
+        annual_energy([1.0, 2.0], quantity='pressure')
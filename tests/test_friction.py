@@ -0,0 +1,61 @@
+"""Regression checks for the friction factor models"""
+
+import numpy as np
+import pytest
+
+from src.backend.friction import FRICTION_MODELS, FrictionModel, get_friction_model
+
+# Maximum deviation from Colebrook-White (the docstring's approximate figures, rounded up)
+MAX_ERROR = {'swamee_jain': 0.03, 'haaland': 0.015, 'serghides': 3.5e-5,
+             'colebrook': 1e-12, 'colebrook_newton': 1e-12}
+
+
+def domain(size=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return 10 ** rng.uniform(np.log10(5000), 8, size), 10 ** rng.uniform(-6, -2, size)
+
+
+@pytest.mark.parametrize('name', sorted(FRICTION_MODELS))
+def test_accuracy_against_colebrook_white(name):
+    reynolds, roughness = domain()
+    exact = FRICTION_MODELS['colebrook'].friction_factor(reynolds, roughness)
+    friction = FRICTION_MODELS[name].friction_factor(reynolds, roughness)
+    assert np.max(np.abs(friction / exact - 1)) < MAX_ERROR[name]
+
+
+@pytest.mark.parametrize('name', sorted(FRICTION_MODELS))
+def test_derivatives_match_central_differences(name):
+    model = FRICTION_MODELS[name]
+    reynolds, roughness = domain(200, seed=1)
+    step = 1e-6
+    numeric = (model.friction_factor(reynolds * (1 + step), roughness) -
+               model.friction_factor(reynolds * (1 - step), roughness)) / (2 * step * reynolds)
+    np.testing.assert_allclose(model.derivative(reynolds, roughness), numeric, rtol=1e-5)
+    numeric = (model.friction_factor(reynolds, roughness * (1 + step)) -
+               model.friction_factor(reynolds, roughness * (1 - step))) / (2 * step * roughness)
+    np.testing.assert_allclose(model.roughness_derivative(reynolds, roughness), numeric,
+                               rtol=1e-5)
+
+
+def test_models_broadcast_and_keep_scalars():
+    model = get_friction_model('haaland')
+    grid = model.friction_factor(np.array([1e4, 1e5, 1e6])[:, None], np.array([1e-4, 1e-3]))
+    assert grid.shape == (3, 2)
+    assert np.ndim(model.friction_factor(1e5, 1e-3)) == 0
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        FrictionModel()
+
+    class Partial(FrictionModel):
+        def friction_factor(self, reynolds, relative_roughness):
+            return 0.02
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_unknown_model_name_raises():
+    with pytest.raises(ValueError):
+        get_friction_model('moody')
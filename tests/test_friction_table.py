@@ -0,0 +1,57 @@
+"""Regression checks for the friction factor lookup table"""
+
+import numpy as np
+import pytest
+
+from src.backend.friction import ColebrookWhite
+from src.backend.cache import analyzer_key
+from src.backend.friction_table import FrictionTable
+from src.backend.pump_system import PumpSystemAnalyzer
+
+
+@pytest.fixture(scope='module')
+def table():
+    return FrictionTable(cache_dir=None)
+
+
+def test_interpolation_error_stays_below_tolerance(table):
+    rng = np.random.default_rng(1)
+    reynolds = 10 ** rng.uniform(np.log10(2e3), 8.0, 20_000)
+    roughness = 10 ** rng.uniform(-6.0, np.log10(5e-2), 20_000)
+    exact = ColebrookWhite().friction_factor(reynolds, roughness)
+    error = np.abs(table.friction_factor(reynolds, roughness) / exact - 1)
+    assert table.max_relative_error <= table.tol
+    assert np.max(error) <= table.tol
+
+
+def test_points_outside_the_domain_use_the_reference(table):
+    table.reset_stats()
+    reynolds, roughness = np.array([1e9, 1e5]), np.array([1e-3, 1e-1])
+    np.testing.assert_array_equal(table.friction_factor(reynolds, roughness),
+                                  ColebrookWhite().friction_factor(reynolds, roughness))
+    assert table.stats()['misses'] == 2
+
+
+def test_derivative_matches_the_interpolant(table):
+    reynolds, roughness = np.array([3.3e4, 2.1e6]), np.array([2e-4, 2e-4])
+    step = 1e-6 * reynolds
+    slope = (table.friction_factor(reynolds + step, roughness) -
+             table.friction_factor(reynolds - step, roughness)) / (2 * step)
+    np.testing.assert_allclose(table.derivative(reynolds, roughness), slope, rtol=1e-5)
+
+
+def test_cached_table_is_reloaded(tmp_path):
+    built = FrictionTable(cache_dir=str(tmp_path), tol=1e-3)
+    loaded = FrictionTable(cache_dir=str(tmp_path), tol=1e-3)
+    assert len(list(tmp_path.iterdir())) == 1
+    assert loaded.max_relative_error == built.max_relative_error
+    assert loaded.stats()['grid_shape'] == built.stats()['grid_shape']
+
+
+def test_point_cap_is_part_of_the_identity():
+    coarse = FrictionTable(cache_dir=None, tol=1e-3, max_points=64)
+    assert coarse == FrictionTable(cache_dir=None, tol=1e-3, max_points=64)
+    fine = FrictionTable(cache_dir=None, tol=1e-3)
+    assert coarse != fine and 'max_points=64' in repr(coarse)
+    assert analyzer_key(PumpSystemAnalyzer(friction_model=coarse)) != \
+        analyzer_key(PumpSystemAnalyzer(friction_model=fine))
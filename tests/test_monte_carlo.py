@@ -0,0 +1,72 @@
+"""Regression checks for Monte Carlo uncertainty propagation"""
+
+import numpy as np
+import pytest
+
+from src.backend.batch_solver import broadcast_analyzer, solve_analyzer_batch
+from src.backend.monte_carlo import run_monte_carlo
+from src.backend.pump_system import PumpSystemAnalyzer
+
+DISTRIBUTIONS = {'static_head': ('normal', 7.85, 0.3),
+                 'pump_coefficient': ('uniform', 0.065, 0.07)}
+
+
+def test_percentiles_match_exact_per_sample_solve():
+    result = run_monte_carlo(DISTRIBUTIONS, num_samples=40_000, chunk_size=15_000, seed=3,
+                             curve_samples=1000)
+    assert result['success']
+    assert result['converged'] == 40_000
+
+    rng = np.random.default_rng(3)
+    # Same draws as the run: one chunk at a time, parameters in order
+    heads, coefficients = [], []
+    for size in (15_000, 15_000, 10_000):
+        heads.append(rng.normal(7.85, 0.3, size))
+        coefficients.append(rng.uniform(0.065, 0.07, size))
+    exact = solve_analyzer_batch(broadcast_analyzer(
+        PumpSystemAnalyzer(), static_head=np.concatenate(heads),
+        pump_coefficient=np.concatenate(coefficients)))['velocity']
+
+    statistics = result['statistics']['velocity']
+    assert statistics['mean'] == pytest.approx(exact.mean(), rel=1e-9)
+    assert statistics['min'] == pytest.approx(exact.min(), rel=1e-9)
+    assert statistics['max'] == pytest.approx(exact.max(), rel=1e-9)
+    spread = exact.max() - exact.min()
+    for p, value in statistics['percentiles'].items():
+        assert value == pytest.approx(np.percentile(exact, p), abs=spread / 1000)
+
+
+def test_constant_parameters_reproduce_the_operating_point():
+    point = PumpSystemAnalyzer().find_operating_point()
+    result = run_monte_carlo({'static_head': ('constant', 7.85)}, num_samples=1000, seed=0,
+                             curve_samples=10)
+    assert result['statistics']['velocity']['mean'] == pytest.approx(point['velocity'])
+    assert result['statistics']['head']['percentiles'][50] == \
+        pytest.approx(point['head'], rel=1e-6)
+
+
+def test_seed_makes_runs_reproducible():
+    first = run_monte_carlo(DISTRIBUTIONS, num_samples=5000, seed=11, curve_samples=100)
+    second = run_monte_carlo(DISTRIBUTIONS, num_samples=5000, seed=11, curve_samples=100)
+    assert first['statistics'] == second['statistics']
+    np.testing.assert_array_equal(first['curve_bands']['system_head'][50],
+                                  second['curve_bands']['system_head'][50])
+
+
+def test_curve_bands_bracket_the_median():
+    result = run_monte_carlo(DISTRIBUTIONS, num_samples=5000, seed=1, curve_samples=2000,
+                             curve_points=20)
+    bands = result['curve_bands']['pump_head']
+    assert bands[5].shape == (20,)
+    assert np.all(bands[5] <= bands[50]) and np.all(bands[50] <= bands[95])
+
+
+def test_zero_curve_samples_skips_the_bands():
+    result = run_monte_carlo(DISTRIBUTIONS, num_samples=2000, seed=2, curve_samples=0,
+                             curve_points=30)
+    assert result['success']
+    bands = result['curve_bands']
+    for curve in ('system_head', 'pump_head'):
+        assert set(bands[curve]) == {5, 50, 95}
+        assert all(values.shape == (30,) and np.isnan(values).all()
+                   for values in bands[curve].values())
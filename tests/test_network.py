@@ -0,0 +1,78 @@
+"""Regression checks for the pipe network solver"""
+
+import numpy as np
+import pytest
+
+from src.backend.network import PipeNetwork
+from src.backend.pump_system import PumpSystemAnalyzer
+
+
+def grid_network(size, demand, head=30.0):
+    """size x size looped grid of junctions fed from one reservoir at a corner"""
+    network = PipeNetwork()
+    network.add_reservoir('R', head)
+    for i in range(size):
+        for j in range(size):
+            network.add_junction(f'J{i}_{j}', demand)
+    network.add_pipe('P0', 'R', 'J0_0')
+    for i in range(size):
+        for j in range(size):
+            if i + 1 < size:
+                network.add_pipe(f'V{i}_{j}', f'J{i}_{j}', f'J{i + 1}_{j}')
+            if j + 1 < size:
+                network.add_pipe(f'H{i}_{j}', f'J{i}_{j}', f'J{i}_{j + 1}')
+    return network
+
+
+def test_single_pump_pipe_reproduces_operating_point():
+    analyzer = PumpSystemAnalyzer()
+    network = PipeNetwork(analyzer)
+    network.add_reservoir('suction', 0.0)
+    network.add_junction('discharge')
+    network.add_reservoir('tank', analyzer.static_head)
+    network.add_pump('pump', 'suction', 'discharge')
+    network.add_pipe('pipe', 'discharge', 'tank')
+    result = network.solve()
+    point = analyzer.find_operating_point()
+    assert result['success']
+    assert result['link_velocities'][1] == pytest.approx(point['velocity'], rel=1e-8)
+
+
+@pytest.mark.parametrize('size, demand', [(20, 1e-7), (20, 1e-8), (40, 1e-7), (20, 1e-5)])
+def test_looped_grid_converges_at_low_flow(size, demand):
+    network = grid_network(size, demand)
+    result = network.solve(max_iter=100)
+    assert result['success'], result['message']
+    # All demand is supplied through the single feed pipe
+    assert result['link_flows'][0] == pytest.approx(size * size * demand, rel=1e-6)
+
+
+def test_pipe_head_loss_monotone_with_consistent_slope():
+    network = PipeNetwork()
+    network.add_reservoir('A', 10.0)
+    network.add_junction('B')
+    network.add_pipe('pipe', 'A', 'B')
+    area = network.analyzer.area
+    # Laminar, transition and turbulent velocities, both flow directions
+    velocity = np.geomspace(1e-6, 3.0, 400)
+    flows = np.concatenate([-velocity[::-1], velocity]) * area
+    loss, slope = network.link_head_loss(flows)
+    assert np.all(np.diff(loss) > 0)
+    step = flows * 1e-6
+    numeric = (network.link_head_loss(flows + step)[0] -
+               network.link_head_loss(flows - step)[0]) / (2 * step)
+    np.testing.assert_allclose(numeric, slope, rtol=1e-6)
+
+
+def test_parallel_pumps_with_reverse_flow_converge():
+    network = PipeNetwork()
+    network.add_reservoir('suction', 0.0)
+    network.add_junction('header')
+    network.add_reservoir('tank', 15.0)
+    network.add_pump('strong', 'suction', 'header', pump_max_head=40.0)
+    network.add_pump('weak', 'suction', 'header', pump_max_head=10.0)
+    network.add_pipe('main', 'header', 'tank')
+    result = network.solve(max_iter=100)
+    assert result['success'], result['message']
+    # The weak pump cannot reach the header head and is driven backwards
+    assert result['link_flows'][1] < 0
@@ -0,0 +1,81 @@
+"""Regression checks for the life-cycle cost design optimization"""
+
+import numpy as np
+import pytest
+
+from src.backend.optimization import CostModel, DesignEvaluator, HOURS_PER_YEAR, optimize_design
+
+CATALOGUE = [
+    {'name': 'small', 'pump_max_head': 18.0, 'price': 150.0},
+    {'name': 'base', 'price': 250.0},
+    {'name': 'large', 'pump_max_head': 40.0, 'pump_coefficient': 0.05, 'price': 600.0,
+     'efficiency': 0.75},
+]
+
+
+def test_cost_gradient_matches_central_differences():
+    evaluator = DesignEvaluator(pumps=CATALOGUE, min_flow=2e-4, solver_options={'tol': 1e-13})
+    diameter = np.array([0.02, 0.03, 0.05])
+    pump = np.arange(3)
+    rows = evaluator.evaluate(diameter, pump)
+    step = diameter * 1e-6
+    upper = evaluator.evaluate(diameter + step, pump, warm_start=False)
+    lower = evaluator.evaluate(diameter - step, pump, warm_start=False)
+    for name, gradient in (('total_cost', 'cost_gradient'), ('margin', 'margin_gradient')):
+        numeric = (upper[name] - lower[name]) / (2 * step)
+        np.testing.assert_allclose(rows[gradient], numeric, rtol=1e-6)
+
+
+def test_optimum_agrees_with_brute_force_grid():
+    costs = CostModel(energy_price=0.3)
+    design = optimize_design(pumps=CATALOGUE, costs=costs, min_flow=2e-4)
+    assert design['success']
+
+    evaluator = DesignEvaluator(pumps=CATALOGUE, costs=costs, min_flow=2e-4,
+                                velocity_range=(0.3, 3.0))
+    grid = np.geomspace(0.01, 0.2, 20000)
+    rows = evaluator.evaluate(grid[None, :], np.arange(len(CATALOGUE))[:, None])
+    brute = np.where(rows['feasible'], rows['total_cost'], np.inf).min()
+    assert design['total_cost'] <= brute * (1 + 1e-9)
+    assert design['total_cost'] == pytest.approx(brute, rel=1e-4)
+
+
+def test_designs_must_pump_the_annual_volume_within_the_year():
+    costs = CostModel(max_utilization=0.5)
+    design = optimize_design(costs=costs)
+    assert design['success']
+    assert costs.required_flow == pytest.approx(costs.annual_volume / (0.5 * HOURS_PER_YEAR * 3600))
+    assert design['flow_rate_m3s'] >= costs.required_flow * (1 - 1e-6)
+    assert design['running_hours'] <= 0.5 * HOURS_PER_YEAR * (1 + 1e-6)
+
+
+def test_feasible_window_narrower_than_the_grid_is_found():
+    design = optimize_design(costs=CostModel(energy_price=3), min_flow=2.5e-4)
+    assert design['success']
+    assert 0.0316 < design['diameter'] < 0.0328
+    assert design['flow_rate_m3s'] >= 2.5e-4 * (1 - 1e-6)
+    assert design['velocity'] >= 0.3 * (1 - 1e-6)
+
+
+def test_infeasible_requirements_report_failure():
+    design = optimize_design(min_flow=1e-2)
+    assert not design['success']
+    assert not design['candidates']['feasible'].any()
+
+
+def test_standard_diameters_choose_from_the_list():
+    sizes = [0.016, 0.02, 0.025, 0.032, 0.04]
+    design = optimize_design(pumps=CATALOGUE, diameters=sizes, min_flow=2e-4)
+    assert design['success']
+    assert design['diameter'] in sizes
+
+
+@pytest.mark.parametrize('options', [
+    {'diameters': []},
+    {'diameters': [0.02, -0.01]},
+    {'d_min': 0.1, 'd_max': 0.05},
+    {'grid_points': 1},
+])
+def test_invalid_search_ranges_raise(options):
+    with pytest.raises(ValueError):
+        optimize_design(**options)
@@ -0,0 +1,56 @@
+"""Regression checks for the parameter slider controls"""
+
+import pytest
+
+pytest.importorskip('PyQt6')
+
+from src.backend.pump_system import PumpSystemAnalyzer  # noqa: E402
+from src.frontend.parameter_controls import (MODEL_PARAMETERS, SLIDER_STEPS,  # noqa: E402
+                                             ParameterSlider, ParameterSpec)
+
+LINEAR = ParameterSpec('static_head', "Static Head (m)", 7.85, 0.0, 20.0)
+LOGARITHMIC = ParameterSpec('diameter', "Pipe Diameter (m)", 0.0203, 0.005, 0.1, log_scale=True)
+
+
+@pytest.mark.parametrize('spec', [LINEAR, LOGARITHMIC])
+def test_positions_map_onto_the_range(spec):
+    assert spec.from_position(0) == pytest.approx(spec.minimum)
+    assert spec.from_position(SLIDER_STEPS) == pytest.approx(spec.maximum)
+    for position in (1, 250, 999):
+        assert spec.to_position(spec.from_position(position)) == position
+    # Values outside the range are clamped to the ends
+    assert spec.to_position(spec.maximum * 10) == SLIDER_STEPS
+    assert spec.to_position(spec.minimum / 10) == 0
+
+
+def test_log_scale_spaces_decades_evenly():
+    middle = LOGARITHMIC.from_position(SLIDER_STEPS // 2)
+    assert middle == pytest.approx((LOGARITHMIC.minimum * LOGARITHMIC.maximum) ** 0.5)
+    assert LINEAR.from_position(SLIDER_STEPS // 2) == pytest.approx(10.0)
+
+
+def test_defaults_match_the_analyzer():
+    analyzer = PumpSystemAnalyzer()
+    for spec in MODEL_PARAMETERS:
+        assert spec.default == pytest.approx(getattr(analyzer, spec.name))
+        assert spec.minimum <= spec.default <= spec.maximum
+
+
+def test_slider_signals(qapp):
+    slider = ParameterSlider(LOGARITHMIC)
+    changed, committed = [], []
+    slider.value_changed.connect(lambda name, value: changed.append((name, value)))
+    slider.value_committed.connect(lambda name, value: committed.append((name, value)))
+
+    slider.slider.setValue(SLIDER_STEPS)
+    assert changed == [('diameter', pytest.approx(0.1))] and committed == []
+
+    # A typed value may lie outside the slider range and commits at once
+    slider.value_input.setText('0.5')
+    slider.value_input.editingFinished.emit()
+    assert slider.value() == 0.5 and slider.slider.value() == SLIDER_STEPS
+    assert committed == [('diameter', 0.5)]
+
+    # set_value is silent
+    slider.set_value(0.02)
+    assert len(changed) == 2 and slider.value_input.text() == '0.02'
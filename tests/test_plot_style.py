@@ -0,0 +1,65 @@
+"""Regression checks for in-place curve plot updates"""
+
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from src.backend.pump_system import PumpSystemAnalyzer
+from src.frontend.plot_style import expand_limits, style_curve_axes, update_curve_artists
+
+
+def analysis(static_head):
+    analyzer = PumpSystemAnalyzer()
+    analyzer.static_head = static_head
+    return analyzer.analyze_complete_system(num_points=50)
+
+
+@pytest.fixture
+def axes():
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    return figure.add_subplot(111)
+
+
+def test_updates_reuse_the_artists(axes):
+    artists = style_curve_axes(axes, 'velocity')
+    lines, texts = len(axes.lines), len(axes.texts)
+    for static_head in (5.0, 9.0):
+        result = analysis(static_head)
+        update_curve_artists(artists, result['curves'], result['operating_point'], 'velocity')
+    # Same artists, new data: nothing was added to the axes
+    assert (len(axes.lines), len(axes.texts)) == (lines, texts)
+    np.testing.assert_array_equal(artists['system'].get_ydata(),
+                                  result['curves']['system_head'])
+    point = result['operating_point']
+    assert tuple(artists['marker'].get_data()) == ([point['velocity']], [point['head']])
+    assert f"{point['velocity']:.4f}" in artists['annotation'].get_text()
+    axes.figure.canvas.draw()
+
+
+def test_limits_fit_the_data_with_margins(axes):
+    artists = style_curve_axes(axes, 'flowrate')
+    result = analysis(7.85)
+    xlim, ylim = update_curve_artists(artists, result['curves'], result['operating_point'],
+                                      'flowrate')
+    flows = result['curves']['flow_rates']
+    assert xlim[0] < flows[0] and xlim[1] > flows[-1]
+    pad = 0.05 * (flows[-1] - flows[0])
+    assert xlim == pytest.approx((flows[0] - pad, flows[-1] + pad))
+    assert ylim[0] < result['curves']['pump_head'].min()
+
+
+def test_failed_operating_point_is_hidden(axes):
+    artists = style_curve_axes(axes, 'velocity')
+    curves = analysis(7.85)['curves']
+    update_curve_artists(artists, curves, {'success': False}, 'velocity')
+    assert not any(artists[name].get_visible()
+                   for name in ('marker', 'vline', 'hline', 'annotation'))
+    assert artists['system'].get_visible()
+
+
+def test_live_limits_only_grow():
+    assert expand_limits((0.0, 10.0), (1.0, 9.0)) == (0.0, 10.0)
+    low, high = expand_limits((0.0, 10.0), (1.0, 12.0))
+    assert low == 0.0 and high == pytest.approx(12.0 + 0.25 * 12.0)
@@ -0,0 +1,59 @@
+"""Regression checks for per-stage analysis profiling"""
+
+import pytest
+
+from src import cli
+from src.backend import profiling
+from src.backend.pump_system import PumpSystemAnalyzer
+
+
+def test_stages_are_reported_by_path():
+    with profiling.collect() as profile:
+        PumpSystemAnalyzer().analyze_complete_system(num_points=200)
+    report = profile.report()
+    assert list(report)[0] == 'analyze_complete_system'
+    curves = report['analyze_complete_system/generate_curves']
+    assert curves['calls'] == 1 and curves['evaluations'] == 200
+    assert report['analyze_complete_system/find_all_operating_points']['iterations'] > 0
+    # Nested stage time is included in the enclosing stage
+    assert curves['seconds'] <= report['analyze_complete_system']['seconds']
+    assert profile.total_seconds == pytest.approx(report['analyze_complete_system']['seconds'])
+
+
+def test_nothing_is_recorded_outside_collect():
+    assert profiling.active() is None
+    assert profiling.stage('idle') is profiling.stage('other')
+    with profiling.collect() as profile:
+        pass
+    PumpSystemAnalyzer().find_operating_point()
+    assert profile.stages == {}
+
+
+def test_merged_profiles_do_not_add_wall_time():
+    worker = profiling.Profile()
+    worker.add('solve', seconds=2.0)
+    with profiling.collect() as profile:
+        profile.merge(worker)
+        profile.merge(worker)
+    assert profile.total_seconds == pytest.approx(4.0)
+    assert profile.wall_seconds < 1.0
+
+
+def test_report_labels_summed_worker_time():
+    with profiling.collect() as profile:
+        profile.add('solve', seconds=0.5)
+    assert '\nTOTAL ' in profile.format_report()
+    profile.merge(profiling.Profile())
+    report = profile.format_report()
+    assert 'TOTAL (stage time summed over workers)' in report
+    assert '\nWALL ' in report
+
+
+def test_cli_profile_reports_wall_time_next_to_summed_stages(tmp_path, capsys):
+    cases, output = tmp_path / 'cases.csv', tmp_path / 'results.csv'
+    cases.write_text('case,static_head\n0,5.0\n1,6.0\n2,7.0\n')
+    assert cli.main([str(cases), '-o', str(output), '--jobs', '2', '--chunk-size', '1',
+                     '--profile']) == 0
+    report = capsys.readouterr().err
+    assert 'TOTAL (stage time summed over workers)' in report
+    assert '\nWALL ' in report
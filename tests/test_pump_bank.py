@@ -0,0 +1,129 @@
+"""Regression checks for series/parallel pump banks"""
+
+import numpy as np
+import pytest
+
+from src.backend.network import PipeNetwork
+from src.backend.pump_bank import PumpBank, all_stagings
+from src.backend.pump_system import PumpSystemAnalyzer
+
+
+def test_all_stagings_enumerates_bits():
+    stagings = all_stagings(3)
+    assert stagings.shape == (8, 3)
+    np.testing.assert_array_equal(stagings[5], [True, False, True])
+
+
+def test_identical_parallel_pumps_match_scaled_pump(make_analyzer):
+    base = PumpSystemAnalyzer()
+    bank = PumpBank([{}] * 4, 'parallel')
+    result = bank.solve_stagings()
+    assert not result['success'][0]
+    counts = result['stagings'].sum(axis=1)
+    for count in (1, 2, 3, 4):
+        # n equal branches: H = a - c·(k·Q / (n·A))²
+        expected = make_analyzer(pump_velocity_factor=base.pump_velocity_factor / count
+                                 ).find_operating_point()['flow_rate_m3s']
+        rows = counts == count
+        np.testing.assert_allclose(result['flow_rate_m3s'][rows], expected, rtol=1e-8)
+        shares = result['pump_flow'][rows][result['stagings'][rows]]
+        np.testing.assert_allclose(shares, expected / count, rtol=1e-8)
+
+
+def test_identical_series_pumps_match_scaled_pump(make_analyzer):
+    base = PumpSystemAnalyzer()
+    bank = PumpBank([{}] * 3, 'series')
+    result = bank.solve_stagings(np.ones((1, 3), dtype=bool))
+    expected = make_analyzer(pump_max_head=3 * base.pump_max_head,
+                             pump_coefficient=3 * base.pump_coefficient
+                             ).find_operating_point()['flow_rate_m3s']
+    assert result['flow_rate_m3s'][0] == pytest.approx(expected, rel=1e-8)
+    assert np.sum(result['pump_head'][0]) == pytest.approx(result['head'][0], rel=1e-8)
+
+
+MIXED_PUMPS = [{'pump_max_head': 12.0}, {}, {'pump_max_head': 26.0}, {'pump_coefficient': 0.09}]
+MIXED = ('series', [0, ('parallel', [1, 2, 3])])
+
+
+def test_mixed_bank_balances_flows_and_heads():
+    bank = PumpBank(MIXED_PUMPS, MIXED)
+    result = bank.solve_stagings()
+    on = result['stagings']
+    # Pump 0 on together with at least one parallel branch
+    rows = result['success'] & on[:, 0] & on[:, 1:].any(axis=1)
+    assert rows.any()
+    flow = result['flow_rate_m3s'][rows]
+    branches = np.nansum(result['pump_flow'][rows][:, 1:], axis=1)
+    np.testing.assert_allclose(branches, flow, rtol=1e-9)
+    np.testing.assert_allclose(result['pump_flow'][rows][:, 0], flow, rtol=1e-12)
+    # Parallel branches share one head; the series pump adds to it
+    branch_heads = result['pump_head'][rows][:, 1:]
+    spread = np.nanmax(branch_heads, axis=1) - np.nanmin(branch_heads, axis=1)
+    assert np.all(spread < 1e-9)
+    np.testing.assert_allclose(result['pump_head'][rows][:, 0] + np.nanmax(branch_heads, axis=1),
+                               result['head'][rows], rtol=1e-9)
+
+
+def test_mixed_bank_agrees_with_network():
+    result = PumpBank(MIXED_PUMPS, MIXED).solve_stagings(np.ones((1, 4), dtype=bool))
+    network = PipeNetwork()
+    network.add_reservoir('suction', 0.0)
+    network.add_junction('booster')
+    network.add_junction('header')
+    network.add_reservoir('tank', network.analyzer.static_head)
+    network.add_pump('pump 0', 'suction', 'booster', **MIXED_PUMPS[0])
+    for index in (1, 2, 3):
+        network.add_pump(f'pump {index}', 'booster', 'header', **MIXED_PUMPS[index])
+    network.add_pipe('pipe', 'header', 'tank')
+    solution = network.solve()
+    assert solution['success']
+    np.testing.assert_allclose(result['pump_flow'][0], solution['link_flows'][:4], rtol=1e-8)
+    assert result['flow_rate_m3s'][0] == pytest.approx(solution['link_flows'][4], rel=1e-8)
+
+
+NESTED = ('parallel', [('series', [0, ('parallel', [1, 2])]), 3])
+
+
+def test_nested_bank_agrees_with_network():
+    result = PumpBank(MIXED_PUMPS, NESTED).solve_stagings(np.ones((1, 4), dtype=bool))
+    network = PipeNetwork()
+    network.add_reservoir('suction', 0.0)
+    network.add_junction('booster')
+    network.add_junction('header')
+    network.add_reservoir('tank', network.analyzer.static_head)
+    network.add_pump('pump 0', 'suction', 'booster', **MIXED_PUMPS[0])
+    network.add_pump('pump 1', 'booster', 'header', **MIXED_PUMPS[1])
+    network.add_pump('pump 2', 'booster', 'header', **MIXED_PUMPS[2])
+    network.add_pump('pump 3', 'suction', 'header', **MIXED_PUMPS[3])
+    network.add_pipe('pipe', 'header', 'tank')
+    solution = network.solve()
+    assert solution['success']
+    np.testing.assert_allclose(result['pump_flow'][0], solution['link_flows'][:4], rtol=1e-8)
+    assert result['flow_rate_m3s'][0] == pytest.approx(solution['link_flows'][4], rel=1e-8)
+
+
+def test_nested_fallback_matches_newton_polish(monkeypatch):
+    expected = PumpBank(MIXED_PUMPS, NESTED).solve_stagings()
+    polish = PumpBank._polish
+
+    def stalled(self, *args, **kwargs):
+        flow, pump_flow, converged = polish(self, *args, **kwargs)
+        return flow, pump_flow, np.zeros_like(converged)
+
+    monkeypatch.setattr(PumpBank, '_polish', stalled)
+    result = PumpBank(MIXED_PUMPS, NESTED).solve_stagings()
+    np.testing.assert_array_equal(result['success'], expected['success'])
+    np.testing.assert_allclose(result['flow_rate_m3s'], expected['flow_rate_m3s'], rtol=1e-8)
+    np.testing.assert_allclose(result['pump_flow'], expected['pump_flow'], rtol=1e-7, atol=1e-12)
+
+
+def test_custom_pump_curve_is_rejected():
+    analyzer = PumpSystemAnalyzer()
+    analyzer.pump_curve = object()
+    with pytest.raises(ValueError, match='pump_curve'):
+        PumpBank([{}] * 2, 'parallel', analyzer)
+
+
+def test_arrangement_must_use_every_pump_once():
+    with pytest.raises(ValueError):
+        PumpBank([{}] * 3, ('parallel', [0, 1, 1]))
@@ -0,0 +1,69 @@
+"""Regression checks for pump curve fitting"""
+
+import numpy as np
+import pytest
+
+from src.backend.cache import analyzer_key
+from src.backend.pump_fit import PumpCurveFit, PumpCurveFitter, fit_pump_curve
+from src.backend.pump_system import PumpSystemAnalyzer
+
+
+def bench_log(rows=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    flow = rng.uniform(0.0, 4e-4, rows)
+    head = 24.4 + 1.5e3 * flow - 8.0e7 * flow ** 2 - 5e10 * flow ** 3 + rng.normal(0, 0.05, rows)
+    return flow, head
+
+
+def test_coefficients_match_polyfit():
+    flow, head = bench_log()
+    chunks = [(flow[start:start + 3000], head[start:start + 3000])
+              for start in range(0, flow.size, 3000)]
+    fit = fit_pump_curve(chunks, degree=3)
+    np.testing.assert_allclose(fit.coefficients, np.polyfit(flow, head, 3)[::-1], rtol=1e-8)
+    assert fit.samples == flow.size
+    assert fit.rms == pytest.approx(0.05, rel=0.05)
+
+
+def test_merged_fitters_match_one_fit():
+    flow, head = bench_log()
+    whole = PumpCurveFitter(degree=3, flow_scale=4e-4)
+    whole.update(flow, head)
+    first = PumpCurveFitter(degree=3, flow_scale=4e-4)
+    second = PumpCurveFitter(degree=3, flow_scale=4e-4)
+    first.update(flow[:5000], head[:5000])
+    second.update(flow[5000:], head[5000:])
+    np.testing.assert_allclose(first.merge(second).fit().coefficients,
+                               whole.fit().coefficients, rtol=1e-10)
+
+
+def test_quadratic_fit_sets_analyzer_parameters():
+    analyzer = PumpSystemAnalyzer()
+    velocity = np.linspace(0.0, 1.2, 200)
+    flow = velocity * analyzer.area
+    fit = fit_pump_curve([(flow, analyzer.calculate_pump_head(velocity))])
+    fitted = fit.to_analyzer(analyzer)
+    assert fitted.pump_curve is None
+    np.testing.assert_allclose(fitted.calculate_pump_head(velocity),
+                               analyzer.calculate_pump_head(velocity), rtol=1e-9, atol=1e-9)
+
+
+def test_higher_order_fit_becomes_pump_curve():
+    flow, head = bench_log()
+    analyzer = fit_pump_curve([(flow, head)], degree=3).to_analyzer()
+    assert analyzer.pump_curve is not None
+    point = analyzer.find_operating_point()
+    assert point['success']
+    assert analyzer.calculate_pump_head(point['velocity']) == \
+        pytest.approx(analyzer.calculate_system_head(point['velocity']), abs=1e-6)
+
+
+def test_fits_with_equal_repr_have_distinct_cache_keys():
+    first = PumpCurveFit((0, 2, 3), np.array([24.4, -12.8, -3.2]), 4e-4, 100, 0.05, 0.99,
+                         (0.0, 4e-4))
+    second = PumpCurveFit((0, 2, 3), np.array([24.4, -12.8, -3.2 * (1 + 1e-9)]), 4e-4, 100,
+                          0.05, 0.99, (0.0, 4e-4))
+    assert repr(first) == repr(second)
+    assert first.cache_key() != second.cache_key()
+    assert analyzer_key(first.to_analyzer()) != analyzer_key(second.to_analyzer())
+    assert analyzer_key(first.to_analyzer()) == analyzer_key(first.to_analyzer())
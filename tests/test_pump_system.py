@@ -0,0 +1,59 @@
+"""Regression checks for the vectorized PumpSystemAnalyzer curve functions"""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.backend.pump_system import PumpSystemAnalyzer
+
+
+CURVE_FUNCTIONS = ('calculate_friction_factor', 'calculate_system_head', 'calculate_pump_head',
+                   'calculate_friction_factor_derivative', 'calculate_system_head_derivative',
+                   'calculate_pump_head_derivative', 'calculate_flow_rate')
+
+
+def original_system_head(velocity):
+    """System curve of the original scalar analysis (Swamee-Jain friction)"""
+    reynolds = 22706.9 * velocity
+    friction = 0.25 / math.log10(1 / 81.2 / 3.7 + 5.74 / reynolds ** 0.9) ** 2
+    return 7.85 + (8694.6 * friction + 23.65) * velocity ** 2 / 19.62
+
+
+@pytest.mark.parametrize('name', CURVE_FUNCTIONS)
+def test_arrays_match_scalar_evaluations(name):
+    function = getattr(PumpSystemAnalyzer(), name)
+    velocities = np.linspace(0.1, 2.0, 12).reshape(3, 4)
+    values = function(velocities)
+    assert values.shape == velocities.shape
+    expected = [float(function(float(v))) for v in velocities.ravel()]
+    np.testing.assert_array_equal(values.ravel(), expected)
+
+
+def test_curves_match_the_original_formulas():
+    analyzer = PumpSystemAnalyzer()
+    velocities = np.array([0.1, 0.5, 1.0, 1.7])
+    np.testing.assert_allclose(analyzer.calculate_system_head(velocities),
+                               [original_system_head(v) for v in velocities], rtol=1e-12)
+    np.testing.assert_allclose(analyzer.calculate_pump_head(velocities),
+                               24.4 - 0.0678 * (19.42 * velocities) ** 2, rtol=1e-12)
+
+
+def test_derivatives_match_finite_differences():
+    analyzer = PumpSystemAnalyzer()
+    velocities = np.linspace(0.2, 1.8, 9)
+    step = 1e-6
+    for curve in ('friction_factor', 'system_head', 'pump_head'):
+        function = getattr(analyzer, f'calculate_{curve}')
+        slope = (function(velocities + step) - function(velocities - step)) / (2 * step)
+        np.testing.assert_allclose(getattr(analyzer, f'calculate_{curve}_derivative')(velocities),
+                                   slope, rtol=1e-6)
+
+
+def test_generate_curves_samples_every_curve_on_one_grid():
+    analyzer = PumpSystemAnalyzer()
+    curves = analyzer.generate_curves(0.1, 2.0, 50)
+    assert all(values.shape == (50,) for values in curves.values())
+    np.testing.assert_array_equal(curves['system_head'],
+                                  analyzer.calculate_system_head(curves['velocities']))
+    np.testing.assert_allclose(curves['flow_rates'], curves['velocities'] * analyzer.area)
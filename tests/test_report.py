@@ -0,0 +1,58 @@
+"""Regression checks for headless report rendering"""
+
+import io
+import re
+import struct
+
+import matplotlib
+import numpy as np
+import pytest
+
+from src.backend.sweep import cartesian_design
+from src.report import encode_png, render_reports
+
+
+DESIGN = cartesian_design({'diameter': np.array([0.02, 0.03]),
+                           'static_head': np.array([4.0, 8.0, 30.0])})
+
+
+def png_size(path):
+    """Width and height from the IHDR chunk of a PNG file"""
+    data = path.read_bytes()
+    assert data[:8] == b'\x89PNG\r\n\x1a\n' and data[12:16] == b'IHDR'
+    return struct.unpack('>II', data[16:24])
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_cases_render_to_png_and_pdf(tmp_path, jobs):
+    pdf = tmp_path / 'report.pdf'
+    result = render_reports(DESIGN, str(tmp_path / 'figures'), pdf_path=str(pdf), jobs=jobs,
+                            chunk_size=4, width=7, height=3, dpi=50)
+    files = sorted((tmp_path / 'figures').iterdir())
+    assert [path.name for path in files] == [f'case_{index:06d}.png' for index in range(6)]
+    assert result['cases'] == result['files'] == result['pdf_pages'] == 6
+    assert all(png_size(path) == (350, 150) for path in files)
+    assert len(re.findall(rb'/Type\s*/Page[^s]', pdf.read_bytes())) == 6
+
+
+def test_inline_rendering_keeps_the_matplotlib_backend(tmp_path):
+    # A caller such as the GUI has its own backend selected
+    previous = matplotlib.get_backend()
+    matplotlib.use('svg')
+    try:
+        render_reports(DESIGN, str(tmp_path), jobs=1, dpi=20)
+        assert matplotlib.get_backend() == 'svg'
+    finally:
+        matplotlib.use(previous)
+
+
+def test_png_encoding_round_trips():
+    image = pytest.importorskip('PIL.Image')
+    rgba = np.random.default_rng(0).integers(0, 256, (7, 5, 4), dtype=np.uint8)
+    decoded = np.asarray(image.open(io.BytesIO(encode_png(rgba))).convert('RGB'))
+    np.testing.assert_array_equal(decoded, rgba[:, :, :3])
+
+
+def test_unknown_design_parameter_raises(tmp_path):
+    with pytest.raises(ValueError):
+        render_reports({'length': [1.0]}, str(tmp_path))
@@ -0,0 +1,38 @@
+"""Regression checks for typed operating-point records"""
+
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+from src.backend.batch_solver import solve_operating_points
+from src.backend.pump_system import PumpSystemAnalyzer
+from src.backend.results import OperatingPoint
+
+
+def test_record_matches_legacy_dictionary():
+    analyzer = PumpSystemAnalyzer()
+    legacy = analyzer.find_operating_point()
+    point = analyzer.operating_point()
+    assert not hasattr(point, '__dict__')
+    for name, value in point.to_dict().items():
+        assert value == pytest.approx(legacy[name])
+
+
+def test_record_survives_pickle_and_copy():
+    point = PumpSystemAnalyzer().operating_point()
+    assert pickle.loads(pickle.dumps(point)) == point
+    assert copy.deepcopy(point) == point
+    assert OperatingPoint.from_dict({'success': False}) is None
+
+
+def test_batch_matches_dictionary_columns():
+    static_head = np.linspace(2.0, 20.0, 50)
+    columns = solve_operating_points(static_head=static_head)
+    batch = solve_operating_points(static_head=static_head, as_batch=True)
+    assert len(batch) == static_head.size
+    np.testing.assert_array_equal(batch.velocity, columns['velocity'])
+    np.testing.assert_array_equal(batch.flow_rate_ls, columns['flow_rate_m3s'] * 1000)
+    # Slices are views of the same columns
+    assert np.shares_memory(batch[10:20].velocity, batch.velocity)
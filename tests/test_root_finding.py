@@ -0,0 +1,44 @@
+"""Regression checks for the bracketed root finders"""
+
+import numpy as np
+import pytest
+
+from src.backend.pump_system import PumpSystemAnalyzer
+from src.backend.root_finding import bracketed_newton, bracketed_secant
+
+
+TARGETS = np.array([0.5, 2.0, 7.0, 150.0])
+
+
+def test_newton_solves_every_row():
+    solution = bracketed_newton(lambda x: x ** 2 - TARGETS, lambda x: 2 * x,
+                                np.zeros(4), np.full(4, 10.0), ftol=1e-13)
+    assert solution['converged'][:3].all() and solution['bracketed'][:3].all()
+    np.testing.assert_allclose(solution['root'][:3], np.sqrt(TARGETS[:3]), rtol=1e-12)
+    # sqrt(150) lies outside [0, 10]: no sign change, no root
+    assert not solution['bracketed'][3] and np.isnan(solution['root'][3])
+
+
+def test_secant_solves_every_row_without_derivative():
+    solution = bracketed_secant(lambda x: np.cbrt(x) - np.cbrt(TARGETS),
+                                np.zeros(4), np.full(4, 200.0))
+    assert solution['converged'].all() and solution['bracketed'].all()
+    np.testing.assert_allclose(solution['root'], TARGETS, rtol=1e-10)
+    assert np.all(solution['iterations'] < 60)
+
+
+def test_bracket_method_agrees_with_fsolve():
+    analyzer = PumpSystemAnalyzer()
+    bracket = analyzer.find_operating_point(method='bracket')
+    local = analyzer.find_operating_point()
+    assert bracket['success'] and bracket['intersections'] == 1
+    assert bracket['velocity'] == pytest.approx(local['velocity'], rel=1e-9)
+
+
+def test_range_without_intersection_is_reported():
+    analyzer = PumpSystemAnalyzer()
+    velocity = analyzer.find_operating_point()['velocity']
+    result = analyzer.find_all_operating_points(v_min=velocity + 0.1, v_max=velocity + 0.5)
+    assert result['count'] == 0 and not result['success']
+    assert not analyzer.find_operating_point(method='bracket', v_min=velocity + 0.1,
+                                             v_max=velocity + 0.5)['success']
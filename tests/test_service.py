@@ -0,0 +1,101 @@
+"""Regression checks for the HTTP/JSON analysis service"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.backend.pump_system import PumpSystemAnalyzer
+from src.service import AnalysisService
+
+
+async def exchange(requests):
+    """Send raw HTTP requests over one connection and parse the (status, JSON) replies"""
+    service = AnalysisService(workers=0)
+    server = await service.serve(port=0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    replies = []
+    try:
+        for request in requests:
+            writer.write(request)
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.lower()] = value.strip()
+            body = await reader.readexactly(int(headers['content-length']))
+            replies.append((status, json.loads(body)))
+            if headers['connection'] == 'close':
+                break
+    finally:
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        service.close()
+    return replies
+
+
+def post(path, payload, length=None):
+    body = json.dumps(payload).encode()
+    length = len(body) if length is None else length
+    return (f"POST {path} HTTP/1.1\r\nContent-Length: {length}\r\n\r\n").encode() + body
+
+
+def test_operating_point_matches_analyzer():
+    [(status, result)] = asyncio.run(exchange([post('/operating-point', {'static_head': 7.85})]))
+    assert status == 200
+    assert result['velocity'] == pytest.approx(
+        PumpSystemAnalyzer().find_operating_point()['velocity'], rel=1e-9)
+
+
+def test_non_numeric_content_length_is_a_bad_request():
+    [(status, result)] = asyncio.run(exchange([post('/operating-point', {}, length='ten')]))
+    assert status == 400
+    assert 'Content-Length' in result['error']
+
+
+@pytest.mark.parametrize('v_min, v_max', [(-0.5, 2.0), (0.0, 2.0), (1.0, 0.5)])
+def test_invalid_curve_range_is_a_bad_request(v_min, v_max):
+    replies = asyncio.run(exchange([
+        post('/curves', {'v_min': v_min, 'v_max': v_max, 'num_points': 5}),
+        post('/curves', {'v_min': 0.1, 'v_max': 2.0, 'num_points': 5}),
+    ]))
+    assert replies[0][0] == 400
+    # The connection stays usable and valid curves are finite JSON
+    status, curves = replies[1]
+    assert status == 200
+    assert len(curves['system_head']) == 5
+
+
+def test_non_finite_curves_are_a_bad_request():
+    [(status, result)] = asyncio.run(exchange([
+        post('/curves', {'parameters': {'roughness_factor': -5.0}, 'num_points': 5})]))
+    assert status == 400
+
+
+def test_concurrent_requests_share_one_batch_and_the_cache():
+    async def scenario():
+        service = AnalysisService(workers=0)
+        heads = [5.0, 6.0, 7.0, 8.0, 6.0]
+        try:
+            first = await asyncio.gather(*(service.operating_points([{'static_head': head}])
+                                           for head in heads))
+            stats = service.stats()
+            again = await service.operating_points([{'static_head': 7.0}])
+            return first, stats, again, service.stats()
+        finally:
+            service.close()
+
+    first, stats, again, after = asyncio.run(scenario())
+    # Five concurrent requests become one vectorized solve of the four distinct rows
+    assert stats['requests'] == 5 and stats['batches'] == 1
+    assert stats['solved_rows'] == 4 and stats['mean_batch_rows'] == 4.0
+    assert first[1] == first[4]
+    # A repeated row is answered from the cache without another batch
+    assert again == first[2]
+    assert after['batches'] == 1
+    assert after['cache']['hits'] == stats['cache']['hits'] + 1
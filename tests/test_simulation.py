@@ -0,0 +1,52 @@
+"""Regression checks for the extended-period simulation"""
+
+import copy
+
+import numpy as np
+import pytest
+
+from src.backend.pump_system import PumpSystemAnalyzer
+from src.backend.simulation import ExtendedPeriodSimulation, SIMULATION_FIELDS, Tank
+
+
+def concatenate(blocks):
+    blocks = list(blocks)
+    return {name: np.concatenate([block[name] for block in blocks]) for name in SIMULATION_FIELDS}
+
+
+def test_fixed_reservoirs_hold_the_operating_point():
+    point = PumpSystemAnalyzer().find_operating_point()
+    result = concatenate(ExtendedPeriodSimulation().run(50.0, block_size=20))
+    assert result['time'].size == 50
+    np.testing.assert_allclose(result['velocity'], point['velocity'], rtol=1e-10)
+    assert result['pump_on'].all()
+
+
+def test_every_step_matches_a_fresh_solve():
+    simulation = ExtendedPeriodSimulation(discharge=Tank(area=0.5, level=0.0), time_step=60.0)
+    result = concatenate(simulation.run(3600.0, block_size=25))
+    analyzer = PumpSystemAnalyzer()
+    for index in range(0, 60, 7):
+        fresh = copy.copy(analyzer)
+        fresh.static_head = result['static_head'][index]
+        assert result['velocity'][index] == \
+            pytest.approx(fresh.find_operating_point()['velocity'], rel=1e-9)
+    # Rising discharge level raises the static head step by step
+    assert np.all(np.diff(result['static_head']) > 0)
+
+
+def test_discharge_level_follows_the_mass_balance():
+    area, dt = 0.8, 10.0
+    simulation = ExtendedPeriodSimulation(discharge=Tank(area=area), demand=2e-5, time_step=dt)
+    result = concatenate(simulation.run(600.0))
+    delivered = np.sum(result['flow_rate_m3s'] - 2e-5) * dt
+    assert simulation.discharge.level == pytest.approx(delivered / area, rel=1e-12)
+
+
+def test_level_control_switches_the_pump():
+    simulation = ExtendedPeriodSimulation(discharge=Tank(area=0.05, level=0.0), demand=5e-5,
+                                          time_step=5.0, start_level=0.2, stop_level=0.5)
+    result = concatenate(simulation.run(3600.0))
+    assert not result['pump_on'].all() and result['pump_on'].any()
+    assert np.all(result['flow_rate_m3s'][~result['pump_on'].astype(bool)] == 0)
+    assert result['discharge_level'].max() <= 0.5 + 0.1
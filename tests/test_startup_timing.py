@@ -0,0 +1,71 @@
+"""Regression checks for deferred imports and the startup profiler"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src import startup_timing
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def run_python(code, cwd=ROOT, env=None):
+    """Run code in a fresh interpreter (nothing imported yet) and return its stdout"""
+    environment = {name: value for name, value in os.environ.items()
+                   if name != 'PUMP_STARTUP_PROFILE'}
+    environment.update(PYTHONPATH=ROOT, **(env or {}))
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=environment,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def test_default_analysis_does_not_load_scipy():
+    assert run_python("import sys\n"
+                      "from src.backend.pump_system import PumpSystemAnalyzer\n"
+                      "PumpSystemAnalyzer().analyze_complete_system()\n"
+                      "print('scipy' in sys.modules)") == ['False']
+
+
+@pytest.mark.skipif(importlib.util.find_spec('PyQt6') is None, reason="PyQt6 not installed")
+def test_main_window_loads_without_numpy_or_matplotlib():
+    assert run_python("import sys\n"
+                      "import src.frontend.main_window\n"
+                      "print('numpy' in sys.modules, 'matplotlib' in sys.modules)") == \
+        ['False', 'False']
+
+
+def test_argv_option_enables_profiling(monkeypatch):
+    enabled = []
+    monkeypatch.setattr(startup_timing, 'enable', enabled.append)
+    monkeypatch.delenv('PUMP_STARTUP_PROFILE', raising=False)
+    assert startup_timing.enable_from_argv(['app', '-x']) == ['app', '-x']
+    assert enabled == []
+    argv = ['app', '--startup-profile=boot.txt', '-x']
+    assert startup_timing.enable_from_argv(argv) == ['app', '-x']
+    assert enabled == ['boot.txt']
+
+
+def test_report_attributes_nested_import_time(tmp_path):
+    (tmp_path / 'slow_child.py').write_text("import time\ntime.sleep(0.05)\n")
+    (tmp_path / 'slow_parent.py').write_text("import slow_child\n")
+    report = tmp_path / 'profile.txt'
+    run_python("import sys\n"
+               "from src import startup_timing\n"
+               "startup_timing.enable_from_argv(sys.argv)\n"
+               "sys.path.insert(0, '.')\n"
+               "import slow_parent\n"
+               "startup_timing.mark('imported')\n"
+               "startup_timing.report()",
+               cwd=tmp_path, env={'PUMP_STARTUP_PROFILE': str(report)})
+    rows = {fields[0]: [float(value) for value in fields[1:]]
+            for fields in map(str.split, report.read_text().splitlines())
+            if fields and fields[0] in ('slow_parent', 'slow_child', 'imported')}
+    parent_cumulative, parent_self = rows['slow_parent']
+    child_cumulative, child_self = rows['slow_child']
+    assert child_self >= 45 and parent_cumulative >= child_cumulative
+    # The child's time is not counted again as the parent's own
+    assert parent_self < 20
+    assert 'imported' in rows and rows['imported'][0] > 0
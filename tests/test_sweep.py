@@ -0,0 +1,33 @@
+"""Regression checks for parameter sweeps"""
+
+import numpy as np
+
+from src.backend.sweep import RESULT_FIELDS, cartesian_design, latin_hypercube_design, run_sweep
+
+
+def test_parallel_chunks_match_inline_solve():
+    design = cartesian_design({'diameter': np.linspace(0.015, 0.05, 12),
+                               'static_head': np.linspace(2.0, 12.0, 9)})
+    inline = run_sweep(design, jobs=1)
+    parallel = run_sweep(design, jobs=2, chunk_size=25)
+    for name in RESULT_FIELDS:
+        np.testing.assert_array_equal(inline[name], parallel[name])
+    assert inline['converged'].all()
+
+
+def test_cartesian_design_varies_last_parameter_fastest():
+    design = cartesian_design({'diameter': [0.02, 0.03], 'static_head': [1.0, 2.0, 3.0]})
+    np.testing.assert_array_equal(design['diameter'], [0.02] * 3 + [0.03] * 3)
+    np.testing.assert_array_equal(design['static_head'], [1.0, 2.0, 3.0] * 2)
+
+
+def test_latin_hypercube_fills_every_stratum():
+    design = latin_hypercube_design({'static_head': (2.0, 12.0)}, 50, seed=4)
+    strata = np.floor((design['static_head'] - 2.0) / 10.0 * 50).astype(int)
+    np.testing.assert_array_equal(np.sort(strata), np.arange(50))
+
+
+def test_empty_design_returns_empty_columns():
+    result = run_sweep({'diameter': np.array([])}, jobs=4)
+    assert result['diameter'].size == 0
+    assert all(result[name].size == 0 for name in RESULT_FIELDS)